@@ -2,13 +2,26 @@
 # Copyright 2017-TODAY LasLabs Inc.
 # License MIT (https://opensource.org/licenses/MIT).
 
-from requests import Session
 from requests.auth import HTTPBasicAuth
 
+from .attachment_cache import AttachmentCache
 from .auth_proxy import AuthProxy
 from .base_api import BaseApi
 from .base_model import BaseModel
 from .domain import Domain
+from .http_cache import HttpCache
+from .progress_log import ProgressLog
+from .rate_limiter import RateLimiter
+from .record_cache import RecordCache
+from .retry_policy import RetryPolicy
+from .session import HelpScoutSession
+from .single_flight import SingleFlight
+from .sync import (FileWatermarkStore,
+                   SqliteWatermarkStore,
+                   SyncEngine,
+                   SyncRun,
+                   )
+from .text_index import TextIndex
 from .web_hook import HelpScoutWebHook
 
 from . import exceptions
@@ -35,6 +48,17 @@ class HelpScout(object):
         for customer in hs.Customers.list():
             print(customer)
 
+    Pages of large result sets can be requested in parallel by defining the
+    ``concurrency``, either on the client or on a specific iteration::
+
+        hs = HelpScout('api_key', concurrency=8)
+        for conversation in hs.Conversations.list(mailbox):
+            print(conversation)
+        for conversation in hs.Conversations.list(mailbox).iterate(
+            concurrency=4, ordered=False,
+        ):
+            print(conversation)
+
     Attributes:
         Conversations (helpscout.api.conversations.Conversations):
             Conversations API endpoint.
@@ -51,13 +75,46 @@ class HelpScout(object):
 
     __apis__ = {}
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, concurrency=1, rate_limiter=None,
+                 retry_policy=None, http_cache=None, record_cache=None,
+                 single_flight=None, attachment_cache=None, lazy=False):
         """Initialize a new HelpScout client.
 
         Args:
             api_key (str): The API key to use for this session.
+            concurrency (int, optional): Maximum number of result pages to
+                request at the same time while iterating.
+            rate_limiter (helpscout.rate_limiter.RateLimiter, optional):
+                Scheduler shared by all of the APIs, used to stay under the
+                HelpScout rate limit.
+            retry_policy (helpscout.retry_policy.RetryPolicy, optional):
+                Policy used to retry requests after transient failures.
+            http_cache (helpscout.http_cache.HttpCache, optional): Cache used
+                to revalidate ``GET`` requests, so that unmodified responses
+                are not downloaded again.
+            record_cache (helpscout.record_cache.RecordCache, optional):
+                Cache of the records returned by ``get``, which are
+                invalidated when updated or deleted through this client.
+            single_flight (helpscout.single_flight.SingleFlight, optional):
+                Coalescer making identical ``GET`` requests that are sent at
+                the same time share one response.
+            attachment_cache (helpscout.attachment_cache.AttachmentCache,
+                optional): Cache of the hashes of the uploaded attachments,
+                so that identical attachments are only uploaded once.
+            lazy (bool, optional): Set this to ``True`` in order to receive
+                models that only parse each of their values the first time
+                that it is read.
         """
-        self.session = Session()
+        self.session = HelpScoutSession(
+            concurrency=concurrency,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            http_cache=http_cache,
+            record_cache=record_cache,
+            single_flight=single_flight,
+            attachment_cache=attachment_cache,
+            lazy=lazy,
+        )
         self.session.auth = HTTPBasicAuth(api_key, 'NoPassBecauseKey!')
         self._load_apis()
 
@@ -73,11 +130,24 @@ class HelpScout(object):
 
 
 __all__ = [
+    'AttachmentCache',
     'AuthProxy',
     'BaseApi',
     'BaseModel',
     'Domain',
     'exceptions',
+    'FileWatermarkStore',
     'HelpScout',
+    'HelpScoutSession',
     'HelpScoutWebHook',
+    'HttpCache',
+    'ProgressLog',
+    'RateLimiter',
+    'RecordCache',
+    'RetryPolicy',
+    'SingleFlight',
+    'SqliteWatermarkStore',
+    'SyncEngine',
+    'SyncRun',
+    'TextIndex',
 ]
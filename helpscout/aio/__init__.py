@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+from ..auth_proxy import AuthProxy
+
+from .base_api import AsyncBaseApi
+from .request_paginator import AsyncRequestPaginator
+from .session import AsyncHelpScoutSession
+
+
+class AsyncHelpScout(object):
+    """This is the asyncio counterpart of ``HelpScout``.
+
+    It exposes the same API properties as ``HelpScout``, but requests are
+    sent using a shared ``aiohttp`` connection pool. Collections are iterated
+    using ``async for``, and singleton requests must be awaited.
+
+    This requires the ``aiohttp`` package, which can be installed using the
+    ``async`` extra (``pip install helpscout[async]``).
+
+    Examples::
+
+        from helpscout.aio import AsyncHelpScout
+
+        async def main():
+            async with AsyncHelpScout('api_key') as hs:
+                async for customer in hs.Customers.list():
+                    print(customer)
+                customer = await hs.Customers.get(143161083)
+
+    Attributes:
+        __apis__ (dict): References to all available APIs, keyed by class
+            name.
+    """
+
+    def __init__(self, api_key, concurrency=1, limit=100,
+                 rate_limiter=None, retry_policy=None, http_cache=None,
+                 lazy=False):
+        """Initialize a new asynchronous HelpScout client.
+
+        Args:
+            api_key (str): The API key to use for this session.
+            concurrency (int, optional): Maximum number of result pages to
+                request at the same time while iterating.
+            limit (int, optional): Maximum number of simultaneous connections
+                in the shared pool.
+            rate_limiter (helpscout.rate_limiter.RateLimiter, optional):
+                Scheduler shared by all of the APIs, used to stay under the
+                HelpScout rate limit.
+            retry_policy (helpscout.retry_policy.RetryPolicy, optional):
+                Policy used to retry requests after transient failures.
+            http_cache (helpscout.http_cache.HttpCache, optional): Cache used
+                to revalidate ``GET`` requests, so that unmodified responses
+                are not downloaded again.
+            lazy (bool, optional): Set this to ``True`` in order to receive
+                models that only parse each of their values the first time
+                that it is read.
+        """
+        self.session = AsyncHelpScoutSession(
+            api_key, concurrency=concurrency, limit=limit,
+            rate_limiter=rate_limiter, retry_policy=retry_policy,
+            http_cache=http_cache, lazy=lazy,
+        )
+        self.__apis__ = {}
+        self._load_apis()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Close the shared connection pool."""
+        await self.session.close()
+
+    def _load_apis(self):
+        """Find available APIs and set instances property auth proxies."""
+        helpscout = __import__('helpscout.apis')
+        for class_name in helpscout.apis.__all__:
+            if not class_name.startswith('_'):
+                cls = getattr(helpscout.apis, class_name)
+                async_cls = type(class_name, (AsyncBaseApi, cls), {})
+                api = AuthProxy(self.session, async_cls)
+                setattr(self, class_name, api)
+                self.__apis__[class_name] = api
+
+
+__all__ = [
+    'AsyncBaseApi',
+    'AsyncHelpScout',
+    'AsyncHelpScoutSession',
+    'AsyncRequestPaginator',
+]
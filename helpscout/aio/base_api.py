@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import asyncio
+
+from ..base_api import BaseApi
+from ..exceptions import HelpScoutRemoteException
+
+from .request_paginator import AsyncRequestPaginator
+from .session import AsyncHelpScoutSession
+
+
+class AsyncBaseApi(BaseApi):
+    """This is the asyncio counterpart of ``BaseApi``.
+
+    It is not used directly; ``AsyncHelpScout`` combines it with each of the
+    API classes in ``helpscout.apis``, so that the same endpoint definitions
+    are used for both clients. Collections are iterated using ``async for``,
+    and singleton requests (``get``, ``create``, ``update``, ``delete``)
+    return awaitables.
+    """
+
+    def __new__(cls, endpoint, data=None,
+                request_type=AsyncRequestPaginator.GET, singleton=False,
+                session=None, out_type=None, raw=False, lazy=None):
+        """Create a new API object.
+
+        Args are the same as in :func:`helpscout.base_api.BaseApi.__new__`.
+
+        Returns:
+            AsyncBaseApi: An instance of an API object, if ``singleton`` is
+                ``False``.
+            coroutine: An awaitable resolving to the model, or ``None``, if
+                ``singleton`` is ``True``.
+        """
+        if lazy is None:
+            lazy = cls._is_lazy(session)
+        output_type = cls._get_output_type(out_type, raw, lazy)
+        paginator = AsyncRequestPaginator(
+            endpoint='%s%s' % (cls.BASE_URI, endpoint),
+            data=data,
+            output_type=output_type,
+            request_type=request_type,
+            session=session,
+        )
+        if singleton:
+            return cls._get_singleton(paginator, output_type)
+        obj = object.__new__(cls)
+        obj.paginator = paginator
+        return obj
+
+    def __aiter__(self):
+        """Pass through asynchronous iteration to the API response."""
+        return self.paginator.iterate()
+
+    @classmethod
+    def get(cls, session, *args, **kwargs):
+        """Return a specific record, or ``None`` if it does not exist.
+
+        Args are the same as the ``get`` of the API class.
+
+        Returns:
+            coroutine: An awaitable resolving to the record singleton, or
+                ``None``.
+        """
+        return cls._none_if_not_found(
+            super(AsyncBaseApi, cls).get(session, *args, **kwargs),
+        )
+
+    @classmethod
+    async def _search_page(cls, session, page, out_type, raw=False):
+        """Search one page of a domain that a search was split into.
+
+        See :func:`helpscout.base_api.BaseApi._search_page`.
+        """
+        domain, number = page
+        results = cls._search_request(session, domain, out_type, raw)
+        records = []
+        async for found in results.iter_pages(number, number + 1,
+                                              concurrency=1):
+            records.extend(found)
+        return records, cls._get_other_pages(results.paginator, page)
+
+    @classmethod
+    async def _search_shard(cls, session, domain, condition, window,
+                            out_type, raw, shard_size):
+        """Search one window of a sharded search.
+
+        See :func:`helpscout.base_api.BaseApi._search_shard`.
+        """
+        results = cls._search_request(
+            session, cls._get_shard_domain(domain, condition, window),
+            out_type, raw,
+        )
+        pages = results.iter_pages(concurrency=1)
+        try:
+            records = list(await pages.__anext__())
+        except StopAsyncIteration:
+            return [], []
+        windows = cls._split_shard(results.paginator, window, shard_size)
+        if windows:
+            await pages.aclose()
+        else:
+            async for page in pages:
+                records.extend(page)
+        return records, windows
+
+    @classmethod
+    async def _iter_shards(cls, search, windows, concurrency):
+        """Search the windows, and the windows they are split into.
+
+        Yields:
+            mixed: Each record found, once.
+        """
+        seen = set()
+        while windows:
+            split = []
+            async for _, result in cls._map_concurrent(
+                search, windows, concurrency,
+            ):
+                if isinstance(result, Exception):
+                    raise result
+                records, windows = result
+                split.extend(windows)
+                for record in cls._get_unseen(records, seen):
+                    yield record
+            windows = split
+
+    @staticmethod
+    async def _map_concurrent(func, items, concurrency, key=None):
+        """Await the coroutine of each item as concurrent tasks.
+
+        The bulk methods, such as ``get_many``, then return asynchronous
+        iterators to be used with ``async for``.
+
+        Yields:
+            tuple: Each item and its result, or the exception raised, in the
+                order in which they complete.
+        """
+        items = iter(items)
+        pending = {}
+
+        def submit():
+            for item in items:
+                pending[asyncio.ensure_future(func(item))] = item
+                return True
+            return False
+
+        try:
+            while len(pending) < concurrency and submit():
+                pass
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    item = pending.pop(task)
+                    submit()
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = e
+                    yield key(item) if key else item, result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _then(result, callback):
+        """Await the request, and return the callback's result with it."""
+        return callback(await result)
+
+    @staticmethod
+    async def _resolve(value):
+        """Return the value in place of a request's result."""
+        return value
+
+    @staticmethod
+    async def _finally(request, cleanup):
+        """Await the request, then call the cleanup even if it failed."""
+        try:
+            return await request()
+        finally:
+            cleanup()
+
+    @staticmethod
+    def _get_concurrency(session):
+        """Return the concurrency defined on the session."""
+        if isinstance(session, AsyncHelpScoutSession):
+            return session.concurrency
+        return 1
+
+    @staticmethod
+    def _is_lazy(session):
+        """Return whether the session asks for lazy models."""
+        return isinstance(session, AsyncHelpScoutSession) and session.lazy
+
+    @staticmethod
+    async def _get_singleton(paginator, output_type):
+        """Request a singleton and return its model."""
+        results = await paginator.call(paginator.data)
+        try:
+            result = results[0]
+        except (IndexError, TypeError):
+            return None
+        return output_type(**result)
+
+    @staticmethod
+    async def _none_if_not_found(singleton):
+        """Await the singleton, returning ``None`` on a 404 response."""
+        try:
+            return await singleton
+        except HelpScoutRemoteException as e:
+            if e.status_code == 404:
+                return None
+            raise
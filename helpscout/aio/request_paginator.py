@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import aiohttp
+import asyncio
+
+from collections import deque
+
+from ..exceptions import HelpScoutRemoteException
+from ..rate_limiter import RateLimiter
+from ..request_paginator import RequestPaginator
+from ..request_paginator.base64_stream import Base64StreamDecoder
+
+from .session import AsyncHelpScoutSession
+
+
+class AsyncRequestPaginator(RequestPaginator):
+    """This is the asyncio counterpart of ``RequestPaginator``.
+
+    It is iterated using ``async for``, and all request methods are
+    coroutines. Pages beyond the first are requested as concurrent tasks
+    when a ``concurrency`` above ``1`` is defined.
+    """
+
+    # Transient errors that are retried if the session has a retry policy
+    ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+    def __aiter__(self):
+        """Provide an asynchronous iterator for the remote request."""
+        return self.iterate()
+
+    async def iterate(self, concurrency=None, ordered=None):
+        """Iterate the remote request, optionally fetching pages in parallel.
+
+        Args:
+            concurrency (int, optional): Maximum number of pages to request
+             at the same time. Defaults to the value set on init.
+            ordered (bool, optional): Set this to ``False`` to yield rows as
+             soon as their page is received. Defaults to the value set on
+             init.
+
+        Yields:
+            mixed: Rows instantiated as ``self.output_type``.
+        """
+        async for page in self.iter_pages(concurrency=concurrency,
+                                          ordered=ordered):
+            for row in page:
+                yield row
+
+    async def iter_pages(self, start=1, stop=None, concurrency=None,
+                         ordered=None):
+        """Iterate a range of result pages.
+
+        See :func:`helpscout.request_paginator.RequestPaginator.iter_pages`.
+
+        Yields:
+            Page: Pages of rows, carrying their page number.
+        """
+        if concurrency is None:
+            concurrency = self.concurrency
+        if concurrency is None:
+            concurrency = self._get_session_setting('concurrency', 1)
+        if ordered is None:
+            ordered = self.ordered
+        if stop is not None and start >= stop:
+            return
+        rows = await self.call(self._get_page_data(start)) or []
+        if self.page_current <= self.page_total or rows:
+            yield self._new_page(self.page_current, self.page_total, rows)
+        last = self.page_total
+        if stop is not None:
+            last = min(last, stop - 1)
+        if concurrency > 1:
+            pages = range(self.page_current + 1, last + 1)
+            async for page in self._iter_concurrent(pages, concurrency,
+                                                    ordered):
+                yield page
+            return
+        while self.page_current < last:
+            rows = await self.call(
+                self._get_page_data(self.page_current + 1),
+            )
+            yield self._new_page(
+                self.page_current, self.page_total, rows or [],
+            )
+
+    async def call(self, data=None):
+        """Generic API caller. Return the JSON decoded result.
+
+        Args:
+            data (dict, optional): Either the request parameters or the JSON
+             data, depending on the request type.
+
+        Returns:
+            mixed: JSON decoded response.
+        """
+        return await getattr(self, self.request_type)(data)
+
+    async def locate(self, data=None):
+        """Send the request, and return its ``Location`` header.
+
+        See :func:`helpscout.request_paginator.RequestPaginator.locate`.
+        """
+        key = 'params' if self.request_type == self.GET else 'json'
+        _, headers, _ = await self._get_response(
+            self.request_type, self.endpoint, **{key: data}
+        )
+        return headers.get('Location')
+
+    async def upload(self, body):
+        """Send the request with a streamed JSON body, and return the result.
+
+        See :func:`helpscout.request_paginator.RequestPaginator.upload`.
+        """
+        return await self._call(
+            self.request_type, url=self.endpoint, data=body,
+            headers={
+                'Content-Type': 'application/json',
+                'Content-Length': str(len(body)),
+            },
+        )
+
+    async def download(self, key, dest):
+        """Send the request, decoding a base64 member of the response.
+
+        See :func:`helpscout.request_paginator.RequestPaginator.download`.
+        """
+        with self._open_dest(dest) as output:
+            decoder = Base64StreamDecoder(key, output)
+            await self._get_response(
+                self.request_type, self.endpoint, params=self.data,
+                consumer=decoder.feed,
+            )
+            return decoder.close()
+
+    async def delete(self, json=None):
+        """Send a DELETE request and return the JSON decoded result."""
+        return await self._call('delete', url=self.endpoint, json=json)
+
+    async def get(self, params=None):
+        """Send a GET request and return the JSON decoded result."""
+        return await self._call('get', url=self.endpoint, params=params)
+
+    async def post(self, json=None):
+        """Send a POST request and return the JSON decoded result."""
+        return await self._call('post', url=self.endpoint, json=json)
+
+    async def put(self, json=None):
+        """Send a PUT request and return the JSON decoded result."""
+        return await self._call('put', url=self.endpoint, json=json)
+
+    async def _iter_concurrent(self, pages, concurrency, ordered):
+        """Request the pages as concurrent tasks and yield them.
+
+        No more than ``concurrency`` pages are requested at any time.
+
+        Yields:
+            Page: The pages that were received.
+        """
+        pages = iter(pages)
+        pending = deque()
+
+        def submit():
+            for page in pages:
+                pending.append(asyncio.ensure_future(self._fetch_page(page)))
+                return True
+            return False
+
+        try:
+            while len(pending) < concurrency and submit():
+                pass
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                    await asyncio.wait([future])
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    future = done.pop()
+                    pending.remove(future)
+                submit()
+                yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _fetch_page(self, page):
+        """Request one page without touching the paginator state."""
+        data = self._get_page_data(page)
+        key = 'params' if self.request_type == self.GET else 'json'
+        response_json = await self._request(
+            self.request_type, url=self.endpoint, **{key: data}
+        )
+        return self._new_page(
+            response_json.get(self.PAGE_CURRENT, page),
+            response_json.get(self.PAGE_TOTAL, 1),
+            self._get_rows(response_json) or [],
+        )
+
+    async def _call(self, method, *args, **kwargs):
+        """Call the remote service and return the response data."""
+        response_json = await self._request(method, *args, **kwargs)
+        self.page_current = response_json.get(self.PAGE_CURRENT, 1)
+        self.page_total = response_json.get(self.PAGE_TOTAL, 1)
+        self.record_count = response_json.get(self.PAGE_COUNT)
+        return self._get_rows(response_json)
+
+    async def _request(self, method, url, **kwargs):
+        """Send the request and return the JSON decoded response body.
+
+        If the session has an ``http_cache``, ``GET`` requests are
+        revalidated against the cached response.
+
+        Raises:
+            HelpScoutRemoteException: If the remote responds with a non-2xx
+             status code.
+
+        Returns:
+            dict: The decoded response. Empty if there was no body.
+        """
+        http_cache = key = None
+        request_headers = kwargs.get('headers')
+        if method == self.GET:
+            http_cache = self._get_session_setting('http_cache')
+        if http_cache is not None:
+            key = http_cache.get_key(url, kwargs.get('params'))
+            headers = http_cache.get_headers(key)
+            if headers:
+                headers.update(request_headers or {})
+                kwargs['headers'] = headers
+
+        status_code, headers, response_json = await self._get_response(
+            method, url, **kwargs
+        )
+
+        if http_cache is not None:
+            response_json = http_cache.update(
+                key, status_code, headers, response_json,
+            )
+            if response_json is None and \
+                    status_code == http_cache.STATUS_NOT_MODIFIED:
+                # The response was evicted since its validators were sent,
+                # so request its body again.
+                kwargs['headers'] = request_headers
+                status_code, headers, response_json = \
+                    await self._get_response(method, url, **kwargs)
+                response_json = http_cache.update(
+                    key, status_code, headers, response_json or {},
+                )
+
+        return response_json or {}
+
+    async def _get_response(self, method, url, **kwargs):
+        """Send the request and return the successful response.
+
+        If the session has a ``retry_policy``, transient failures are
+        retried according to it.
+
+        Raises:
+            HelpScoutRemoteException: If the remote responds with a non-2xx
+             status code, other than ``304 Not Modified``.
+
+        Returns:
+            tuple: The status code, headers and decoded body.
+        """
+
+        assert self.session
+
+        if not kwargs.get('verify'):
+            kwargs['verify'] = self.SSL_VERIFY
+
+        retry_policy = self._get_session_setting('retry_policy')
+        if retry_policy:
+            status_code, headers, response_json = await self._send_retry(
+                retry_policy, method, url, **kwargs
+            )
+        else:
+            status_code, headers, response_json = await self._send(
+                method, url, **kwargs
+            )
+
+        # A 304 is only received in response to a conditional request.
+        if status_code == 304:
+            return status_code, headers, response_json
+
+        if status_code < 200 or status_code >= 300:
+            response_json = response_json or {}
+            message = response_json.get('error', response_json.get('message'))
+            raise HelpScoutRemoteException(status_code, message)
+
+        return status_code, headers, response_json
+
+    async def _send(self, method, url, **kwargs):
+        """Send the request using the session and return the response.
+
+        If the session has a ``rate_limiter``, the request waits for it and
+        is sent again after a ``429`` response, unless the session also has a
+        ``retry_policy``, which then retries it.
+
+        Returns:
+            tuple: The status code, headers and decoded body.
+        """
+        rate_limiter = self._get_session_setting('rate_limiter')
+        retries = rate_limiter and rate_limiter.max_retries or 0
+        if self._get_session_setting('retry_policy'):
+            retries = 0
+        while True:
+            if rate_limiter:
+                await self._acquire(rate_limiter)
+            # Rewind a streamed body, in case this is sent again.
+            if hasattr(kwargs.get('data'), 'seek'):
+                kwargs['data'].seek(0)
+            response = await self.session.request(method, url, **kwargs)
+            if rate_limiter:
+                rate_limiter.update(response[0], response[1])
+            if response[0] != 429 or retries <= 0:
+                return response
+            retries -= 1
+
+    async def _send_retry(self, retry_policy, method, url, **kwargs):
+        """Send the request, retrying transient failures per the policy.
+
+        This mirrors :func:`helpscout.retry_policy.RetryPolicy.call`, but
+        waits without blocking the event loop. A request whose response body
+        was partly passed to a ``consumer`` is not retried, since the
+        consumer cannot be fed the body again.
+
+        Returns:
+            tuple: The status code, headers and decoded body of the last
+                attempt.
+        """
+        consumer = kwargs.get('consumer')
+        received = False
+        if consumer is not None:
+            def feed(chunk):
+                nonlocal received
+                received = True
+                consumer(chunk)
+            kwargs['consumer'] = feed
+        loop = asyncio.get_event_loop()
+        started_at = loop.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_started_at = loop.time()
+            status_code = retry_after = error = None
+            headers = response_json = None
+            timeout = retry_policy.get_timeout(
+                None, attempt_started_at - started_at,
+            )
+            try:
+                status_code, headers, response_json = await asyncio.wait_for(
+                    self._send(method, url, **kwargs), timeout,
+                )
+                retry_after = RateLimiter.parse_retry_after(
+                    headers.get(RateLimiter.HEADER_RETRY_AFTER),
+                )
+            except self.ERRORS as e:
+                if received:
+                    raise
+                error = e
+            now = loop.time()
+            delay = retry_policy.get_delay(
+                method, attempt, now - started_at, status_code, retry_after,
+            )
+            retry_policy.report(method, url, attempt, now - attempt_started_at,
+                                status_code, error, delay)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return status_code, headers, response_json
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    async def _acquire(rate_limiter):
+        """Wait for the rate limiter without blocking the event loop."""
+        wait = rate_limiter.reserve()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = rate_limiter.reserve()
+
+    def _get_session_setting(self, name, default=None):
+        """Return a client-wide setting from an ``AsyncHelpScoutSession``."""
+        if isinstance(self.session, AsyncHelpScoutSession):
+            return getattr(self.session, name, default)
+        return default
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import aiohttp
+
+from base64 import b64encode
+from json import loads
+
+
+class AsyncHelpScoutSession(object):
+    """This is the asyncio counterpart of ``HelpScoutSession``.
+
+    It holds the authentication headers and one ``aiohttp.ClientSession``,
+    so that the connection pool is shared by all of the APIs and paginators.
+    The client session is created on first use, because ``aiohttp`` requires a
+    running event loop for this.
+
+    Attributes:
+        concurrency (int): Maximum number of pages that a paginator will
+            request at the same time.
+        limit (int): Maximum number of simultaneous connections in the pool.
+        rate_limiter (helpscout.rate_limiter.RateLimiter): Scheduler that
+            every request made with this session draws from, if any.
+        retry_policy (helpscout.retry_policy.RetryPolicy): Policy used to
+            retry the requests made with this session, if any.
+        http_cache (helpscout.http_cache.HttpCache): Cache used to revalidate
+            the ``GET`` requests made with this session, if any.
+        lazy (bool): Whether the APIs create models that parse their values
+            on access, using
+            :func:`helpscout.base_model.BaseModel.from_api_lazy`.
+    """
+
+    CHUNK_SIZE = 65536  # Bytes read at once when streaming
+
+    concurrency = 1
+    rate_limiter = None
+    retry_policy = None
+    http_cache = None
+    lazy = False
+
+    def __init__(self, api_key, concurrency=1, limit=100,
+                 rate_limiter=None, retry_policy=None, http_cache=None,
+                 lazy=False):
+        """Initialize a new session.
+
+        Args:
+            api_key (str): The API key to use for this session.
+            concurrency (int, optional): Maximum number of pages that a
+                paginator will request at the same time.
+            limit (int, optional): Maximum number of simultaneous connections
+                in the pool.
+            rate_limiter (helpscout.rate_limiter.RateLimiter, optional):
+                Scheduler that every request made with this session should
+                draw from.
+            retry_policy (helpscout.retry_policy.RetryPolicy, optional):
+                Policy used to retry transient failures of the requests made
+                with this session.
+            http_cache (helpscout.http_cache.HttpCache, optional): Cache used
+                to revalidate the ``GET`` requests made with this session.
+            lazy (bool, optional): Set this to ``True`` in order for the APIs
+                to create models that parse their values on access.
+        """
+        credentials = '%s:%s' % (api_key, 'NoPassBecauseKey!')
+        self.headers = {
+            'Authorization': 'Basic %s' % b64encode(
+                credentials.encode('utf-8'),
+            ).decode('ascii'),
+        }
+        self.concurrency = max(concurrency, 1)
+        self.limit = limit
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.http_cache = http_cache
+        self.lazy = lazy
+        self._client = None
+
+    @property
+    def client(self):
+        """The shared ``aiohttp.ClientSession``."""
+        if self._client is None or self._client.closed:
+            self._client = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.limit),
+            )
+        return self._client
+
+    async def request(self, method, url, params=None, json=None,
+                      verify=True, headers=None, data=None, consumer=None):
+        """Send a request and return its status, headers and decoded body.
+
+        Args:
+            method (str): HTTP method of the request.
+            url (str): Absolute URL to request.
+            params (dict, optional): Mapping of parameters for the query
+                string.
+            json (dict, optional): Object to encode and send in the request.
+            verify (bool, optional): Verify SSL certificates.
+            headers (dict, optional): Additional headers for the request.
+            data (io.RawIOBase, optional): Streamed body to send in the
+                request, instead of ``json``.
+            consumer (callable, optional): Function called with each chunk of
+                a successful response body, as it is received, in place of
+                decoding it.
+
+        Returns:
+            tuple: The response status code, the response headers, and the
+                JSON decoded body or ``None`` if there was no body.
+        """
+        if params:
+            # ``aiohttp`` only accepts strings & numbers in the query string.
+            params = {k: str(v) for k, v in params.items() if v is not None}
+        async with self.client.request(
+            method, url, params=params, json=json, data=data,
+            headers=headers,
+            ssl=None if verify else False,
+        ) as response:
+            if consumer is not None and 200 <= response.status < 300:
+                async for chunk in response.content.iter_chunked(
+                    self.CHUNK_SIZE,
+                ):
+                    consumer(chunk)
+                return response.status, response.headers, None
+            text = await response.text()
+            return (response.status, response.headers,
+                    text and loads(text) or None)
+
+    async def close(self):
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
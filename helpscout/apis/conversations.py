@@ -2,8 +2,12 @@
 # Copyright 2017-TODAY LasLabs Inc.
 # License MIT (https://opensource.org/licenses/MIT).
 
+import hashlib
+import os
+
 from .. import BaseApi
 
+from ..base64_body import Base64JsonBody
 from ..models.attachment import Attachment
 from ..models.attachment_data import AttachmentData
 from ..models.conversation import Conversation
@@ -58,7 +62,8 @@ class Conversations(BaseApi):
     __endpoint__ = 'conversations'
 
     @classmethod
-    def create(cls, session, record, imported=False, auto_reply=False):
+    def create(cls, session, record, imported=False, auto_reply=False,
+               reload=True):
         """Create a conversation.
 
         Please note that conversation cannot be created with more than 100
@@ -78,19 +83,23 @@ class Conversations(BaseApi):
              API. When ``auto_reply`` is set to ``True``, an auto reply will
              be sent as long as there is at least one ``customer`` thread in
              the conversation.
+            reload (bool, optional): Set this to ``False`` in order to only
+             receive the ID of the new conversation.
 
         Returns:
             helpscout.models.Conversation: Newly created conversation.
+            int: The ID of the new conversation, if ``reload`` is ``False``.
         """
         return super(Conversations, cls).create(
             session,
             record,
             imported=imported,
             auto_reply=auto_reply,
+            reload=reload,
         )
 
     @classmethod
-    def create_attachment(cls, session, attachment):
+    def create_attachment(cls, session, attachment, source=None):
         """Create an attachment.
 
         An attachment must be sent to the API before it can be used in a
@@ -103,21 +112,56 @@ class Conversations(BaseApi):
             session (requests.sessions.Session): Authenticated session.
             attachment (helpscout.models.Attachment): The attachment to be
              created.
+            source (str or file or buffer, optional): Path of a file, binary
+             file object, ``mmap`` or ``bytes`` to upload as the content of
+             the attachment, instead of its ``data``. The content is base64
+             encoded in chunks while it is sent, instead of in memory.
 
         Returns:
             helpscout.models.Attachment: The newly created attachment (hash
              property only). Use this hash when associating the attachment with
-             a new thread.
+             a new thread. If the session has an ``attachment_cache``, and an
+             identical attachment was already uploaded, its hash is returned
+             without uploading it again.
         """
-        return super(Conversations, cls).create(
-            session,
-            attachment,
-            endpoint_override='/attachments.json',
-            out_type=Attachment,
+        body = None
+        if source is not None:
+            values = attachment.to_api()
+            values.pop('data', None)
+            values['reload'] = True
+            body = Base64JsonBody(source, 'data', values)
+        attachment_cache = cls._get_attachment_cache(session)
+        if attachment_cache is None:
+            return cls._create_attachment(session, attachment, body)
+
+        if body is not None:
+            digest = body.digest()
+        else:
+            digest = hashlib.sha256(attachment.raw_data or b'').hexdigest()
+        key = attachment_cache.get_key(
+            digest, attachment.file_name, attachment.mime_type,
+        )
+        attachment_hash = attachment_cache.get(key)
+        if attachment_hash is not None:
+            if body is not None:
+                body.close()
+            return cls._resolve(Attachment(**Attachment.get_non_empty_vals({
+                'hash': attachment_hash,
+                'file_name': attachment.file_name,
+                'mime_type': attachment.mime_type,
+            })))
+
+        def created(result):
+            attachment_cache.set(key, getattr(result, 'hash', None))
+            return result
+
+        return cls._then(
+            cls._create_attachment(session, attachment, body), created,
         )
 
     @classmethod
-    def create_thread(cls, session, conversation, thread, imported=False):
+    def create_thread(cls, session, conversation, thread, imported=False,
+                      reload=True):
         """Create a conversation thread.
 
         Please note that threads cannot be added to conversations with 100
@@ -133,17 +177,25 @@ class Conversations(BaseApi):
              if moving from a different platform, you can import your
              history). When ``imported`` is set to ``True``, no outgoing
              emails or notifications will be generated.
+            reload (bool, optional): Set this to ``False`` in order to skip
+             sending back and parsing the conversation.
 
         Returns:
             helpscout.models.Conversation: Conversation including newly created
                 thread.
+            int: The ID from the ``Location`` of the response, if ``reload``
+                is ``False``.
         """
-        return super(Conversations, cls).create(
-            session,
-            thread,
-            endpoint_override='/conversations/%s.json' % conversation.id,
-            imported=imported,
-        )
+        try:
+            return super(Conversations, cls).create(
+                session,
+                thread,
+                endpoint_override='/conversations/%s.json' % conversation.id,
+                imported=imported,
+                reload=reload,
+            )
+        finally:
+            cls._invalidate_record(session, conversation.id)
 
     @classmethod
     def delete_attachment(cls, session, attachment):
@@ -165,13 +217,16 @@ class Conversations(BaseApi):
         )
 
     @classmethod
-    def find_customer(cls, session, mailbox, customer):
+    def find_customer(cls, session, mailbox, customer, raw=False):
         """Return conversations for a specific customer in a mailbox.
 
         Args:
             session (requests.sessions.Session): Authenticated session.
             mailbox (helpscout.models.Mailbox): Mailbox to search.
             customer (helpscout.models.Customer): Customer to search for.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.models.Conversation):
@@ -182,16 +237,20 @@ class Conversations(BaseApi):
                 mailbox.id, customer.id,
             ),
             session=session,
+            raw=raw,
         )
 
     @classmethod
-    def find_user(cls, session, mailbox, user):
+    def find_user(cls, session, mailbox, user, raw=False):
         """Return conversations for a specific user in a mailbox.
 
         Args:
             session (requests.sessions.Session): Authenticated session.
             mailbox (helpscout.models.Mailbox): Mailbox to search.
             user (helpscout.models.User): User to search for.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.models.Conversation):
@@ -202,6 +261,91 @@ class Conversations(BaseApi):
                 mailbox.id, user.id,
             ),
             session=session,
+            raw=raw,
+        )
+
+    @classmethod
+    def download_attachment(cls, session, attachment_id, dest):
+        """Download the data of an attachment to a file.
+
+        The base64 encoded data is decoded as it is received, and written in
+        chunks, instead of holding it in memory like
+        :func:`get_attachment_data`.
+
+        Args:
+            session (requests.sessions.Session): Authenticated session.
+            attachment_id (int): The ID of the attachment to download.
+            dest (str or file): Path of the file to write, or a writable
+                binary file object, such as ``io.BytesIO``.
+
+        Returns:
+            int: Size of the attachment, in bytes.
+        """
+        api = cls(
+            '/attachments/%d/data.json' % attachment_id,
+            session=session,
+            out_type=AttachmentData,
+        )
+        return api.paginator.download('data', dest)
+
+    @classmethod
+    def download_attachments(cls, session, attachments, directory,
+                             concurrency=None):
+        """Download many attachments to a directory, concurrently.
+
+        Each attachment is written to a file named after its ID, followed by
+        its file name if known. The files are yielded as soon as they are
+        written, and a failure to download one of them does not stop the
+        others.
+
+        Examples::
+
+            conversation = hs.Conversations.get(1234)
+            for attachment_id, path in hs.Conversations.download_attachments(
+                conversation, '/tmp/attachments', concurrency=4,
+            ):
+                print(path)
+
+        Args:
+            session (requests.sessions.Session): Authenticated session.
+            attachments (helpscout.models.Conversation or iter): A
+                conversation whose thread attachments to download, or an
+                iterator of attachments or attachment IDs.
+            directory (str): Path of the directory to write the files in.
+            concurrency (int, optional): Maximum number of attachments to
+                download at the same time. Defaults to the ``concurrency`` of
+                the ``HelpScout`` client.
+
+        Returns:
+            iter: Iterator of tuples, with the ID of each attachment and the
+                path of its file, or the exception that was raised if it
+                could not be downloaded.
+        """
+        if isinstance(attachments, Conversation):
+            attachments = [
+                attachment
+                for thread in attachments.threads or []
+                for attachment in thread.attachments or []
+            ]
+        if concurrency is None:
+            concurrency = cls._get_concurrency(session)
+
+        def get_id(attachment):
+            return getattr(attachment, 'id', attachment)
+
+        def download(attachment):
+            name = str(get_id(attachment))
+            file_name = getattr(attachment, 'file_name', None)
+            if file_name:
+                name = '%s-%s' % (name, os.path.basename(file_name))
+            path = os.path.join(directory, name)
+            return cls._then(
+                cls.download_attachment(session, get_id(attachment), path),
+                lambda size: path,
+            )
+
+        return cls._map_concurrent(
+            download, attachments, max(concurrency, 1), key=get_id,
         )
 
     @classmethod
@@ -225,28 +369,34 @@ class Conversations(BaseApi):
         )
 
     @classmethod
-    def list(cls, session, mailbox):
+    def list(cls, session, mailbox, raw=False):
         """Return conversations in a mailbox.
 
         Args:
             session (requests.sessions.Session): Authenticated session.
             mailbox (helpscout.models.Mailbox): Mailbox to list.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.models.Conversation):
                 Conversations iterator.
         """
         endpoint = '/mailboxes/%d/conversations.json' % mailbox.id
-        return super(Conversations, cls).list(session, endpoint)
+        return super(Conversations, cls).list(session, endpoint, raw=raw)
 
     @classmethod
-    def list_folder(cls, session, mailbox, folder):
+    def list_folder(cls, session, mailbox, folder, raw=False):
         """Return conversations in a specific folder of a mailbox.
 
         Args:
             session (requests.sessions.Session): Authenticated session.
             mailbox (helpscout.models.Mailbox): Mailbox that folder is in.
             folder (helpscout.models.Folder): Folder to list.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.models.Conversation):
@@ -257,10 +407,11 @@ class Conversations(BaseApi):
                 mailbox.id, folder.id,
             ),
             session=session,
+            raw=raw,
         )
 
     @classmethod
-    def search(cls, session, queries):
+    def search(cls, session, queries, raw=False):
         """Search for a conversation given a domain.
 
         Args:
@@ -271,37 +422,88 @@ class Conversations(BaseApi):
                 from the complex queries. In this case, the queries should
                 conform to the interface in
                 :func:`helpscout.domain.Domain.from_tuple`.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.models.SearchCustomer):
                 SearchCustomer iterator.
         """
         return super(Conversations, cls).search(
-            session, queries, SearchConversation,
+            session, queries, SearchConversation, raw=raw,
+        )
+
+    @classmethod
+    def search_sharded(cls, session, queries, field=None, shard_size=500,
+                       concurrency=None, raw=False):
+        """Search for conversations by splitting the date time range.
+
+        See :func:`helpscout.base_api.BaseApi.search_sharded`.
+
+        Returns:
+            iter: SearchConversation iterator.
+        """
+        return super(Conversations, cls).search_sharded(
+            session, queries, SearchConversation, field=field,
+            shard_size=shard_size, concurrency=concurrency, raw=raw,
         )
 
     @classmethod
-    def update_thread(cls, session, conversation, thread):
+    def update_thread(cls, session, conversation, thread, reload=True):
         """Update a thread.
 
+        Only the properties that changed are sent for threads that were
+        loaded from the API, and no request is made at all if none changed.
+
         Args:
             session (requests.sessions.Session): Authenticated session.
             conversation (helpscout.models.Conversation): The conversation
                 that the thread belongs to.
             thread (helpscout.models.Thread): The thread to be updated.
+            reload (bool, optional): Set this to ``False`` in order to skip
+                sending back and parsing the conversation.
 
         Returns:
             helpscout.models.Conversation: Conversation including freshly
                 updated thread.
+            int: The ID of the thread, if ``reload`` is ``False``.
         """
-        data = thread.to_api()
-        data['reload'] = True
-        return cls(
-            '/conversations/%s/threads/%d.json' % (
-                conversation.id, thread.id,
-            ),
-            data=data,
-            request_type=RequestPaginator.PUT,
-            singleton=True,
-            session=session,
+        changes = thread.get_changes()
+        if changes is not None and not changes:
+            return cls._resolve(conversation if reload else thread.id)
+        data = thread.to_api(changes)
+        data['reload'] = reload
+        endpoint = '/conversations/%s/threads/%d.json' % (
+            conversation.id, thread.id,
+        )
+        try:
+            if not reload:
+                result = cls._locate(
+                    session, endpoint, data, RequestPaginator.PUT, thread.id,
+                )
+            else:
+                result = cls(
+                    endpoint,
+                    data=data,
+                    request_type=RequestPaginator.PUT,
+                    singleton=True,
+                    session=session,
+                )
+            return cls._then(result, cls._get_sent(thread))
+        finally:
+            cls._invalidate_record(session, conversation.id)
+
+    @classmethod
+    def _create_attachment(cls, session, attachment, body=None):
+        """Upload an attachment, streaming the body if any."""
+        if body is not None:
+            return cls._upload(
+                session, '/attachments.json', body, out_type=Attachment,
+            )
+        return super(Conversations, cls).create(
+            session,
+            attachment,
+            endpoint_override='/attachments.json',
+            out_type=Attachment,
         )
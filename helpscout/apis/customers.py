@@ -36,7 +36,7 @@ class Customers(BaseApi):
 
     @classmethod
     def list(cls, session, first_name=None, last_name=None, email=None,
-             modified_since=None):
+             modified_since=None, raw=False):
         """List the customers.
 
         Customers can be filtered on any combination of first name, last name,
@@ -49,6 +49,9 @@ class Customers(BaseApi):
             email (str, optional): Email address of customer.
             modified_since (datetime.datetime, optional): If modified after
                 this date.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.models.Customer): Customers
@@ -61,11 +64,12 @@ class Customers(BaseApi):
                 'lastName': last_name,
                 'email': email,
                 'modifiedSince': modified_since,
-            })
+            }),
+            raw=raw,
         )
 
     @classmethod
-    def search(cls, session, queries):
+    def search(cls, session, queries, raw=False):
         """Search for a customer given a domain.
 
         Args:
@@ -76,9 +80,29 @@ class Customers(BaseApi):
                 from the complex queries. In this case, the queries should
                 conform to the interface in
                 :func:`helpscout.domain.Domain.from_tuple`.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.models.SearchCustomer):
                 SearchCustomer iterator.
         """
-        return super(Customers, cls).search(session, queries, SearchCustomer)
+        return super(Customers, cls).search(
+            session, queries, SearchCustomer, raw=raw,
+        )
+
+    @classmethod
+    def search_sharded(cls, session, queries, field=None, shard_size=500,
+                       concurrency=None, raw=False):
+        """Search for customers by splitting the date time range.
+
+        See :func:`helpscout.base_api.BaseApi.search_sharded`.
+
+        Returns:
+            iter: SearchCustomer iterator.
+        """
+        return super(Customers, cls).search_sharded(
+            session, queries, SearchCustomer, field=field,
+            shard_size=shard_size, concurrency=concurrency, raw=raw,
+        )
@@ -29,17 +29,20 @@ class Mailboxes(BaseApi):
     __implements__ = ['get', 'list']
 
     @classmethod
-    def list(cls, session):
+    def list(cls, session, raw=False):
         """List the mailboxes.
 
         Args:
             session (requests.sessions.Session): Authenticated session.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.models.Mailbox): Mailboxes
                 iterator.
         """
-        return cls('/mailboxes.json', session=session)
+        return cls('/mailboxes.json', session=session, raw=raw)
 
     @classmethod
     def get_folders(cls, session, mailbox_or_id):
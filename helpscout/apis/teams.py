@@ -28,35 +28,42 @@ class Teams(BaseApi):
     __implements__ = ['get', 'list']
 
     @classmethod
-    def get(cls, session, team_id):
+    def get(cls, session, team_id, raw=False):
         """Return a specific team.
 
         Args:
             session (requests.sessions.Session): Authenticated session.
             team_id (int): The ID of the team to get.
+            raw (bool or str, optional): Return the decoded dictionary
+                instead of a model. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             helpscout.models.Person: A person singleton representing the team,
                 if existing. Otherwise ``None``.
         """
-        return cls(
-            '/teams/%d.json' % team_id,
-            singleton=True,
-            session=session,
+        return super(Teams, cls).get(
+            session,
+            team_id,
+            endpoint_override='/teams/%d.json' % team_id,
+            raw=raw,
         )
 
     @classmethod
-    def list(cls, session):
+    def list(cls, session, raw=False):
         """List the teams.
 
         Args:
             session (requests.sessions.Session): Authenticated session.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.models.Person): Person
                 iterator representing the teams.
         """
-        return cls('/teams.json', session=session)
+        return cls('/teams.json', session=session, raw=raw)
 
     @classmethod
     def get_members(cls, session, team_or_id):
@@ -37,13 +37,15 @@ class Users(BaseApi):
         Args:
             session (requests.sessions.Session): Authenticated session.
 
+        Raises:
+            helpscout.exceptions.HelpScoutRemoteException: If the user cannot
+                be retrieved.
+
         Returns:
             helpscout.models.User: A user singleton
         """
-        return cls(
-            '/users/me.json',
-            singleton=True,
-            session=session,
+        return cls._get_cached(
+            session, 'me', endpoint_override='/users/me.json',
         )
 
     @classmethod
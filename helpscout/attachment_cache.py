@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import json
+import threading
+
+from .json_log import JsonLog
+
+
+class AttachmentCache(object):
+    """This remembers the hashes of the attachments that were uploaded.
+
+    Attachments are identified by a digest of their content, along with
+    their file name and mime type. Uploading an attachment that was already
+    uploaded returns the hash that HelpScout assigned to it the first time,
+    without sending the content again, so that it can be referenced by
+    another thread.
+
+    The hashes are kept in memory, and appended to a file as lines of JSON
+    if a path is given, so that they are reused by later runs as well.
+
+    An ``AttachmentCache`` attached to a ``HelpScoutSession`` is used by
+    ``Conversations.create_attachment``.
+
+    Examples::
+
+        from helpscout import AttachmentCache, HelpScout
+        hs = HelpScout('api_key', attachment_cache=AttachmentCache(
+            'attachments.cache',
+        ))
+
+    Attributes:
+        path (str): Path of the file storing the hashes, if any.
+        hits (int): Number of uploads that were answered from the cache.
+        misses (int): Number of uploads that were sent.
+    """
+
+    def __init__(self, path=None):
+        """Initialize a new cache, loading the file if it exists.
+
+        Args:
+            path (str, optional): Path of the file storing the hashes.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self._log = None if path is None else JsonLog(path)
+        self._load()
+
+    def __len__(self):
+        return len(self._hashes)
+
+    @staticmethod
+    def get_key(digest, file_name=None, mime_type=None):
+        """Return the key of an attachment.
+
+        Args:
+            digest (str): Hex digest of the raw content of the attachment.
+            file_name (str, optional): File name of the attachment.
+            mime_type (str, optional): Mime type of the attachment.
+
+        Returns:
+            str: A key that is identical for identical attachments.
+        """
+        return json.dumps([digest, file_name, mime_type])
+
+    def get(self, key):
+        """Return the hash of the attachment, or ``None`` if not uploaded.
+
+        Args:
+            key (str): Key of the attachment, from :func:`get_key`.
+
+        Returns:
+            str: The hash that HelpScout assigned to the attachment.
+        """
+        with self._lock:
+            attachment_hash = self._hashes.get(key)
+            if attachment_hash is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return attachment_hash
+
+    def set(self, key, attachment_hash):
+        """Store the hash of an uploaded attachment.
+
+        Args:
+            key (str): Key of the attachment, from :func:`get_key`.
+            attachment_hash (str): The hash that HelpScout assigned to it.
+                ``None`` removes the attachment from the cache.
+        """
+        with self._lock:
+            if attachment_hash is None:
+                self._hashes.pop(key, None)
+            else:
+                self._hashes[key] = attachment_hash
+            if self._log is not None:
+                self._log.append({'key': key, 'hash': attachment_hash})
+
+    def invalidate(self, key):
+        """Remove an attachment, so that it is uploaded again.
+
+        Args:
+            key (str): Key of the attachment, from :func:`get_key`.
+        """
+        self.set(key, None)
+
+    def _load(self):
+        """Load the hashes from the file."""
+        if self._log is None:
+            return
+        for entry in self._log.load():
+            if entry.get('hash') is None:
+                self._hashes.pop(entry['key'], None)
+            else:
+                self._hashes[entry['key']] = entry['hash']
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import base64
+import hashlib
+import io
+import json
+import mmap
+import os
+import stat
+
+from six import binary_type, string_types
+
+
+class Base64JsonBody(io.RawIOBase):
+    """This is a JSON request body with one member encoded from a stream.
+
+    The member is base64 encoded in chunks as the body is read, so that
+    uploading a large file never holds more than one chunk of it in memory.
+    The source can be a path, a seekable binary file object, an ``mmap``,
+    or any object supporting the buffer protocol, such as ``bytes``. File
+    objects and memory maps are read from their current position, and
+    buffers as a whole. On Python 2, a ``str`` is taken as a path, so
+    content must be given as a ``bytearray`` or ``memoryview`` instead.
+
+    The length of the body is known in advance, so that it is sent with a
+    ``Content-Length`` header.
+
+    Example::
+
+        body = Base64JsonBody('report.pdf', 'data', {'fileName': 'a.pdf'})
+        session.post(url, data=body, headers={'Content-Length': len(body)})
+
+    Attributes:
+        name (str): Name of the base64 encoded member.
+        values (dict): The other members of the object.
+    """
+
+    # Bytes read from the source at once. A multiple of 3, so that the
+    # encoded chunks can be concatenated.
+    CHUNK_SIZE = 49152
+
+    def __init__(self, source, name='data', values=None):
+        """Initialize a new body.
+
+        Args:
+            source (str or file or buffer): Path of the file to encode, or
+                a binary file object or buffer holding its content.
+            name (str, optional): Name of the base64 encoded member.
+            values (dict, optional): The other members of the object.
+
+        Raises:
+            ValueError: If the size of the source cannot be determined.
+        """
+        super(Base64JsonBody, self).__init__()
+        self.name = name
+        self.values = values or {}
+        self._owned = isinstance(source, string_types)
+        if self._owned:
+            source = open(source, 'rb')
+        elif not hasattr(source, 'read'):
+            source = self._get_buffer(source)
+        # Read the bytes beneath a text file object.
+        self._source = getattr(source, 'buffer', source)
+        self._start = self._get_position()
+        self._size = self._get_size()
+        if self._size is None:
+            self.close()
+            raise ValueError('The size of the source cannot be determined.')
+        prefix = json.dumps(self.values)[:-1]
+        if self.values:
+            prefix += ', '
+        self._prefix = (prefix + json.dumps(name) + ': "').encode('utf-8')
+        self._suffix = b'"}'
+        self.seek(0)
+
+    def __len__(self):
+        encoded = (self._size + 2) // 3 * 4
+        return len(self._prefix) + encoded + len(self._suffix)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Rewind the body, so that it can be sent again.
+
+        Only seeking to the start, or to the current position, is supported.
+        """
+        if whence == io.SEEK_CUR and offset == 0:
+            return self._position
+        if whence != io.SEEK_SET or offset != 0:
+            raise io.UnsupportedOperation('Can only seek to the start.')
+        if isinstance(self._source, memoryview):
+            self._offset = 0
+        else:
+            self._source.seek(self._start)
+        self._buffer = self._prefix
+        self._buffer_position = 0
+        self._remainder = b''
+        self._position = 0
+        self._done = False
+        return 0
+
+    def read(self, size=-1):
+        """Return up to ``size`` bytes of the body, or all if negative."""
+        chunks = []
+        while size != 0:
+            start = self._buffer_position
+            if start >= len(self._buffer):
+                if self._done:
+                    break
+                self._buffer = self._next_chunk()
+                self._buffer_position = 0
+                continue
+            end = len(self._buffer) if size < 0 else start + size
+            chunk = self._buffer[start:end]
+            self._buffer_position += len(chunk)
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        data = b''.join(chunks)
+        self._position += len(data)
+        return data
+
+    def digest(self, algorithm='sha256'):
+        """Return the hex digest of the raw content, and rewind the body.
+
+        Args:
+            algorithm (str, optional): Name of the ``hashlib`` algorithm.
+
+        Returns:
+            str: The hex digest of the content of the source.
+        """
+        content_hash = hashlib.new(algorithm)
+        self.seek(0)
+        while True:
+            data = self._read_source()
+            if not data:
+                break
+            content_hash.update(data)
+        self.seek(0)
+        return content_hash.hexdigest()
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        source = getattr(self, '_source', None)
+        if not self.closed and source is not None:
+            if self._owned:
+                source.close()
+            elif hasattr(source, 'release'):
+                # Let the buffer be resized, or its memory map be closed.
+                source.release()
+        super(Base64JsonBody, self).close()
+
+    def _next_chunk(self):
+        """Return the next encoded chunk, or the end of the body."""
+        data = self._remainder + self._read_source()
+        if not data:
+            self._done = True
+            return self._suffix
+        if len(data) % 3 and not self._at_end:
+            # Keep the bytes that cannot be encoded without padding.
+            cut = len(data) - len(data) % 3
+            data, self._remainder = data[:cut], data[cut:]
+        else:
+            self._remainder = b''
+        return base64.b64encode(data)
+
+    def _read_source(self):
+        """Read the next chunk of the source."""
+        if isinstance(self._source, memoryview):
+            data = self._source[self._offset:self._offset + self.CHUNK_SIZE]
+            self._offset += len(data)
+            self._at_end = self._offset >= len(self._source)
+            return data.tobytes()
+        data = self._source.read(self.CHUNK_SIZE)
+        if not isinstance(data, binary_type):
+            raise TypeError('The source must be opened in binary mode.')
+        self._at_end = not data
+        return data
+
+    @staticmethod
+    def _get_buffer(source):
+        """Return a view of the bytes of a buffer."""
+        buffer = memoryview(source)
+        if buffer.itemsize == 1:
+            return buffer
+        if hasattr(buffer, 'cast'):
+            return buffer.cast('B')
+        # Python 2 cannot cast a view, so copy its bytes.
+        return memoryview(buffer.tobytes())
+
+    def _get_position(self):
+        """Return the position of the source, where the content starts."""
+        if isinstance(self._source, memoryview):
+            return 0
+        try:
+            return self._source.tell()
+        except (AttributeError, IOError, OSError, io.UnsupportedOperation):
+            return 0
+
+    def _get_size(self):
+        """Return the size of the content, or ``None`` if unknown."""
+        if isinstance(self._source, memoryview):
+            return len(self._source)
+        if isinstance(self._source, mmap.mmap):
+            return len(self._source) - self._start
+        try:
+            status = os.fstat(self._source.fileno())
+            if stat.S_ISREG(status.st_mode):
+                return status.st_size - self._start
+        except (AttributeError, IOError, OSError, io.UnsupportedOperation):
+            pass
+        try:
+            if not self._source.seekable():
+                return None
+            size = self._source.seek(0, io.SEEK_END) - self._start
+            self._source.seek(self._start)
+            return size
+        except (AttributeError, IOError, OSError, TypeError,
+                io.UnsupportedOperation):
+            return None
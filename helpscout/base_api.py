@@ -2,10 +2,16 @@
 # Copyright 2017-TODAY LasLabs Inc.
 # License MIT (https://opensource.org/licenses/MIT).
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
 from .base_model import BaseModel
-from .domain import Domain
+from .progress_log import ProgressLog
+from .domain import Domain, DomainConditionDateTime
 from .exceptions import HelpScoutRemoteException
 from .request_paginator import RequestPaginator
+from .session import HelpScoutSession
+from .split_search import SplitSearch
 
 
 class BaseApi(object):
@@ -36,9 +42,19 @@ class BaseApi(object):
     # This is set within new, after the object has been created.
     paginator = None
 
+    # Shortest time window that a sharded search splits.
+    SHARD_MIN = timedelta(seconds=1)
+
+    # Longest search query sent in one request, before URL encoding.
+    MAX_QUERY_LENGTH = 1500
+
+    # Pass this as ``raw`` in order to receive dictionaries with snake_case
+    # keys instead of models.
+    RAW_SNAKE_CASE = 'snake_case'
+
     def __new__(cls, endpoint, data=None,
                 request_type=RequestPaginator.GET, singleton=False,
-                session=None, out_type=None):
+                session=None, out_type=None, raw=False, lazy=None):
         """Create a new API object.
 
         Args:
@@ -55,6 +71,13 @@ class BaseApi(object):
             out_type (BaseModel, optional): If set, this object will be used
                 for the creation of the models, instead of the one set in
                 ``cls.__object__``.
+            raw (bool or str, optional): Set this to ``True`` in order to
+                return the decoded JSON dictionaries as received, instead of
+                models. Set it to ``RAW_SNAKE_CASE`` in order to also switch
+                their keys to snake_case.
+            lazy (bool, optional): Set this to ``True`` in order to create
+                models that parse their values on access. Defaults to the
+                ``lazy`` setting of the session.
 
         Raises:
             HelpScoutRemoteException: If ``singleton`` is ``True``, but the
@@ -65,14 +88,17 @@ class BaseApi(object):
                 ``False``.
             BaseModel: An instance of a Model, if ``singleton`` is
                 ``True`` and there are results.
+            dict: The decoded result, if ``singleton`` is ``True``, there
+                are results and ``raw`` is set.
             None: If ``singleton`` is ``True`` and there are no results.
         """
-        if out_type is None:
-            out_type = cls.__object__
+        if lazy is None:
+            lazy = cls._is_lazy(session)
+        output_type = cls._get_output_type(out_type, raw, lazy)
         paginator = RequestPaginator(
             endpoint='%s%s' % (cls.BASE_URI, endpoint),
             data=data,
-            output_type=out_type.from_api,
+            output_type=output_type,
             request_type=request_type,
             session=session,
         )
@@ -82,7 +108,7 @@ class BaseApi(object):
                 result = results[0]
             except (IndexError, TypeError):
                 return None
-            return out_type.from_api(**result)
+            return output_type(**result)
         obj = super(BaseApi, cls).__new__(cls)
         obj.paginator = paginator
         return obj
@@ -91,7 +117,74 @@ class BaseApi(object):
         """Pass through iteration to the API response."""
         for row in self.paginator:
             yield row
-        raise StopIteration()
+
+    def iterate(self, concurrency=None, ordered=None, stream=None):
+        """Iterate the API response, optionally fetching pages in parallel.
+
+        Args:
+            concurrency (int, optional): Maximum number of pages to request
+                at the same time. Defaults to the ``concurrency`` of the
+                ``HelpScout`` client.
+            ordered (bool, optional): Set this to ``False`` in order to yield
+                records as soon as their page is received, instead of in
+                page order.
+            stream (bool, optional): Set this to ``True`` in order to decode
+                the records one at a time while each page is received, which
+                keeps memory use proportional to one record instead of one
+                page. Pages are then requested one at a time.
+
+        Returns:
+            iter: Iterator of records, as with normal iteration.
+        """
+        return self.paginator.iterate(concurrency=concurrency,
+                                      ordered=ordered, stream=stream)
+
+    def iter_pages(self, start=1, stop=None, concurrency=None, ordered=None):
+        """Iterate a range of result pages.
+
+        Examples::
+
+            for page in hs.Conversations.list(mailbox).iter_pages(137):
+                export(page.records)
+                save_checkpoint(page.number)
+
+        Args:
+            start (int, optional): Number of the first page to request.
+            stop (int, optional): Number of the page to stop before, as with
+                ``range``. Defaults to after the last page.
+            concurrency (int, optional): Maximum number of pages to request
+                at the same time.
+            ordered (bool, optional): Set this to ``False`` in order to yield
+                pages as soon as they are received.
+
+        Returns:
+            iter: Iterator of ``helpscout.request_paginator.Page`` objects,
+                each carrying its page ``number`` and ``records``.
+        """
+        return self.paginator.iter_pages(
+            start, stop, concurrency=concurrency, ordered=ordered,
+        )
+
+    def resume(self, checkpoint, stop=None, concurrency=None, ordered=None):
+        """Continue iterating result pages after a checkpoint.
+
+        Args:
+            checkpoint (int or helpscout.request_paginator.Page): The last
+                page that was fully processed, or its number. Every page
+                before it must have been processed, so only ordered pages are
+                valid checkpoints.
+            stop (int, optional): Number of the page to stop before.
+            concurrency (int, optional): Maximum number of pages to request
+                at the same time.
+            ordered (bool, optional): Set this to ``False`` in order to yield
+                pages as soon as they are received.
+
+        Returns:
+            iter: Iterator of ``helpscout.request_paginator.Page`` objects.
+        """
+        return self.paginator.resume(
+            checkpoint, stop, concurrency=concurrency, ordered=ordered,
+        )
 
     @classmethod
     def new_object(cls, data):
@@ -106,6 +199,42 @@ class BaseApi(object):
         """
         return cls.__object__.from_api(**data)
 
+    @classmethod
+    def _get_output_type(cls, out_type=None, raw=False, lazy=False):
+        """Return the callable that creates results from the API rows.
+
+        Args:
+            out_type (BaseModel, optional): The model to create. Defaults to
+                ``cls.__object__``.
+            raw (bool or str, optional): ``True`` to return the rows as
+                received, or ``RAW_SNAKE_CASE`` to return them with
+                snake_case keys.
+            lazy (bool, optional): ``True`` to create models that parse
+                their values on access.
+
+        Returns:
+            callable: Accepting the row as keyword arguments.
+        """
+        if raw == cls.RAW_SNAKE_CASE:
+            return cls._to_snake_case_row
+        if raw:
+            return dict
+        if out_type is None:
+            out_type = cls.__object__
+        if lazy:
+            return out_type.from_api_lazy
+        return out_type.from_api
+
+    @staticmethod
+    def _is_lazy(session):
+        """Return whether the session asks for lazy models."""
+        return isinstance(session, HelpScoutSession) and session.lazy
+
+    @staticmethod
+    def _to_snake_case_row(**row):
+        """Return the API row as a dictionary with snake_case keys."""
+        return BaseModel.to_snake_case_keys(row)
+
     @staticmethod
     def get_search_domain(queries):
         """Helper method to create search domains if needed.
@@ -128,7 +257,7 @@ class BaseApi(object):
 
     @classmethod
     def create(cls, session, record, endpoint_override=None, out_type=None,
-               **add_params):
+               reload=True, **add_params):
         """Create an object on HelpScout.
 
         Args:
@@ -139,18 +268,31 @@ class BaseApi(object):
             out_type (helpscout.BaseModel, optional): The type of record to
                 output. This should be provided by child classes, by calling
                 super.
+            reload (bool, optional): Set this to ``False`` in order to only
+                receive the ID of the new record, which skips sending back
+                and parsing the whole record.
             **add_params (mixed): Add these to the request parameters.
 
         Returns:
-            helpscout.models.BaseModel: Newly created record. Will be of the
+            helpscout.models.BaseModel or int: The newly created record, of
+                ``out_type`` if provided. If ``reload`` is ``False``, the ID
+                of the new record instead, or ``None`` if HelpScout did not
+                provide it.
         """
         cls._check_implements('create')
         data = record.to_api()
         params = {
-            'reload': True,
+            'reload': reload,
         }
         params.update(**add_params)
         data.update(params)
+        if not reload:
+            return cls._locate(
+                session,
+                endpoint_override or '/%s.json' % cls.__endpoint__,
+                data,
+                RequestPaginator.POST,
+            )
         return cls(
             endpoint_override or '/%s.json' % cls.__endpoint__,
             data=data,
@@ -160,6 +302,68 @@ class BaseApi(object):
             out_type=out_type,
         )
 
+    @classmethod
+    def create_many(cls, session, records, concurrency=None,
+                    progress_log=None, **kwargs):
+        """Create many objects on HelpScout, concurrently.
+
+        The records are created using :func:`create` on a bounded pool of
+        workers, which draw from the rate limiter of the session if any. The
+        results are yielded as soon as they are received, and a failure to
+        create one of the records does not stop the others.
+
+        Examples::
+
+            log = ProgressLog('import.progress')
+            for conversation, result in hs.Conversations.create_many(
+                conversations, concurrency=8, progress_log=log,
+                imported=True,
+            ):
+                if isinstance(result, Exception):
+                    print('Failed: %s' % result)
+
+        Args:
+            session (requests.sessions.Session): Authenticated session.
+            records (iter): The records to be created.
+            concurrency (int, optional): Maximum number of records to create
+                at the same time. Defaults to the ``concurrency`` of the
+                ``HelpScout`` client.
+            progress_log (helpscout.progress_log.ProgressLog or str,
+                optional): Log of the records that were created, or its
+                path. Records that it lists are skipped, and the others are
+                added to it once created.
+            **kwargs (mixed): Keyword arguments for :func:`create`.
+
+        Returns:
+            iter: Iterator of tuples, with each record and the newly created
+                record, or the exception that was raised if it could not be
+                created.
+        """
+        cls._check_implements('create')
+        if concurrency is None:
+            concurrency = cls._get_concurrency(session)
+        if progress_log is not None:
+            if not isinstance(progress_log, ProgressLog):
+                progress_log = ProgressLog(progress_log)
+            records = (
+                r for r in records
+                if progress_log.get_key(r) not in progress_log
+            )
+
+        def create(record):
+            result = cls.create(session, record, **kwargs)
+            if progress_log is None:
+                return result
+            key = progress_log.get_key(record)
+
+            def add(created):
+                progress_log.add(key, getattr(created, 'id', created))
+                return created
+
+            return cls._then(result, add)
+
+        return cls._map_concurrent(create, records, max(concurrency, 1))
+
     @classmethod
     def delete(cls, session, record, endpoint_override=None, out_type=None):
         """Delete a record.
@@ -177,18 +381,21 @@ class BaseApi(object):
             NoneType: Nothing.
         """
         cls._check_implements('delete')
-        return cls(
-            endpoint_override or '/%s/%s.json' % (
-                cls.__endpoint__, record.id,
-            ),
-            request_type=RequestPaginator.DELETE,
-            singleton=True,
-            session=session,
-            out_type=out_type,
-        )
+        try:
+            return cls(
+                endpoint_override or '/%s/%s.json' % (
+                    cls.__endpoint__, record.id,
+                ),
+                request_type=RequestPaginator.DELETE,
+                singleton=True,
+                session=session,
+                out_type=out_type,
+            )
+        finally:
+            cls._invalidate_record(session, record.id)
 
     @classmethod
-    def get(cls, session, record_id, endpoint_override=None):
+    def get(cls, session, record_id, endpoint_override=None, raw=False):
         """Return a specific record.
 
         Args:
@@ -196,6 +403,8 @@ class BaseApi(object):
             record_id (int): The ID of the record to get.
             endpoint_override (str, optional): Override the default
                 endpoint using this.
+            raw (bool or str, optional): Return the decoded dictionary
+                instead of a model. See :func:`__new__`.
 
         Returns:
             helpscout.BaseModel: A record singleton, if existing. Otherwise
@@ -203,12 +412,8 @@ class BaseApi(object):
         """
         cls._check_implements('get')
         try:
-            return cls(
-                endpoint_override or '/%s/%d.json' % (
-                    cls.__endpoint__, record_id,
-                ),
-                singleton=True,
-                session=session,
+            return cls._get_cached(
+                session, record_id, endpoint_override, raw,
             )
         except HelpScoutRemoteException as e:
             if e.status_code == 404:
@@ -217,7 +422,80 @@ class BaseApi(object):
                 raise
 
     @classmethod
-    def list(cls, session, endpoint_override=None, data=None):
+    def _get_cached(cls, session, record_id, endpoint_override=None,
+                    raw=False):
+        """Return a specific record, through the record cache if any.
+
+        Unlike :func:`get`, this raises if the record does not exist. A
+        record requested from an overridden endpoint is cached separately
+        from the one requested from the default endpoint.
+        """
+        record_cache = cls._get_record_cache(session)
+        if record_cache is not None:
+            output_type = cls._get_output_type(
+                raw=raw, lazy=cls._is_lazy(session),
+            )
+            key = record_id
+            if endpoint_override is not None:
+                key = (record_id, endpoint_override)
+            record = record_cache.get(cls.__name__, key)
+            if record is not None:
+                return output_type(**record)
+            generation = record_cache.generation()
+            raw = True
+        record = cls(
+            endpoint_override or '/%s/%d.json' % (
+                cls.__endpoint__, record_id,
+            ),
+            singleton=True,
+            session=session,
+            raw=raw,
+        )
+        if record_cache is None or record is None:
+            return record
+        record_cache.set(cls.__name__, key, record, generation)
+        return output_type(**record)
+
+    @classmethod
+    def get_many(cls, session, record_ids, concurrency=None, raw=False):
+        """Return many specific records, requesting them concurrently.
+
+        The records are yielded as soon as they are received, so not
+        necessarily in the order of ``record_ids``. A failure to get one of
+        the records does not stop the others from being requested.
+
+        Examples::
+
+            for customer_id, customer in hs.Customers.get_many(ids):
+                if isinstance(customer, Exception):
+                    print('Failed to get %d: %s' % (customer_id, customer))
+
+        Args:
+            session (requests.sessions.Session): Authenticated session.
+            record_ids (iter): The IDs of the records to get.
+            concurrency (int, optional): Maximum number of records to request
+                at the same time. Defaults to the ``concurrency`` of the
+                ``HelpScout`` client.
+            raw (bool or str, optional): Return the decoded dictionaries
+                instead of models. See :func:`__new__`.
+
+        Returns:
+            iter: Iterator of tuples, with the ID and the result of
+                :func:`get` for each record. The result is ``None`` if the
+                record does not exist, or the exception that was raised if it
+                could not be requested.
+        """
+        cls._check_implements('get')
+        if concurrency is None:
+            concurrency = cls._get_concurrency(session)
+
+        def get(record_id):
+            return cls.get(session, record_id, raw=raw)
+
+        return cls._map_concurrent(get, record_ids, max(concurrency, 1))
+
+    @classmethod
+    def list(cls, session, endpoint_override=None, data=None, raw=False):
         """Return records in a mailbox.
 
         Args:
@@ -225,6 +503,8 @@ class BaseApi(object):
             endpoint_override (str, optional): Override the default
                 endpoint using this.
             data (dict, optional): Data to provide as request parameters.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See :func:`__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.BaseModel): Results
@@ -235,12 +515,21 @@ class BaseApi(object):
             endpoint_override or '/%s.json' % cls.__endpoint__,
             data=data,
             session=session,
+            raw=raw,
         )
 
     @classmethod
-    def search(cls, session, queries, out_type):
+    def search(cls, session, queries, out_type, raw=False):
         """Search for a record given a domain.
 
+        Domains whose query is longer than ``MAX_QUERY_LENGTH``, such as the
+        ones joining hundreds of conditions with ``OR``, would exceed the
+        length of a URL. They are split into several domains between their
+        ``OR`` joins (see :func:`helpscout.domain.Domain.split`), which are
+        searched at the same time, page by page. The records are then
+        yielded once each as their page is received, in no particular
+        order, by a :class:`helpscout.split_search.SplitSearch`.
+
         Args:
             session (requests.sessions.Session): Authenticated session.
             queries (helpscout.models.Domain or iter): The queries for the
@@ -251,43 +540,527 @@ class BaseApi(object):
                 :func:`helpscout.domain.Domain.from_tuple`.
             out_type (helpscout.BaseModel): The type of record to output. This
                 should be provided by child classes, by calling super.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See :func:`__new__`.
 
         Returns:
             RequestPaginator(output_type=helpscout.BaseModel): Results
-                iterator of the ``out_type`` that is defined.
+                iterator of the ``out_type`` that is defined. This is a
+                ``SplitSearch``, which can only be iterated, if the domain
+                was split.
         """
         cls._check_implements('search')
         domain = cls.get_search_domain(queries)
-        return cls(
-            '/search/%s.json' % cls.__endpoint__,
-            data={'query': str(domain)},
-            session=session,
-            out_type=out_type,
+        domains = domain.split(cls.MAX_QUERY_LENGTH)
+        if len(domains) == 1:
+            return cls._search_request(session, domain, out_type, raw)
+        concurrency = max(cls._get_concurrency(session), 1)
+
+        def search(page):
+            return cls._search_page(session, page, out_type, raw)
+
+        return SplitSearch(domains, lambda: cls._iter_shards(
+            search, [(domain, 1) for domain in domains], concurrency,
+        ))
+
+    @classmethod
+    def search_sharded(cls, session, queries, out_type, field=None,
+                       shard_size=500, concurrency=None, raw=False):
+        """Search by splitting the date time range of the domain.
+
+        The range of a date time condition of the domain is split into one
+        window per ``concurrency``, and the windows are searched at the same
+        time. A window whose first page counts more than ``shard_size``
+        records is split again into windows that should each hold about
+        ``shard_size`` records, so that no search reaches deep pages.
+
+        Records are yielded as their window completes, so they are not
+        ordered, and each record is only yielded once, even though the
+        windows share their boundaries.
+
+        Examples::
+
+            domain = Domain([
+                ('modified_at', datetime(2017, 1, 1), datetime(2018, 1, 1)),
+            ])
+            for conversation in hs.Conversations.search_sharded(domain):
+                print(conversation.id)
+
+        Args:
+            session (requests.sessions.Session): Authenticated session.
+            queries (helpscout.models.Domain or iter): The queries for the
+                domain, as in :func:`search`. They must contain a date time
+                condition, such as ``('modified_at', datetime(2017, 1, 1))``,
+                whose range is split. A range without an end is split up to
+                the current time.
+            out_type (helpscout.BaseModel): The type of record to output. This
+                should be provided by child classes, by calling super.
+            field (str, optional): Field of the date time condition to split.
+                Defaults to the first date time condition of the domain.
+            shard_size (int, optional): Number of records above which a
+                window is split.
+            concurrency (int, optional): Maximum number of windows to search
+                at the same time. Defaults to the ``concurrency`` of the
+                ``HelpScout`` client.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models. See :func:`__new__`.
+
+        Raises:
+            ValueError: If the domain has no date time condition.
+
+        Returns:
+            iter: Iterator of the ``out_type`` that is defined.
+        """
+        cls._check_implements('search')
+        if concurrency is None:
+            concurrency = cls._get_concurrency(session)
+        concurrency = max(concurrency, 1)
+        domain = cls.get_search_domain(queries)
+        condition = cls._get_shard_condition(domain, field)
+        windows = cls._split_window(
+            condition.value, condition.value_to or datetime.utcnow(),
+            concurrency,
         )
 
+        def search(window):
+            return cls._search_shard(
+                session, domain, condition, window, out_type, raw,
+                shard_size,
+            )
+
+        return cls._iter_shards(search, windows, concurrency)
+
     @classmethod
-    def update(cls, session, record):
+    def update(cls, session, record, reload=True):
         """Update a record.
 
+        Only the properties that changed are sent for records that were
+        loaded from the API, and no request is made at all if none changed.
+
         Args:
             session (requests.sessions.Session): Authenticated session.
             record (helpscout.BaseModel): The record to
                 be updated.
+            reload (bool, optional): Set this to ``False`` in order to only
+                receive the ID of the record, which skips sending back and
+                parsing the whole record.
 
         Returns:
             helpscout.BaseModel: Freshly updated record.
+            int: The ID of the record, if ``reload`` is ``False``.
         """
         cls._check_implements('update')
-        data = record.to_api()
-        del data['id']
-        data['reload'] = True
+        changes = record.get_changes()
+        if changes is not None and not changes:
+            return cls._resolve(record if reload else record.id)
+        data = record.to_api(changes)
+        data.pop('id', None)
+        data['reload'] = reload
+        endpoint = '/%s/%s.json' % (cls.__endpoint__, record.id)
+        try:
+            if not reload:
+                result = cls._locate(
+                    session, endpoint, data, RequestPaginator.PUT, record.id,
+                )
+            else:
+                result = cls(
+                    endpoint,
+                    data=data,
+                    request_type=RequestPaginator.PUT,
+                    singleton=True,
+                    session=session,
+                )
+            return cls._then(result, cls._get_sent(record))
+        finally:
+            cls._invalidate_record(session, record.id)
+
+    @classmethod
+    def update_many(cls, session, records, changes=None, concurrency=None,
+                    reload=False):
+        """Apply changes to many records on HelpScout, concurrently.
+
+        Only the changed fields are sent, instead of the whole record, and
+        the updated records are not sent back unless ``reload`` is set. The
+        requests run on a bounded pool of workers, which draw from the rate
+        limiter of the session if any.
+
+        Examples::
+
+            # Close stale conversations
+            stale = list(hs.Conversations.list(mailbox))
+            for conversation_id, error in hs.Conversations.update_many(
+                stale, {'status': 'closed'}, concurrency=8,
+            ):
+                if error is not None:
+                    print('Failed to close %d: %s' % (conversation_id, error))
+
+            # Apply different changes to each record
+            hs.Customers.update_many([
+                (customer, {'organization': 'LasLabs'}),
+                (other_customer, {'job_title': 'CEO'}),
+            ])
+
+        Note that paginating a result set while it is being changed can cause
+        records to be skipped, as they move to other pages.
+
+        Args:
+            session (requests.sessions.Session): Authenticated session.
+            records (iter): The records to update, or tuples of each record
+                with the changes to apply to it if ``changes`` is not given.
+            changes (dict, optional): Mapping of field names to the new
+                values, which is applied to all of the ``records``.
+            concurrency (int, optional): Maximum number of records to update
+                at the same time. Defaults to the ``concurrency`` of the
+                ``HelpScout`` client.
+            reload (bool, optional): Set this to ``True`` to receive the
+                updated records.
+
+        Returns:
+            iter: Iterator of tuples, with the ID of each record and ``None``,
+                or the updated record if ``reload`` is set. The exception
+                that was raised is returned instead if the record could not
+                be updated.
+        """
+        cls._check_implements('update')
+        if concurrency is None:
+            concurrency = cls._get_concurrency(session)
+        if changes is not None:
+            records = ((record, changes) for record in records)
+
+        def update(update):
+            record, changes = update
+            if record.get_changes() is None:
+                # Only send the given changes of a record built by hand.
+                record.clear_changes()
+            for name, value in changes.items():
+                record[name] = value
+            record.mark_changed(changes)
+            return cls._then(
+                cls.update(session, record, reload=reload),
+                lambda result: result if reload else None,
+            )
+
+        return cls._map_concurrent(
+            update, records, max(concurrency, 1),
+            key=lambda update: update[0].id,
+        )
+
+    @classmethod
+    def _search_request(cls, session, domain, out_type, raw=False):
+        """Return the results of a search for the domain."""
         return cls(
-            '/%s/%s.json' % (cls.__endpoint__, record.id),
-            data=data,
-            request_type=RequestPaginator.PUT,
-            singleton=True,
+            '/search/%s.json' % cls.__endpoint__,
+            data={'query': str(domain)},
             session=session,
+            out_type=out_type,
+            raw=raw,
+        )
+
+    @classmethod
+    def _search_page(cls, session, page, out_type, raw=False):
+        """Search one page of a domain that a search was split into.
+
+        Args:
+            page (tuple): The domain, and the number of the page.
+
+        Returns:
+            tuple: The records of the page and, for the first page, the
+                other pages of the domain, which are then searched at the
+                same time.
+        """
+        domain, number = page
+        results = cls._search_request(session, domain, out_type, raw)
+        records = []
+        for found in results.iter_pages(number, number + 1, concurrency=1):
+            records.extend(found)
+        return records, cls._get_other_pages(results.paginator, page)
+
+    @classmethod
+    def _search_shard(cls, session, domain, condition, window, out_type,
+                      raw, shard_size):
+        """Search one window of a sharded search.
+
+        Returns:
+            tuple: The records that were received, and the windows that the
+                window was split into, if it holds too many records. Only the
+                first page is then requested.
+        """
+        results = cls._search_request(
+            session, cls._get_shard_domain(domain, condition, window),
+            out_type, raw,
+        )
+        pages = results.iter_pages(concurrency=1)
+        records = list(next(pages, []))
+        windows = cls._split_shard(results.paginator, window, shard_size)
+        if windows:
+            pages.close()
+        else:
+            for page in pages:
+                records.extend(page)
+        return records, windows
+
+    @classmethod
+    def _iter_shards(cls, search, windows, concurrency):
+        """Search the windows, and the windows they are split into.
+
+        This is also used for the pages of the domains that a search is
+        split into. ``search`` returns the records of a window or page, and
+        the windows or pages that it was split into, if any.
+
+        Yields:
+            mixed: Each record found, once.
+        """
+        seen = set()
+        while windows:
+            split = []
+            for _, result in cls._map_concurrent(
+                search, windows, concurrency,
+            ):
+                if isinstance(result, Exception):
+                    raise result
+                records, windows = result
+                split.extend(windows)
+                for record in cls._get_unseen(records, seen):
+                    yield record
+            windows = split
+
+    @staticmethod
+    def _get_unseen(records, seen):
+        """Return the records whose ID is not in ``seen``, adding them."""
+        unseen = []
+        for record in records:
+            record_id = record['id'] if isinstance(record, dict) \
+                else record.id
+            if record_id not in seen:
+                seen.add(record_id)
+                unseen.append(record)
+        return unseen
+
+    @staticmethod
+    def _get_other_pages(paginator, page):
+        """Return the other pages of a domain, once its first is received.
+        """
+        domain, number = page
+        if number != 1:
+            return []
+        return [(domain, n) for n in range(2, paginator.page_total + 1)]
+
+    @staticmethod
+    def _get_shard_condition(domain, field=None):
+        """Return the date time condition of the domain to split."""
+        for query in domain.query:
+            if isinstance(query, DomainConditionDateTime) and \
+                    field in (None, query.field):
+                return query
+        raise ValueError(
+            'The domain has no date time condition to split: %s' % domain,
+        )
+
+    @staticmethod
+    def _get_shard_domain(domain, condition, window):
+        """Return the domain, with the condition limited to the window."""
+        shard = Domain()
+        shard.query = [
+            DomainConditionDateTime(condition.field, *window)
+            if query is condition else query
+            for query in domain.query
+        ]
+        return shard
+
+    @classmethod
+    def _split_shard(cls, paginator, window, shard_size):
+        """Return the windows to split a window into, given its first page.
+        """
+        count = paginator.record_count
+        if count is None:
+            count = paginator.page_total * paginator.PAGE_SIZE
+        parts = -(-count // max(shard_size, 1))
+        if parts < 2:
+            return []
+        windows = cls._split_window(window[0], window[1], parts)
+        return windows if len(windows) > 1 else []
+
+    @classmethod
+    def _split_window(cls, start, end, parts):
+        """Split a time window into consecutive windows, whole seconds.
+
+        The windows are no shorter than ``SHARD_MIN``, so the window is
+        returned as is if it is too short to be split.
+        """
+        step = max((end - start) // max(parts, 1), cls.SHARD_MIN)
+        windows = []
+        while end - start > step:
+            split = (start + step).replace(microsecond=0)
+            windows.append((start, split))
+            start = split
+        windows.append((start, end))
+        return windows
+
+    @staticmethod
+    def _map_concurrent(func, items, concurrency, key=None):
+        """Call the function for each item on a thread pool.
+
+        No more than twice ``concurrency`` results are held at any time.
+
+        Args:
+            func (callable): Function to call with each item.
+            items (iter): The items.
+            concurrency (int): Maximum number of simultaneous calls.
+            key (callable, optional): Function returning what to yield in
+                place of each item.
+
+        Yields:
+            tuple: Each item and its result, or the exception raised, in the
+                order in which they complete.
+        """
+        items = iter(items)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending = {}
+
+        def submit():
+            for item in items:
+                pending[executor.submit(func, item)] = item
+                return True
+            return False
+
+        try:
+            while len(pending) < concurrency * 2 and submit():
+                pass
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = pending.pop(future)
+                    submit()
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = e
+                    yield key(item) if key else item, result
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def _then(result, callback):
+        """Return the result of the callback, called with the request's."""
+        return callback(result)
+
+    @staticmethod
+    def _resolve(value):
+        """Return the value in place of a request's result."""
+        return value
+
+    @staticmethod
+    def _finally(request, cleanup):
+        """Return the result of the request, then call the cleanup.
+
+        The cleanup is called whether the request succeeds or fails.
+        """
+        try:
+            return request()
+        finally:
+            cleanup()
+
+    @staticmethod
+    def _get_sent(record):
+        """Return a callback marking the record as unchanged once sent."""
+        def sent(result):
+            record.clear_changes()
+            return result
+        return sent
+
+    @classmethod
+    def _locate(cls, session, endpoint, data, request_type, default=None):
+        """Send a write request, returning the ID from its ``Location``.
+
+        Args:
+            session (requests.sessions.Session): Authenticated session.
+            endpoint (str): The API endpoint of the request.
+            data (dict): Data to send with the request.
+            request_type (str): Type of request.
+            default (int, optional): ID to return if there is no
+                ``Location`` header in the response.
+
+        Returns:
+            int: The ID of the record at the location.
+        """
+        api = cls(
+            endpoint, data=data, request_type=request_type, session=session,
         )
+        return cls._then(
+            api.paginator.locate(data),
+            lambda location: cls._get_location_id(location, default),
+        )
+
+    @classmethod
+    def _upload(cls, session, endpoint, body, out_type=None):
+        """Send a streamed body, returning the record from the response.
+
+        Args:
+            session (requests.sessions.Session): Authenticated session.
+            endpoint (str): The API endpoint of the request.
+            body (io.RawIOBase): Readable JSON body, which is closed once
+                the request is done, even if it fails.
+            out_type (helpscout.BaseModel, optional): The type of record to
+                output.
+
+        Returns:
+            helpscout.BaseModel: The record from the response.
+        """
+        def upload():
+            api = cls(
+                endpoint, request_type=RequestPaginator.POST,
+                session=session, out_type=out_type,
+            )
+
+            def received(results):
+                if not results:
+                    return None
+                return api.paginator.output_type(**results[0])
+
+            return cls._then(api.paginator.upload(body), received)
+
+        return cls._finally(upload, body.close)
+
+    @staticmethod
+    def _get_location_id(location, default=None):
+        """Return the record ID at the end of a ``Location`` URL."""
+        if not location:
+            return default
+        name = location.rstrip('/').rsplit('/', 1)[-1].split('.')[0]
+        try:
+            return int(name)
+        except ValueError:
+            return default
+
+    @classmethod
+    def _invalidate_record(cls, session, record_id):
+        """Remove the record from the record cache of the session."""
+        record_cache = cls._get_record_cache(session)
+        if record_cache is not None:
+            record_cache.invalidate(cls.__name__, record_id)
+
+    @staticmethod
+    def _get_concurrency(session):
+        """Return the concurrency defined on the session."""
+        if isinstance(session, HelpScoutSession):
+            return session.concurrency
+        return 1
+
+    @staticmethod
+    def _get_attachment_cache(session):
+        """Return the attachment cache of the session, if any."""
+        if isinstance(session, HelpScoutSession):
+            return session.attachment_cache
+        return None
+
+    @staticmethod
+    def _get_record_cache(session):
+        """Return the record cache of the session, if any."""
+        if isinstance(session, HelpScoutSession):
+            return session.record_cache
+        return None
 
     @classmethod
     def _check_implements(cls, check_type):
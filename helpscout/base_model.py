@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 REGEX_CAMEL_FIRST = re.compile(r'(.)([A-Z][a-z]+)')
 REGEX_CAMEL_SECOND = re.compile(r'([a-z0-9])([A-Z])')
 
+# Snake cased versions of the keys that were seen, to skip the regexes.
+SNAKE_CASE_CACHE = {}
+
 
 class BaseModel(properties.HasProperties):
     """This is the model that all other models inherit from.
@@ -26,6 +29,15 @@ class BaseModel(properties.HasProperties):
         'Unique identifier',
     )
 
+    # API values that were not parsed yet, for models created lazily.
+    _raw = None
+    # Names of the properties that were set since the model was loaded from
+    # the API. ``None`` for models that were not loaded from the API.
+    _changes = None
+    # Copies of the lists and dictionaries as they were loaded, in order to
+    # detect the ones that are changed in place.
+    _loaded = None
+
     @classmethod
     def from_api(cls, **kwargs):
         """Create a new instance from API arguments.
@@ -55,7 +67,206 @@ class BaseModel(properties.HasProperties):
                 )
         for attr in remove:
             del vals[attr]
-        return cls(**cls.get_non_empty_vals(vals))
+        obj = cls(**cls.get_non_empty_vals(vals))
+        obj._changes = set()
+        obj._snapshot()
+        return obj
+
+    @classmethod
+    def from_api_lazy(cls, **kwargs):
+        """Create a new instance that parses the API arguments on access.
+
+        The API values are kept as they were received. Each of them is only
+        parsed and validated the first time that its property is read, which
+        makes this much cheaper than :func:`from_api` when only a few
+        properties of each record are used. Nested models are created lazily
+        as well.
+
+        Returns:
+            BaseModel: Instantiated model using the API values.
+        """
+        obj = cls()
+        obj._raw = {}
+        for key, value in kwargs.items():
+            key = cls._to_snake_case(key)
+            if value is None:
+                continue
+            if key in cls._props:
+                obj._raw[key] = value
+            else:
+                cls._log_unknown_property(key, value)
+        obj._changes = set()
+        obj._loaded = {}
+        return obj
+
+    def get_changes(self):
+        """Return the names of the properties changed since loading.
+
+        A nested model counts as a change of the property holding it if it
+        changed itself, or if it was not loaded from the API. Lists and
+        dictionaries count as changed if they differ from a copy taken when
+        they were loaded, so changing them in place is detected.
+
+        Returns:
+            set: Names of the properties that were changed since the model
+             was loaded from the API. ``None`` if it was not loaded from the
+             API, in which case all of its properties should be considered
+             changed.
+        """
+        if self._changes is None:
+            return None
+        changes = set(self._changes)
+        for name, value in self._backend.items():
+            if name in changes:
+                continue
+            if self._is_changed_in_place(name, value):
+                changes.add(name)
+                continue
+            if not isinstance(value, list):
+                value = [value]
+            for item in value:
+                if isinstance(item, BaseModel) and item.get_changes() != set():
+                    changes.add(name)
+                    break
+        return changes
+
+    def mark_changed(self, names):
+        """Consider properties as changed, even if their value is the same.
+
+        Args:
+            names (iter): Names of the properties.
+        """
+        if self._changes is not None:
+            self._changes.update(names)
+
+    def clear_changes(self):
+        """Consider the model and its nested models as unchanged.
+
+        This is done once the changes were sent to the API.
+        """
+        self._changes = set()
+        self._snapshot()
+        for value in self._backend.values():
+            if not isinstance(value, list):
+                value = [value]
+            for item in value:
+                if isinstance(item, BaseModel):
+                    item.clear_changes()
+
+    def serialize(self, *args, **kwargs):
+        """Parse any lazy values, then serialize the instance."""
+        self._hydrate()
+        return super(BaseModel, self).serialize(*args, **kwargs)
+
+    def _hydrate(self):
+        """Parse all of the API values that were not parsed yet."""
+        for name in list(self._raw or ()):
+            self._get(name)
+
+    def _get(self, name):
+        """Return the property value, parsing it first if it is lazy."""
+        if self._raw and name in self._raw:
+            value = self._raw.pop(name)
+            try:
+                value = self._parse_property(name, value, lazy=True)
+            except HelpScoutValidationException:
+                value = None
+                logger.info(
+                    'Unexpected property received in API response',
+                    exc_info=True,
+                )
+            if value is not None:
+                setattr(self, name, value)
+                # Parsing a lazy value is not a change.
+                if self._changes is not None:
+                    self._changes.discard(name)
+                    self._snapshot(name)
+        return super(BaseModel, self)._get(name)
+
+    def _snapshot(self, name=None):
+        """Copy the lists and dictionaries, to compare them later.
+
+        Args:
+            name (str, optional): Only copy this property.
+        """
+        if self._loaded is None or name is None:
+            self._loaded = {}
+        names = [name] if name is not None else list(self._backend)
+        for name in names:
+            value = self._backend.get(name)
+            if isinstance(value, list):
+                self._loaded[name] = list(value)
+            elif isinstance(value, dict):
+                self._loaded[name] = dict(value)
+
+    def _is_changed_in_place(self, name, value):
+        """Return whether a list or dictionary differs from its copy."""
+        if not isinstance(value, (list, dict)):
+            return False
+        loaded = (self._loaded or {}).get(name)
+        if loaded is None or len(loaded) != len(value):
+            return True
+        if isinstance(value, dict):
+            return any(
+                key not in loaded or self._differs(loaded[key], item)
+                for key, item in value.items()
+            )
+        return any(
+            self._differs(old, new) for old, new in zip(loaded, value)
+        )
+
+    @staticmethod
+    def _differs(old, new):
+        """Return whether an item differs from its loaded copy.
+
+        Nested models are compared by identity, since their own changes are
+        tracked separately.
+        """
+        if isinstance(old, BaseModel) or isinstance(new, BaseModel):
+            return old is not new
+        return old != new
+
+    def _set(self, name, value):
+        """Set the property value, discarding any lazy value.
+
+        The property is recorded as changed if the model was loaded from the
+        API, and the new value differs from the previous one.
+        """
+        if self._raw:
+            self._raw.pop(name, None)
+        previous = self._backend.get(name)
+        result = super(BaseModel, self)._set(name, value)
+        if self._changes is not None:
+            value = self._backend.get(name)
+            if previous is None or value is None:
+                changed = previous is not value
+            else:
+                changed = not self._props[name].equal(previous, value)
+            if changed:
+                self._changes.add(name)
+        return result
+
+    @classmethod
+    def to_snake_case_keys(cls, value):
+        """Return the API value with all of its keys in snake_case.
+
+        This is a lightweight alternative to :func:`from_api` for when plain
+        dictionaries are needed, recursing into nested mappings and lists.
+
+        Args:
+            value (mixed): A decoded API value.
+
+        Returns:
+            mixed: The value, with any mapping keys switched to snake_case.
+        """
+        if isinstance(value, dict):
+            return {
+                cls._to_snake_case(k): cls.to_snake_case_keys(v)
+                for k, v in value.items()
+            }
+        if isinstance(value, list):
+            return [cls.to_snake_case_keys(v) for v in value]
+        return value
 
     def get(self, key, default=None):
         """Return the field indicated by the key, if present."""
@@ -64,15 +275,22 @@ class BaseModel(properties.HasProperties):
         except KeyError:
             return default
 
-    def to_api(self):
+    def to_api(self, fields=None):
         """Return a dictionary to send to the API.
 
+        Args:
+            fields (iter, optional): Names of the properties to include. All
+             of them are included by default.
+
         Returns:
             dict: Mapping representing this object that can be sent to the
              API.
         """
         vals = {}
-        for attribute, attribute_type in self._props.items():
+        if fields is None:
+            fields = self._props
+        for attribute in fields:
+            attribute_type = self._props[attribute]
             prop = getattr(self, attribute)
             vals[self._to_camel_case(attribute)] = self._to_api_value(
                 attribute_type, prop,
@@ -109,12 +327,13 @@ class BaseModel(properties.HasProperties):
         }
 
     @classmethod
-    def _parse_property(cls, name, value):
+    def _parse_property(cls, name, value, lazy=False):
         """Parse a property received from the API into an internal object.
 
         Args:
             name (str): Name of the property on the object.
             value (mixed): The unparsed API value.
+            lazy (bool, optional): Create any nested models lazily.
 
         Raises:
             HelpScoutValidationException: In the event that the property name
@@ -126,26 +345,32 @@ class BaseModel(properties.HasProperties):
 
         prop = cls._props.get(name)
         return_value = value
+        factory = 'from_api_lazy' if lazy else 'from_api'
 
         if not prop:
-            logger.debug(
-                '"%s" with value "%s" is not a valid property for "%s".' % (
-                    name, value, cls,
-                ),
-            )
+            cls._log_unknown_property(name, value)
             return_value = None
 
         elif isinstance(prop, properties.Instance):
-            return_value = prop.instance_class.from_api(**value)
+            return_value = getattr(prop.instance_class, factory)(**value)
 
         elif isinstance(prop, properties.List):
-            return_value = cls._parse_property_list(prop, value)
+            return_value = cls._parse_property_list(prop, value, factory)
 
         elif isinstance(prop, properties.Color):
             return_value = cls._parse_property_color(value)
 
         return return_value
 
+    @classmethod
+    def _log_unknown_property(cls, name, value):
+        """Log a property received from the API that the model lacks."""
+        logger.debug(
+            '"%s" with value "%s" is not a valid property for "%s".' % (
+                name, value, cls,
+            ),
+        )
+
     @staticmethod
     def _parse_property_color(value):
         """Parse a color property and return a valid value."""
@@ -154,13 +379,13 @@ class BaseModel(properties.HasProperties):
         return value
 
     @staticmethod
-    def _parse_property_list(prop, value):
+    def _parse_property_list(prop, value, factory='from_api'):
         """Parse a list property and return a list of the results."""
         attributes = []
         for v in value:
             try:
                 attributes.append(
-                    prop.prop.instance_class.from_api(**v),
+                    getattr(prop.prop.instance_class, factory)(**v),
                 )
             except AttributeError:
                 attributes.append(v)
@@ -176,9 +401,15 @@ class BaseModel(properties.HasProperties):
         Returns:
             str: A snake cased string.
         """
+        try:
+            return SNAKE_CASE_CACHE[string]
+        except KeyError:
+            pass
         sub_string = r'\1_\2'
-        string = REGEX_CAMEL_FIRST.sub(sub_string, string)
-        return REGEX_CAMEL_SECOND.sub(sub_string, string).lower()
+        snake_string = REGEX_CAMEL_FIRST.sub(sub_string, string)
+        snake_string = REGEX_CAMEL_SECOND.sub(sub_string, snake_string).lower()
+        SNAKE_CASE_CACHE[string] = snake_string
+        return snake_string
 
     @staticmethod
     def _to_camel_case(string):
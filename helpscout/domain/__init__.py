@@ -3,14 +3,22 @@
 # License MIT (https://opensource.org/licenses/MIT).
 
 import properties
+import re
 
 from datetime import datetime, date
 
+from six import string_types, text_type
+
 from ..base_model import BaseModel
 
 
 class Domain(properties.HasProperties):
-    """This represents a full search query."""
+    """This represents a full search query.
+
+    Besides being rendered as the query of a search request, a domain can be
+    evaluated locally against records using :func:`matches`, in order to
+    filter records that were already received without another request.
+    """
 
     OR = 'OR'
     AND = 'AND'
@@ -79,6 +87,69 @@ class Domain(properties.HasProperties):
             self.query.append(join_with)
         self.query.append(query)
 
+    def matches(self, record):
+        """Return whether a record satisfies the domain.
+
+        ``AND`` joins take precedence over ``OR`` joins, so the conditions
+        ``a AND b OR c`` match the records that satisfy both ``a`` and ``b``,
+        or ``c``. An empty domain matches every record.
+
+        Examples::
+
+            domain = Domain.from_tuple([('status', 'active')])
+            active = [c for c in conversations if domain.matches(c)]
+
+        Args:
+            record (helpscout.BaseModel or dict): The record, as a model or
+                as its decoded dictionary.
+
+        Returns:
+            bool: Whether the record matches.
+        """
+        matched = False
+        group = True
+        for query in self.query:
+            if query == self.OR:
+                matched = matched or group
+                group = True
+            elif query != self.AND:
+                group = group and query.matches(record)
+        return matched or group
+
+    def split(self, max_length):
+        """Split the domain into domains whose queries are not too long.
+
+        Only a domain whose conditions are all joined by ``OR`` is split,
+        so that the records matching any of the domains are exactly the
+        ones matching the domain, whatever the precedence of the joins. A
+        domain with an ``AND`` join is kept whole.
+
+        Args:
+            max_length (int): Maximum length of the query string of each
+                domain.
+
+        Returns:
+            list: The domains, or only this one if it is short enough or
+                cannot be split.
+        """
+        if len(str(self)) <= max_length or self.AND in self.query:
+            return [self]
+        domains = []
+        length = 0
+        for query in self.query:
+            if query == self.OR:
+                continue
+            # Length of the condition, with the parentheses or the join.
+            query_length = len(str(query)) + 4
+            if not domains or length + query_length > max_length:
+                domains.append(Domain())
+                length = 0
+            else:
+                domains[-1].query.append(self.OR)
+            domains[-1].query.append(query)
+            length += query_length
+        return domains
+
     def __str__(self):
         """Return a string usable as the query in an API request."""
         if not self.query:
@@ -89,6 +160,21 @@ class Domain(properties.HasProperties):
 class DomainCondition(properties.HasProperties):
     """This represents one condition of a domain query."""
 
+    # Paths of the values of the search fields that are not named like the
+    # fields of the models, keyed by search field without underscores. The
+    # first path with a value is used, and ``*`` iterates a list.
+    ALIASES = {
+        'customerids': ('customer.id',),
+        'email': ('emails.*.value', 'emails', 'customer_email',
+                  'customer.email', 'email'),
+        'firstname': ('first_name', 'customer.first_name'),
+        'fname': ('first_name', 'customer.first_name'),
+        'lastname': ('last_name', 'customer.last_name'),
+        'lname': ('last_name', 'customer.last_name'),
+        'mailboxid': ('mailbox_id', 'mailbox.id'),
+        'tag': ('tags',),
+    }
+
     field = properties.String(
         'Field to search on',
         required=True,
@@ -143,6 +229,96 @@ class DomainCondition(properties.HasProperties):
 
         return cls(field, *query)
 
+    def matches(self, record):
+        """Return whether the field of a record satisfies the condition.
+
+        Fields containing lists, such as tags, match if any of their values
+        does. Search fields are resolved through :attr:`ALIASES`, so that
+        ``email`` matches the email addresses of a customer, and ``tag`` the
+        tags of a conversation.
+
+        Args:
+            record (helpscout.BaseModel or dict): The record, as a model or
+                as its decoded dictionary.
+
+        Returns:
+            bool: Whether the record matches.
+        """
+        value = self._get_value(record)
+        if isinstance(value, (list, tuple)):
+            return any(self._match(v) for v in value)
+        return self._match(value)
+
+    def _match(self, value):
+        """Return whether a value contains the words, ignoring case.
+
+        The words must be whole, so that ``active`` does not match
+        ``inactive``.
+        """
+        if value is None:
+            return False
+        pattern = r'\s+'.join(re.escape(word) for word in self.value.split())
+        return re.search(
+            r'(?<!\w)%s(?!\w)' % pattern, text_type(value),
+            re.IGNORECASE | re.UNICODE,
+        ) is not None
+
+    def _get_value(self, record):
+        """Return the value of the field of a record.
+
+        The field is looked up by its Python and API names, then by the
+        paths of its alias, then by ignoring underscores and case, so that
+        fields such as ``hasattachments`` resolve to ``has_attachments``.
+        """
+        value = self._get_field(record, self.field)
+        if value is not None:
+            return value
+        key = self.field.replace('_', '').lower()
+        for path in self.ALIASES.get(key, ()):
+            value = self._get_path(record, path.split('.'))
+            if value not in (None, []):
+                return value
+        if isinstance(record, dict):
+            names = record
+        else:
+            names = getattr(record, '_props', {})
+        for name in names:
+            if name.replace('_', '').lower() == key:
+                if isinstance(record, dict):
+                    return record[name]
+                return getattr(record, name)
+        return None
+
+    @classmethod
+    def _get_path(cls, record, path):
+        """Return the value at a path of a record, as a list after a ``*``.
+        """
+        if not path:
+            return record
+        if path[0] != '*':
+            value = cls._get_field(record, path[0])
+            return None if value is None else cls._get_path(value, path[1:])
+        values = []
+        for item in record if isinstance(record, (list, tuple)) else []:
+            value = cls._get_path(item, path[1:])
+            if isinstance(value, list):
+                values.extend(value)
+            elif value is not None:
+                values.append(value)
+        return values
+
+    @staticmethod
+    def _get_field(record, name):
+        """Return a field of a record by its Python or API name."""
+        if isinstance(record, dict):
+            for key in (BaseModel._to_camel_case(name), name):
+                if key in record:
+                    return record[key]
+            return None
+        if name in getattr(record, '_props', {}):
+            return getattr(record, name)
+        return None
+
     def __str__(self):
         """Return a string usable as a query part in an API request."""
         return '%s:"%s"' % (self.field_name, self.value)
@@ -156,6 +332,10 @@ class DomainConditionBoolean(DomainCondition):
         required=True,
     )
 
+    def _match(self, value):
+        """Return whether the truth of a value is the condition value."""
+        return bool(value) == self.value
+
     def __str__(self):
         """Return a string usable as a query part in an API request."""
         value = 'true' if self.value else 'false'
@@ -170,6 +350,13 @@ class DomainConditionInteger(DomainCondition):
         required=True,
     )
 
+    def _match(self, value):
+        """Return whether a value is equal to the integer."""
+        try:
+            return value is not None and int(value) == self.value
+        except (TypeError, ValueError):
+            return False
+
     def __str__(self):
         """Return a string usable as a query part in an API request."""
         return '%s:%d' % (self.field_name, self.value)
@@ -198,16 +385,46 @@ class DomainConditionDateTime(DomainCondition):
             value_to (date or datetime, optional): The ending value for
                 the field. If omitted, will search to now.
         """
+        kwargs = {}
+        if value_to is not None:
+            kwargs['value_to'] = value_to
         return super(DomainConditionDateTime, self).__init__(
-            field=field, value=value_from, value_to=value_to,
+            field=field, value=value_from, **kwargs
         )
 
+    def _match(self, value):
+        """Return whether a value is within the range.
+
+        Strings are parsed as ISO 8601 date times, and aware date times are
+        converted to UTC, as are the bounds of the range.
+        """
+        if isinstance(value, string_types):
+            try:
+                value = properties.DateTime.from_json(value)
+            except ValueError:
+                return False
+        if not isinstance(value, datetime):
+            return False
+        value = self._to_utc(value)
+        if value < self._to_utc(self.value):
+            return False
+        return self.value_to is None or value <= self._to_utc(self.value_to)
+
+    @staticmethod
+    def _to_utc(value):
+        """Return a date time as a naive one in UTC."""
+        if value.utcoffset() is not None:
+            value = value.replace(tzinfo=None) - value.utcoffset()
+        return value
+
     def __str__(self):
         """Return a string usable as a query part in an API request."""
-        value_to = self.value_to.isoformat() if self.value_to else '*'
-        return '%s:[%sZ TO %sZ]' % (
+        value_to = '*'
+        if self.value_to:
+            value_to = '%sZ' % self._to_utc(self.value_to).isoformat()
+        return '%s:[%sZ TO %s]' % (
             self.field_name,
-            self.value.isoformat(),
+            self._to_utc(self.value).isoformat(),
             value_to,
         )
 
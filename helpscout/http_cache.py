@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import copy
+import threading
+
+from collections import OrderedDict
+
+
+class HttpCache(object):
+    """This stores GET responses in order to revalidate them conditionally.
+
+    When a response carries an ``ETag`` or ``Last-Modified`` header, its
+    decoded body is stored along with them. The next request for the same
+    URL and parameters sends them back as ``If-None-Match`` and
+    ``If-Modified-Since``, and a ``304 Not Modified`` response is answered
+    from the stored body, without downloading or decoding it again.
+
+    An ``HttpCache`` attached to a ``HelpScoutSession`` is shared by every
+    API and paginator thread using that session.
+
+    The bodies are copied when they are stored and when they are returned,
+    so a consumer of a raw response can modify it freely.
+
+    Examples::
+
+        from helpscout import HelpScout, HttpCache
+        hs = HelpScout('api_key', http_cache=HttpCache(max_entries=256))
+
+    Attributes:
+        max_entries (int): Maximum number of responses to keep. The least
+            recently used responses are discarded first.
+        hits (int): Number of requests that were answered from the cache.
+        misses (int): Number of requests that received a new body.
+    """
+
+    HEADER_ETAG = 'ETag'
+    HEADER_LAST_MODIFIED = 'Last-Modified'
+    HEADER_IF_NONE_MATCH = 'If-None-Match'
+    HEADER_IF_MODIFIED_SINCE = 'If-Modified-Since'
+
+    STATUS_NOT_MODIFIED = 304
+
+    def __init__(self, max_entries=1024):
+        """Initialize a new cache.
+
+        Args:
+            max_entries (int, optional): Maximum number of responses to keep.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def get_key(url, params=None):
+        """Return the key identifying a request in the cache.
+
+        Args:
+            url (str): URL of the request.
+            params (dict, optional): Query parameters of the request.
+
+        Returns:
+            tuple: Hashable key for the request.
+        """
+        return url, tuple(sorted(
+            (str(k), str(v)) for k, v in (params or {}).items()
+        ))
+
+    def get_headers(self, key):
+        """Return the conditional headers to send for the request.
+
+        Args:
+            key (tuple): Key of the request, from :func:`get_key`.
+
+        Returns:
+            dict: ``If-None-Match`` and/or ``If-Modified-Since`` headers.
+                Empty if the response is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers[self.HEADER_IF_NONE_MATCH] = etag
+        if last_modified:
+            headers[self.HEADER_IF_MODIFIED_SINCE] = last_modified
+        return headers
+
+    def update(self, key, status_code, headers, body):
+        """Store a response, or return the stored body if not modified.
+
+        Args:
+            key (tuple): Key of the request, from :func:`get_key`.
+            status_code (int): Status code of the response.
+            headers (dict): Case-insensitive mapping of response headers.
+            body (mixed): Decoded body of the response.
+
+        Returns:
+            mixed: A copy of the stored body on a ``304`` response if it was
+                cached. Otherwise ``body``.
+        """
+        etag = headers.get(self.HEADER_ETAG)
+        last_modified = headers.get(self.HEADER_LAST_MODIFIED)
+        if status_code == self.STATUS_NOT_MODIFIED:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    return body
+                self.hits += 1
+                self._entries[key] = (
+                    etag or entry[0], last_modified or entry[1], entry[2],
+                )
+                self._move_to_end(key)
+            return copy.deepcopy(entry[2])
+        if not (etag or last_modified):
+            with self._lock:
+                self.misses += 1
+                self._entries.pop(key, None)
+            return body
+        stored = copy.deepcopy(body)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (etag, last_modified, stored)
+            self._move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
+
+    def clear(self):
+        """Remove all of the stored responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def _move_to_end(self, key):
+        """Mark the entry as the most recently used."""
+        self._entries[key] = self._entries.pop(key)
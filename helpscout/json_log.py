@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import json
+import os
+
+
+class JsonLog(object):
+    """This is a file of JSON objects, one per line, appended durably.
+
+    Each entry is flushed to disk before :func:`append` returns, so that it
+    survives a crash. An incomplete last line, left by a crash during a
+    write, is skipped when the file is loaded, and terminated before the
+    next entry is appended so that it does not corrupt that entry.
+
+    It does not lock, so writers must be serialized by the caller.
+
+    Attributes:
+        path (str): Path of the file.
+    """
+
+    def __init__(self, path):
+        """Initialize a new log.
+
+        Args:
+            path (str): Path of the file.
+        """
+        self.path = path
+
+    def append(self, entry):
+        """Append an entry to the file, and flush it to disk.
+
+        Args:
+            entry (dict): The entry, which must be serializable to JSON.
+        """
+        line = json.dumps(entry) + '\n'
+        with open(self.path, 'ab+') as log:
+            log.seek(0, os.SEEK_END)
+            if log.tell():
+                log.seek(-1, os.SEEK_END)
+                if log.read(1) != b'\n':
+                    # Terminate the incomplete line left by a crash.
+                    line = '\n' + line
+            log.write(line.encode('utf-8'))
+            log.flush()
+            os.fsync(log.fileno())
+
+    def load(self):
+        """Yield the entries of the file, in the order they were appended.
+
+        Yields:
+            dict: The entries. Nothing is yielded if the file does not exist.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as log:
+            for line in log:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line can be incomplete after a crash.
+                    continue
+                yield entry
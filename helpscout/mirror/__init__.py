@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+from .apis import (MirrorApi,
+                   MirrorConversations,
+                   MirrorCustomers,
+                   MirrorMailboxes,
+                   MirrorUsers,
+                   )
+from .store import MirrorStore
+
+
+class Mirror(object):
+    """This is a local SQLite replica of a HelpScout account.
+
+    It stores the conversations with their threads, the customers, the
+    mailboxes with their folders, and the users. They are copied from
+    HelpScout using the API classes of a client, and read back through APIs
+    with the same methods, so that code reading from ``hs.Conversations``
+    can read from ``mirror.Conversations`` instead, without using the rate
+    limit.
+
+    Examples::
+
+        from helpscout import HelpScout, SqliteWatermarkStore, SyncEngine
+        from helpscout.mirror import Mirror
+        hs = HelpScout('api_key', concurrency=8)
+        mirror = Mirror('helpscout.db')
+        mirror.load(hs)
+        # Later, only copy the changes
+        mirror.sync(SyncEngine(hs, SqliteWatermarkStore('helpscout.db')))
+        conversation = mirror.Conversations.get(1234)
+
+    Attributes:
+        store (helpscout.mirror.store.MirrorStore): The database.
+        Conversations (MirrorConversations): Conversations API.
+        Customers (MirrorCustomers): Customers API.
+        Mailboxes (MirrorMailboxes): Mailboxes API.
+        Users (MirrorUsers): Users API.
+    """
+
+    def __init__(self, path):
+        """Initialize a new mirror.
+
+        Args:
+            path (str): Path of the SQLite database.
+        """
+        self.store = MirrorStore(path)
+        self.Conversations = MirrorConversations(self.store)
+        self.Customers = MirrorCustomers(self.store)
+        self.Mailboxes = MirrorMailboxes(self.store)
+        self.Users = MirrorUsers(self.store)
+
+    def close(self):
+        """Close the database."""
+        self.store.close()
+
+    def load(self, helpscout, threads=True, concurrency=None):
+        """Copy all of the records of the account.
+
+        Args:
+            helpscout (helpscout.HelpScout): The client to copy from.
+            threads (bool, optional): Get each conversation in order to copy
+                its threads as well. This requires one request per
+                conversation.
+            concurrency (int, optional): Maximum number of conversations to
+                get at the same time. Defaults to the ``concurrency`` of the
+                client.
+        """
+        self.save('Users', helpscout.Users.list(raw=True))
+        self.save('Customers', helpscout.Customers.list(raw=True))
+        for mailbox in helpscout.Mailboxes.list():
+            self.save('Mailboxes', [mailbox])
+            self.save(
+                'Folders', helpscout.Mailboxes.get_folders(mailbox),
+                parent_id=mailbox.id, replace_children=True,
+            )
+            conversations = helpscout.Conversations.list(mailbox, raw=True)
+            if not threads:
+                self.save('Conversations', conversations)
+                continue
+            self.refresh(
+                helpscout, (c['id'] for c in conversations), concurrency,
+            )
+
+    def refresh(self, helpscout, conversation_ids, concurrency=None):
+        """Copy conversations with their threads, removing deleted ones.
+
+        Args:
+            helpscout (helpscout.HelpScout): The client to copy from.
+            conversation_ids (iter): IDs of the conversations to copy.
+            concurrency (int, optional): Maximum number of conversations to
+                get at the same time. Defaults to the ``concurrency`` of the
+                client.
+
+        Returns:
+            dict: The exceptions raised while getting conversations, keyed
+                by conversation ID.
+        """
+        return self._copy(
+            helpscout.Conversations, 'Conversations', conversation_ids,
+            concurrency,
+        )
+
+    def sync(self, engine, mailbox=None, concurrency=None):
+        """Copy the conversations and customers changed since the last sync.
+
+        Each watermark is only advanced once all of the changed records were
+        saved, so that the records that could not be copied are searched
+        again by the next sync.
+
+        Args:
+            engine (helpscout.sync.SyncEngine): Sync engine keeping the
+                watermarks of the mirror.
+            mailbox (helpscout.models.Mailbox or int, optional): Only sync
+                the conversations of this mailbox.
+            concurrency (int, optional): Maximum number of records to get at
+                the same time.
+
+        Returns:
+            dict: The exceptions raised while getting records, keyed by
+                record ID, in dictionaries keyed by API name, which are
+                ``Conversations`` and ``Customers``.
+        """
+        errors = {}
+        for api, run in (
+            ('Conversations', engine.conversations(mailbox, commit=False)),
+            ('Customers', engine.customers(commit=False)),
+        ):
+            errors[api] = self._copy(
+                getattr(engine.helpscout, api), api, (r.id for r in run),
+                concurrency,
+            )
+            if not errors[api]:
+                run.commit()
+        return errors
+
+    def save(self, api, records, parent_id=None, replace_children=False):
+        """Save records of an API in the mirror.
+
+        Conversations are saved under their mailbox, and their threads are
+        saved separately, if they are included.
+
+        Args:
+            api (str): Name of the API, such as ``Conversations``.
+            records (iter): The records, as models or as dictionaries in
+                their API form.
+            parent_id (int, optional): ID of the parent listing the records.
+            replace_children (bool, optional): Delete the other records of
+                the parent first.
+        """
+        records = [
+            r if isinstance(r, dict) else r.to_api() for r in records
+        ]
+        if api != 'Conversations':
+            self.store.save(api, records, parent_id, replace_children)
+            return
+        for record in records:
+            threads = record.pop('threads', None)
+            self.store.save(
+                api, [record], (record.get('mailbox') or {}).get('id'),
+            )
+            if threads is not None:
+                self.store.save(
+                    MirrorConversations.THREADS, threads, record['id'],
+                    replace_children=True,
+                )
+
+    def delete(self, api, record_id):
+        """Delete a record from the mirror.
+
+        Args:
+            api (str): Name of the API, such as ``Conversations``.
+            record_id (int): ID of the record.
+        """
+        self.store.delete(api, record_id)
+        if api == 'Conversations':
+            self.store.save(
+                MirrorConversations.THREADS, [], record_id,
+                replace_children=True,
+            )
+
+    def _copy(self, helpscout_api, api, record_ids, concurrency):
+        """Get and save records, removing the ones that no longer exist.
+
+        Returns:
+            dict: The exceptions raised while getting records, keyed by
+                record ID.
+        """
+        errors = {}
+        for record_id, record in helpscout_api.get_many(
+            record_ids, concurrency=concurrency, raw=True,
+        ):
+            if isinstance(record, Exception):
+                errors[record_id] = record
+            elif record is None:
+                self.delete(api, record_id)
+            else:
+                self.save(api, [record])
+        return errors
+
+
+__all__ = [
+    'Mirror',
+    'MirrorApi',
+    'MirrorConversations',
+    'MirrorCustomers',
+    'MirrorMailboxes',
+    'MirrorStore',
+    'MirrorUsers',
+]
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+from ..apis.conversations import Conversations
+from ..apis.customers import Customers
+from ..apis.mailboxes import Mailboxes
+from ..apis.users import Users
+from ..models.folder import Folder
+
+
+class MirrorApi(object):
+    """This reads the records of one API from a mirror.
+
+    Its methods mirror the ones of the API class that it reads the records
+    of, without the session, so that ``mirror.Customers.get(1234)`` can be
+    used in place of ``hs.Customers.get(1234)``.
+    """
+
+    # The API class whose records are read.
+    __api__ = None
+
+    def __init__(self, store):
+        """Initialize a new API reading from the store.
+
+        Args:
+            store (helpscout.mirror.store.MirrorStore): The mirror store.
+        """
+        self.store = store
+
+    @property
+    def name(self):
+        """Name of the API in the store."""
+        return self.__api__.__name__
+
+    def get(self, record_id, raw=False):
+        """Return a specific record.
+
+        Args:
+            record_id (int): The ID of the record to get.
+            raw (bool or str, optional): Return the decoded dictionary
+                instead of a model. See
+                :func:`helpscout.base_api.BaseApi.__new__`.
+
+        Returns:
+            helpscout.BaseModel: The record, or ``None`` if it is not in the
+                mirror.
+        """
+        record = self.store.get(self.name, record_id)
+        if record is None:
+            return None
+        return self._get_output_type(raw)(**record)
+
+    def get_many(self, record_ids, raw=False):
+        """Return many specific records.
+
+        See :func:`helpscout.base_api.BaseApi.get_many`.
+
+        Yields:
+            tuple: The ID and the record, or ``None``, for each record.
+        """
+        for record_id in record_ids:
+            yield record_id, self.get(record_id, raw=raw)
+
+    def list(self, raw=False):
+        """Return all of the records.
+
+        Args:
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models.
+
+        Returns:
+            iter: The records.
+        """
+        return self._iter(self.store.select(self.name), raw)
+
+    def _iter(self, records, raw=False, out_type=None):
+        """Return an iterator creating the output of each record."""
+        output_type = self._get_output_type(raw, out_type)
+        return (output_type(**record) for record in records)
+
+    def _get_output_type(self, raw=False, out_type=None):
+        """Return the callable creating the output of a record."""
+        return self.__api__._get_output_type(out_type, raw)
+
+
+class MirrorConversations(MirrorApi):
+    """This reads conversations, including their threads, from a mirror.
+    """
+
+    __api__ = Conversations
+
+    # Name of the threads in the store.
+    THREADS = 'Threads'
+
+    def get(self, record_id, raw=False):
+        """Return a specific conversation, including its threads."""
+        record = self.store.get(self.name, record_id)
+        if record is None:
+            return None
+        record['threads'] = list(self.store.select(self.THREADS, record_id))
+        return self._get_output_type(raw)(**record)
+
+    def list(self, mailbox, raw=False):
+        """Return the conversations in a mailbox, without their threads.
+
+        Args:
+            mailbox (helpscout.models.Mailbox): Mailbox to list.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models.
+
+        Returns:
+            iter: The conversations.
+        """
+        return self._iter(self.store.select(self.name, mailbox.id), raw)
+
+    def list_folder(self, mailbox, folder, raw=False):
+        """Return the conversations in a specific folder of a mailbox.
+
+        Args:
+            mailbox (helpscout.models.Mailbox): Mailbox that folder is in.
+            folder (helpscout.models.Folder): Folder to list.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models.
+
+        Returns:
+            iter: The conversations.
+        """
+        return self._iter(
+            self.store.select(self.name, mailbox.id, folder_id=folder.id), raw,
+        )
+
+    def find_customer(self, mailbox, customer, raw=False):
+        """Return the conversations of a customer in a mailbox.
+
+        Args:
+            mailbox (helpscout.models.Mailbox): Mailbox to search.
+            customer (helpscout.models.Customer): Customer to search for.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models.
+
+        Returns:
+            iter: The conversations.
+        """
+        return self._iter(
+            self.store.select(self.name, mailbox.id, customer_id=customer.id),
+            raw,
+        )
+
+    def find_user(self, mailbox, user, raw=False):
+        """Return the conversations owned by a user in a mailbox.
+
+        Args:
+            mailbox (helpscout.models.Mailbox): Mailbox to search.
+            user (helpscout.models.User): User to search for.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models.
+
+        Returns:
+            iter: The conversations.
+        """
+        return self._iter(
+            self.store.select(self.name, mailbox.id, owner_id=user.id), raw,
+        )
+
+
+class MirrorCustomers(MirrorApi):
+    """This reads customers from a mirror."""
+
+    __api__ = Customers
+
+    def list(self, first_name=None, last_name=None, email=None, raw=False):
+        """Return the customers, optionally filtered.
+
+        Args:
+            first_name (str, optional): First name of the customers.
+            last_name (str, optional): Last name of the customers.
+            email (str, optional): Email address of the customers.
+            raw (bool or str, optional): Iterate the decoded dictionaries
+                instead of models.
+
+        Returns:
+            iter: The customers.
+        """
+        return self._iter(self.store.select(
+            self.name, first_name=first_name, last_name=last_name,
+            email=email,
+        ), raw)
+
+
+class MirrorMailboxes(MirrorApi):
+    """This reads mailboxes, and their folders, from a mirror."""
+
+    __api__ = Mailboxes
+
+    # Name of the folders in the store.
+    FOLDERS = 'Folders'
+
+    def get_folders(self, mailbox_or_id):
+        """List the folders for the mailbox.
+
+        Args:
+            mailbox_or_id (helpscout.models.Mailbox or int): Mailbox or the
+                ID of the mailbox to get the folders for.
+
+        Returns:
+            iter: The folders.
+        """
+        mailbox_id = getattr(mailbox_or_id, 'id', mailbox_or_id)
+        return self._iter(
+            self.store.select(self.FOLDERS, mailbox_id), out_type=Folder,
+        )
+
+
+class MirrorUsers(MirrorApi):
+    """This reads users from a mirror."""
+
+    __api__ = Users
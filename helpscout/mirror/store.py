@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import json
+import sqlite3
+import threading
+
+
+class MirrorStore(object):
+    """This stores API records as JSON in one table of an SQLite database.
+
+    Records are stored per API, keyed by their ID, along with the IDs that
+    they are listed by: the mailbox of conversations and folders, and the
+    conversation of threads. The records are kept in the camelCase form
+    received from, and sent to, the API.
+
+    The values that records are filtered by are copied to indexed columns,
+    and the email addresses of customers to their own table, so that
+    records are filtered by SQLite instead of being decoded to be compared.
+
+    The connection is shared by the threads using the store.
+
+    Attributes:
+        path (str): Path of the database.
+    """
+
+    # Number of records read from the database at once.
+    BATCH_SIZE = 500
+
+    # Columns that records can be filtered by. Their values are returned by
+    # ``_get_columns``.
+    COLUMNS = (
+        'folder_id', 'customer_id', 'owner_id', 'first_name', 'last_name',
+    )
+
+    # Each index ends with the columns compared for equality, so that its
+    # matches are in the order of their row IDs.
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS records ('
+        'api TEXT NOT NULL, '
+        'id INTEGER NOT NULL, '
+        'parent_id INTEGER, '
+        'folder_id INTEGER, '
+        'customer_id INTEGER, '
+        'owner_id INTEGER, '
+        'first_name TEXT, '
+        'last_name TEXT, '
+        'data TEXT NOT NULL, '
+        'PRIMARY KEY (api, id))',
+        'CREATE INDEX IF NOT EXISTS records_api ON records (api)',
+        'CREATE INDEX IF NOT EXISTS records_parent '
+        'ON records (api, parent_id)',
+        'CREATE INDEX IF NOT EXISTS records_folder '
+        'ON records (api, parent_id, folder_id)',
+        'CREATE INDEX IF NOT EXISTS records_customer '
+        'ON records (api, parent_id, customer_id)',
+        'CREATE INDEX IF NOT EXISTS records_owner '
+        'ON records (api, parent_id, owner_id)',
+        'CREATE INDEX IF NOT EXISTS records_first_name '
+        'ON records (api, first_name)',
+        'CREATE INDEX IF NOT EXISTS records_last_name '
+        'ON records (api, last_name)',
+        'CREATE TABLE IF NOT EXISTS emails ('
+        'api TEXT NOT NULL, '
+        'id INTEGER NOT NULL, '
+        'email TEXT NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS emails_email ON emails (api, email)',
+        'CREATE INDEX IF NOT EXISTS emails_record ON emails (api, id)',
+    ]
+
+    def __init__(self, path):
+        """Initialize a new store, creating the database if needed.
+
+        Args:
+            path (str): Path of the database. ``':memory:'`` keeps it in
+                memory.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+
+    def close(self):
+        """Close the database."""
+        self._connection.close()
+
+    def count(self, api):
+        """Return the number of records of the API."""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM records WHERE api = ?', (api,),
+            ).fetchone()[0]
+
+    def get(self, api, record_id):
+        """Return a record.
+
+        Args:
+            api (str): Name of the API.
+            record_id (int): ID of the record.
+
+        Returns:
+            dict: The record, or ``None`` if it is not stored.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT data FROM records WHERE api = ? AND id = ?',
+                (api, record_id),
+            ).fetchone()
+        return row and json.loads(row[0])
+
+    def select(self, api, parent_id=None, email=None, **filters):
+        """Yield the records of the API, in the order they were first saved.
+
+        The records are read in batches of :attr:`BATCH_SIZE`, so that they
+        are not all held in memory, nor the database locked while they are
+        consumed. A record saved again meanwhile keeps its position, so it
+        is yielded at most once.
+
+        Args:
+            api (str): Name of the API.
+            parent_id (int, optional): Only return the records listed by
+                this parent.
+            email (str, optional): Only return the records with this email
+                address.
+            **filters: Values of the :attr:`COLUMNS` that the records must
+                have, such as ``folder_id=1234``.
+
+        Yields:
+            dict: The records.
+        """
+        query = 'SELECT rowid, data FROM records WHERE api = ?'
+        params = [api]
+        if parent_id is not None:
+            query += ' AND parent_id = ?'
+            params.append(parent_id)
+        for column, value in sorted(filters.items()):
+            if column not in self.COLUMNS:
+                raise TypeError('%s is not a column of the records.' % column)
+            if value is not None:
+                query += ' AND %s = ?' % column
+                params.append(value)
+        if email is not None:
+            query += (
+                ' AND id IN ('
+                'SELECT id FROM emails WHERE api = ? AND email = ?)'
+            )
+            params.extend([api, email])
+        query += ' AND rowid > ? ORDER BY rowid LIMIT ?'
+        last_row = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    query, params + [last_row, self.BATCH_SIZE],
+                ).fetchall()
+            for last_row, data in rows:
+                yield json.loads(data)
+            if len(rows) < self.BATCH_SIZE:
+                return
+
+    def save(self, api, records, parent_id=None, replace_children=False):
+        """Save records of the API, updating any with the same IDs.
+
+        Updated records are modified in place, so that they keep their row
+        ID, and their position in :func:`select`.
+
+        Args:
+            api (str): Name of the API.
+            records (iter): The records, as dictionaries in their API form.
+            parent_id (int, optional): ID of the parent listing the records.
+            replace_children (bool, optional): Delete the other records of
+                the parent.
+        """
+        rows = []
+        emails = []
+        for record in records:
+            rows.append(
+                (api, record['id'], parent_id) +
+                self._get_columns(record) + (json.dumps(record),),
+            )
+            emails.extend(
+                (api, record['id'], email.get('value'))
+                for email in record.get('emails') or []
+                if email.get('value')
+            )
+        with self._lock, self._connection:
+            if replace_children:
+                saved = set(row[1] for row in rows)
+                children = self._connection.execute(
+                    'SELECT id FROM records WHERE api = ? AND parent_id = ?',
+                    (api, parent_id),
+                )
+                stale = [
+                    (api, record_id) for record_id, in children
+                    if record_id not in saved
+                ]
+                for table in ('records', 'emails'):
+                    self._connection.executemany(
+                        'DELETE FROM %s WHERE api = ? AND id = ?' % table,
+                        stale,
+                    )
+            self._connection.executemany(
+                'DELETE FROM emails WHERE api = ? AND id = ?',
+                [row[:2] for row in rows],
+            )
+            # Update the existing records before inserting the others,
+            # since replacing them would give them new row IDs.
+            self._connection.executemany(
+                'UPDATE records SET parent_id = ?, %s, data = ? '
+                'WHERE api = ? AND id = ?' % ', '.join(
+                    '%s = ?' % column for column in self.COLUMNS
+                ),
+                [row[2:] + row[:2] for row in rows],
+            )
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO records (api, id, parent_id, %s, data)'
+                ' VALUES (%s)' % (
+                    ', '.join(self.COLUMNS),
+                    ', '.join('?' * (len(self.COLUMNS) + 4)),
+                ),
+                rows,
+            )
+            self._connection.executemany(
+                'INSERT INTO emails (api, id, email) VALUES (?, ?, ?)',
+                emails,
+            )
+
+    def delete(self, api, record_id):
+        """Delete a record.
+
+        Args:
+            api (str): Name of the API.
+            record_id (int): ID of the record.
+        """
+        with self._lock, self._connection:
+            for table in ('records', 'emails'):
+                self._connection.execute(
+                    'DELETE FROM %s WHERE api = ? AND id = ?' % table,
+                    (api, record_id),
+                )
+
+    @staticmethod
+    def _get_columns(record):
+        """Return the values of the ``COLUMNS`` of a record."""
+        return (
+            record.get('folderId'),
+            (record.get('customer') or {}).get('id'),
+            (record.get('owner') or {}).get('id'),
+            record.get('firstName'),
+            record.get('lastName'),
+        )
@@ -5,6 +5,8 @@
 import base64
 import properties
 
+from six import text_type
+
 from .. import BaseModel
 
 
@@ -21,13 +23,18 @@ class AttachmentData(BaseModel):
 
     @raw_data.setter
     def raw_data(self, value):
-        """Set the base64 encoded data using a raw value or file object."""
+        """Set the base64 encoded data using a raw value or file object.
+
+        Text is encoded to UTF-8, while binary data is used as is.
+        """
         if value:
             try:
                 value = value.read()
             except AttributeError:
                 pass
-            b64 = base64.b64encode(value.encode('utf-8'))
+            if isinstance(value, text_type):
+                value = value.encode('utf-8')
+            b64 = base64.b64encode(value)
             self.data = b64.decode('utf-8')
 
     @raw_data.deleter
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import hashlib
+import json
+import threading
+
+from .json_log import JsonLog
+
+
+class ProgressLog(object):
+    """This durably records which records of a bulk operation are done.
+
+    Each completed record is appended to a file as one line of JSON, which
+    is flushed to disk before moving on. When the same file is used again,
+    the records that it lists are skipped, so that an interrupted migration
+    can simply be run again.
+
+    Records are identified by a key, which defaults to a hash of their API
+    values.
+
+    Examples::
+
+        log = ProgressLog('customers.progress')
+        for customer, result in hs.Customers.create_many(
+            customers, progress_log=log,
+        ):
+            print(result)
+
+    Attributes:
+        path (str): Path of the log file.
+        done (dict): The IDs that were created, keyed by record key.
+    """
+
+    def __init__(self, path):
+        """Initialize a new progress log, loading the file if it exists.
+
+        Args:
+            path (str): Path of the log file.
+        """
+        self.path = path
+        self.done = {}
+        self._lock = threading.Lock()
+        self._log = JsonLog(path)
+        self._load()
+
+    def __contains__(self, key):
+        return key in self.done
+
+    def __len__(self):
+        return len(self.done)
+
+    @staticmethod
+    def get_key(record):
+        """Return the default key of a record, which hashes its API values.
+
+        Args:
+            record (helpscout.BaseModel): The record.
+
+        Returns:
+            str: A key that is identical for records with identical values.
+        """
+        data = json.dumps(record.to_api(), sort_keys=True, default=str)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def add(self, key, record_id=None):
+        """Record that a record is done.
+
+        Args:
+            key (str): Key of the record.
+            record_id (int, optional): ID of the record on HelpScout.
+        """
+        with self._lock:
+            self._log.append({'key': key, 'id': record_id})
+            self.done[key] = record_id
+
+    def _load(self):
+        """Load the records that are done from the file."""
+        for entry in self._log.load():
+            self.done[entry['key']] = entry.get('id')
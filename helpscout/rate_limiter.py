@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import threading
+import time
+
+from email.utils import mktime_tz, parsedate_tz
+
+try:
+    from time import monotonic
+except ImportError:  # pragma: no cover
+    monotonic = time.time
+
+
+class RateLimiter(object):
+    """This is a token bucket that schedules requests under the rate limit.
+
+    HelpScout limits the amount of requests per minute for each account. A
+    ``RateLimiter`` attached to a ``HelpScoutSession`` is shared by every API
+    and paginator thread using that session, so that they draw from the same
+    budget.
+
+    The bucket is corrected using the ``X-RateLimit-Limit-Minute`` and
+    ``X-RateLimit-Remaining-Minute`` headers of every response, and all
+    requests are paused for the duration of a ``Retry-After`` header.
+
+    Examples::
+
+        from helpscout import HelpScout, RateLimiter
+        hs = HelpScout('api_key', rate_limiter=RateLimiter(rate=400))
+
+    Attributes:
+        rate (float): Amount of requests allowed per ``period``.
+        period (float): Length of the rate limit window, in seconds.
+        burst (float): Maximum amount of requests that can be sent at once.
+        max_retries (int): Amount of times that a request is sent again after
+            a ``429`` response. This is ignored if the session has a
+            ``RetryPolicy``, which then retries ``429`` responses itself.
+    """
+
+    HEADER_LIMIT = 'X-RateLimit-Limit-Minute'
+    HEADER_REMAINING = 'X-RateLimit-Remaining-Minute'
+    HEADER_RETRY_AFTER = 'Retry-After'
+
+    STATUS_TOO_MANY = 429
+
+    def __init__(self, rate=200, period=60, burst=None, max_retries=3,
+                 clock=monotonic, sleep=time.sleep):
+        """Initialize a new rate limiter.
+
+        Args:
+            rate (float, optional): Amount of requests allowed per
+                ``period``.
+            period (float, optional): Length of the rate limit window, in
+                seconds.
+            burst (float, optional): Maximum amount of requests that can be
+                sent at once. Defaults to ``rate``.
+            max_retries (int, optional): Amount of times that a request is
+                sent again after a ``429`` response.
+            clock (callable, optional): Monotonic clock returning seconds.
+            sleep (callable, optional): Function used to wait, in seconds.
+        """
+        self.rate = float(rate)
+        self.period = float(period)
+        self.burst = float(burst or rate)
+        self.max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated_at = clock()
+        self._blocked_until = 0
+
+    def acquire(self):
+        """Block until a request can be sent, then consume a token."""
+        wait = self.reserve()
+        while wait:
+            self._sleep(wait)
+            wait = self.reserve()
+
+    def reserve(self):
+        """Consume a token if one is available, without blocking.
+
+        Returns:
+            float: ``0`` if a token was consumed. Otherwise the amount of
+                seconds to wait before trying again.
+        """
+        with self._lock:
+            now = self._refill()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.fill_rate
+
+    def update(self, status_code, headers):
+        """Correct the bucket using the response of a request.
+
+        Args:
+            status_code (int): Status code of the response.
+            headers (dict): Case-insensitive mapping of response headers.
+        """
+        with self._lock:
+            now = self._refill()
+            limit = self._parse_number(headers.get(self.HEADER_LIMIT))
+            if limit:
+                self.rate = limit
+                self.period = 60.0
+                self.burst = min(self.burst, limit)
+            remaining = self._parse_number(headers.get(self.HEADER_REMAINING))
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+            retry_after = self.parse_retry_after(
+                headers.get(self.HEADER_RETRY_AFTER),
+            )
+            if status_code == self.STATUS_TOO_MANY:
+                self._tokens = 0
+                if retry_after is None:
+                    retry_after = 1 / self.fill_rate
+            if retry_after:
+                self._blocked_until = max(
+                    self._blocked_until, now + retry_after,
+                )
+
+    @property
+    def fill_rate(self):
+        """Amount of tokens that are added to the bucket per second."""
+        return self.rate / self.period
+
+    def _refill(self):
+        """Add the tokens accrued since the last refill & return the time.
+        """
+        now = self._clock()
+        elapsed = max(now - self._updated_at, 0)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.fill_rate)
+        self._updated_at = now
+        return now
+
+    @staticmethod
+    def _parse_number(value):
+        """Return the header value as a float, or ``None``."""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def parse_retry_after(cls, value):
+        """Return the seconds to wait for a ``Retry-After`` header value.
+
+        The value can either be an amount of seconds, or an HTTP date.
+        """
+        seconds = cls._parse_number(value)
+        if seconds is not None or not value:
+            return seconds
+        parsed = parsedate_tz(value)
+        if parsed is None:
+            return None
+        return max(mktime_tz(parsed) - time.time(), 0)
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import threading
+
+from collections import OrderedDict
+
+from .rate_limiter import monotonic
+
+
+class RecordCache(object):
+    """This keeps the records returned by ``get`` for a limited time.
+
+    Records are stored per API, keyed by their ID, so that repeated lookups
+    of the same user or mailbox do not hit the network. Each API has its own
+    time to live and size bound, and the least recently used records are
+    discarded first.
+
+    A ``RecordCache`` attached to a ``HelpScoutSession`` is shared by all of
+    the APIs using that session, and records are invalidated whenever they
+    are updated or deleted through it. A record that was requested before
+    it was invalidated is not stored once it is received, since it can be
+    outdated.
+
+    Conversations are not cached unless enabled explicitly, since they are
+    routinely changed by agents and customers outside of this client (see
+    :attr:`DEFAULT_APIS`).
+
+    Examples::
+
+        from helpscout import HelpScout, RecordCache
+        hs = HelpScout('api_key', record_cache=RecordCache(
+            ttl=300, apis={'Conversations': {'ttl': 30}},
+        ))
+
+    Attributes:
+        ttl (float): Default number of seconds that a record is kept for.
+        max_entries (int): Default maximum number of records kept per API.
+        apis (dict): Settings overriding ``ttl`` and/or ``max_entries`` for
+            specific APIs, keyed by API class name. A ``ttl`` of ``0``
+            disables the cache for that API.
+        hits (int): Number of lookups that were answered from the cache.
+        misses (int): Number of lookups that were not.
+    """
+
+    # Settings applied to specific APIs unless given in ``apis``.
+    DEFAULT_APIS = {
+        'Conversations': {'ttl': 0},
+    }
+
+    def __init__(self, ttl=300, max_entries=1000, apis=None,
+                 clock=monotonic):
+        """Initialize a new record cache.
+
+        Args:
+            ttl (float, optional): Default number of seconds that a record
+                is kept for.
+            max_entries (int, optional): Default maximum number of records
+                kept per API.
+            apis (dict, optional): Settings overriding ``ttl`` and/or
+                ``max_entries`` for specific APIs, keyed by API class name.
+                These are merged over :attr:`DEFAULT_APIS`.
+            clock (callable, optional): Monotonic clock returning seconds.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.apis = {
+            api: dict(settings) for api, settings in self.DEFAULT_APIS.items()
+        }
+        for api, settings in (apis or {}).items():
+            self.apis.setdefault(api, {}).update(settings)
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._records = {}
+        self._stats = {}
+        # Number of invalidations so far, and the one at which each record
+        # or API was last invalidated.
+        self._generation = 0
+        self._invalidated = {}
+        self._invalidated_apis = {}
+        # Latest invalidation of a record that is no longer remembered.
+        self._forgotten = 0
+
+    def generation(self):
+        """Return the current generation of the cache.
+
+        This is taken before requesting a record, and given to :func:`set`
+        so that the record is not stored if it was invalidated meanwhile.
+
+        Returns:
+            int: The number of invalidations so far.
+        """
+        with self._lock:
+            return self._generation
+
+    def get(self, api, record_id):
+        """Return the cached record, or ``None`` if missing or expired.
+
+        Args:
+            api (str): Name of the API class.
+            record_id (mixed): ID of the record.
+
+        Returns:
+            dict: The decoded record, as received from the API.
+        """
+        if not self._get_setting(api, 'ttl'):
+            return None
+        with self._lock:
+            records = self._records.get(api, {})
+            stats = self._get_stats(api)
+            expires_at, record = records.pop(record_id, (None, None))
+            if record is not None and expires_at > self._clock():
+                records[record_id] = (expires_at, record)
+                self.hits += 1
+                stats['hits'] += 1
+                return record
+            self.misses += 1
+            stats['misses'] += 1
+            return None
+
+    def set(self, api, record_id, record, generation=None):
+        """Store a record.
+
+        Args:
+            api (str): Name of the API class.
+            record_id (mixed): ID of the record.
+            record (dict): The decoded record, as received from the API.
+            generation (int, optional): The :func:`generation` of the cache
+                when the record was requested. The record is not stored if
+                it was invalidated since.
+        """
+        ttl = self._get_setting(api, 'ttl')
+        if not ttl:
+            return
+        max_entries = self._get_setting(api, 'max_entries')
+        with self._lock:
+            if generation is not None and \
+                    self._is_invalidated(api, record_id, generation):
+                return
+            records = self._records.setdefault(api, OrderedDict())
+            records.pop(record_id, None)
+            records[record_id] = (self._clock() + ttl, record)
+            while len(records) > max_entries:
+                records.popitem(last=False)
+
+    def invalidate(self, api, record_id=None):
+        """Remove a record, or all of the records of an API.
+
+        Args:
+            api (str): Name of the API class.
+            record_id (mixed, optional): ID of the record. All of the
+                records of the API are removed if this is ``None``.
+        """
+        with self._lock:
+            self._generation += 1
+            if record_id is None:
+                self._records.pop(api, None)
+                self._invalidated.pop(api, None)
+                self._invalidated_apis[api] = self._generation
+                return
+            self._records.get(api, {}).pop(record_id, None)
+            invalidated = self._invalidated.setdefault(api, OrderedDict())
+            invalidated.pop(record_id, None)
+            invalidated[record_id] = self._generation
+            while len(invalidated) > self._get_setting(api, 'max_entries'):
+                self._forgotten = invalidated.popitem(last=False)[1]
+
+    def clear(self):
+        """Remove all of the records."""
+        with self._lock:
+            self._records.clear()
+            self._generation += 1
+            self._invalidated.clear()
+            self._invalidated_apis.clear()
+            self._forgotten = self._generation
+
+    def stats(self):
+        """Return the counters of each API.
+
+        Returns:
+            dict: Mapping of API class names to dictionaries with the
+                ``hits``, ``misses`` and ``size`` of their cache.
+        """
+        with self._lock:
+            return {
+                api: dict(stats, size=len(self._records.get(api, ())))
+                for api, stats in self._stats.items()
+            }
+
+    def _is_invalidated(self, api, record_id, generation):
+        """Return whether the record was invalidated after the generation.
+        """
+        invalidated = max(
+            self._forgotten,
+            self._invalidated_apis.get(api, 0),
+            self._invalidated.get(api, {}).get(record_id, 0),
+        )
+        return invalidated > generation
+
+    def _get_setting(self, api, name):
+        """Return the setting for the API, or the default one."""
+        return self.apis.get(api, {}).get(name, getattr(self, name))
+
+    def _get_stats(self, api):
+        """Return the counters of the API, creating them if needed."""
+        try:
+            return self._stats[api]
+        except KeyError:
+            stats = self._stats[api] = {'hits': 0, 'misses': 0}
+            return stats
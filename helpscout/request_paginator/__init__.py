@@ -2,9 +2,46 @@
 # Copyright 2017-TODAY LasLabs Inc.
 # License MIT (https://opensource.org/licenses/MIT).
 
+import os
 import requests
 
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from ..exceptions import HelpScoutRemoteException
+from ..http_cache import HttpCache
+from ..session import HelpScoutSession
+
+from .base64_stream import Base64StreamDecoder
+from .item_stream import ItemStreamDecoder
+
+
+class Page(object):
+    """This represents one page of results, in the order received.
+
+    Iterating a ``Page`` yields its records.
+
+    Attributes:
+        number (int): The number of this page.
+        total (int): The total number of pages, as of this response.
+        records (list): The records contained in this page.
+    """
+
+    def __init__(self, number, total, records):
+        self.number = number
+        self.total = total
+        self.records = records
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        return '<Page %d/%d (%d records)>' % (
+            self.number, self.total, len(self.records),
+        )
 
 
 class RequestPaginator(object):
@@ -14,8 +51,12 @@ class RequestPaginator(object):
     # Response attributes that mean things
     PAGE_TOTAL = 'pages'  # Total number of pages
     PAGE_CURRENT = 'page'  # Current page number
+    PAGE_COUNT = 'count'  # Total number of records
     PAGE_DATA_MULTI = 'items'  # Attribute if multiple results
     PAGE_DATA_SINGLE = 'item'  # Attribute if one result
+    PAGE_PARAM = 'page'  # Request parameter to select a page
+
+    STREAM_CHUNK_SIZE = 65536  # Bytes read at once when streaming
 
     SSL_VERIFY = True  # Verify SSL
     PAGE_SIZE = 50  # Page size returned by HelpScout
@@ -29,9 +70,11 @@ class RequestPaginator(object):
     # Starting page ints
     page_current = 0
     page_total = 0
+    record_count = None
 
     def __init__(self, endpoint, data=None, output_type=dict,
-                 request_type=GET, session=None):
+                 request_type=GET, session=None, concurrency=None,
+                 ordered=True, stream=False):
         """Initialize the RequestPaginator object.
 
         Args:
@@ -44,6 +87,14 @@ class RequestPaginator(object):
             request_type (str): Type of request to send (``GET`` or ``POST``).
             session (requests.Session, optional): An authenticated requests
              session to use.
+            concurrency (int, optional): Maximum number of pages to request
+             at the same time once the total page count is known. Defaults
+             to the ``concurrency`` of the session, or ``1``.
+            ordered (bool, optional): Set this to ``False`` to yield rows
+             as soon as their page is received, instead of in page order.
+            stream (bool, optional): Set this to ``True`` to decode the rows
+             of each page one at a time while the response is received, see
+             :func:`iterate`.
 
         Raises:
             NotImplementedError: In the event that an invalid request type was
@@ -58,20 +109,119 @@ class RequestPaginator(object):
             )
         self.request_type = request_type
         self.session = session or requests.Session()
+        self.concurrency = concurrency
+        self.ordered = ordered
+        self.stream = stream
 
-    def __iter__(self, page=1):
+    def __iter__(self):
         """Provide an iterator for the remote request.
 
         The result is returned as an instantiated `self.output_type`.
         """
-        self.page_current = page
-        self.page_total = page + 1
-        while self.page_current < self.page_total:
-            data = self.data and self.data.copy() or None
-            result = self.call(data)
-            for row in result:
-                yield self.output_type(**row)
-        raise StopIteration()
+        return self.iterate()
+
+    def iterate(self, concurrency=None, ordered=None, stream=None):
+        """Iterate the remote request, optionally fetching pages in parallel.
+
+        The first page is always requested by itself in order to discover the
+        total number of pages. The remaining pages are then requested on a
+        thread pool of up to ``concurrency`` workers.
+
+        In streaming mode, the pages are instead requested one at a time, and
+        each row is decoded and instantiated as soon as it is received. This
+        means that the memory used is proportional to one row instead of one
+        page. Note that a connection failure in the middle of a page cannot
+        be retried in this mode.
+
+        Args:
+            concurrency (int, optional): Maximum number of pages to request
+             at the same time. Defaults to the value set on init. This is
+             ignored in streaming mode.
+            ordered (bool, optional): Set this to ``False`` to yield rows as
+             soon as their page is received. Defaults to the value set on
+             init.
+            stream (bool, optional): Set this to ``True`` to decode rows one
+             at a time while the response is received. Defaults to the value
+             set on init.
+
+        Yields:
+            mixed: Rows instantiated as ``self.output_type``.
+        """
+        if stream is None:
+            stream = self.stream
+        if stream:
+            for row in self._iter_stream():
+                yield row
+            return
+        for page in self.iter_pages(concurrency=concurrency, ordered=ordered):
+            for row in page:
+                yield row
+
+    def iter_pages(self, start=1, stop=None, concurrency=None,
+                   ordered=None):
+        """Iterate a range of result pages.
+
+        Args:
+            start (int, optional): Number of the first page to request.
+            stop (int, optional): Number of the page to stop before, as with
+             ``range``. Defaults to after the last page.
+            concurrency (int, optional): Maximum number of pages to request
+             at the same time. Defaults to the value set on init.
+            ordered (bool, optional): Set this to ``False`` to yield pages as
+             soon as they are received. Defaults to the value set on init.
+
+        Yields:
+            Page: Pages of rows, carrying their page number. When the pages
+             are ordered, the ``number`` of the last page that was fully
+             processed can be provided to :func:`resume` in order to
+             continue from there. Unordered pages are not a valid
+             checkpoint, since earlier pages may not have been received.
+        """
+        if concurrency is None:
+            concurrency = self.concurrency
+        if concurrency is None:
+            concurrency = self._get_session_setting('concurrency', 1)
+        if ordered is None:
+            ordered = self.ordered
+        if stop is not None and start >= stop:
+            return
+        rows = self.call(self._get_page_data(start)) or []
+        if self.page_current <= self.page_total or rows:
+            yield self._new_page(self.page_current, self.page_total, rows)
+        last = self.page_total
+        if stop is not None:
+            last = min(last, stop - 1)
+        if concurrency > 1:
+            pages = range(self.page_current + 1, last + 1)
+            for page in self._iter_concurrent(pages, concurrency, ordered):
+                yield page
+            return
+        while self.page_current < last:
+            rows = self.call(self._get_page_data(self.page_current + 1))
+            yield self._new_page(
+                self.page_current, self.page_total, rows or [],
+            )
+
+    def resume(self, checkpoint, stop=None, concurrency=None, ordered=None):
+        """Continue iterating pages after a checkpoint.
+
+        Args:
+            checkpoint (int or Page): The last page that was fully processed,
+             or its number. Every page before it must have been processed,
+             as when iterating ordered pages.
+            stop (int, optional): Number of the page to stop before.
+            concurrency (int, optional): Maximum number of pages to request
+             at the same time.
+            ordered (bool, optional): Set this to ``False`` to yield pages as
+             soon as they are received.
+
+        Returns:
+            iter: Iterator of ``Page`` objects, as in :func:`iter_pages`.
+        """
+        checkpoint = getattr(checkpoint, 'number', checkpoint)
+        return self.iter_pages(
+            checkpoint + 1, stop, concurrency=concurrency, ordered=ordered,
+        )
 
     def call(self, data=None):
         """Generic API caller. Return the JSON decoded result.
@@ -89,6 +239,72 @@ class RequestPaginator(object):
         """
         return getattr(self, self.request_type)(data)
 
+    def locate(self, data=None):
+        """Send the request, and return its ``Location`` header.
+
+        The response body is not decoded. This is used for writes that do not
+        need the record to be sent back, since HelpScout responds with the
+        location of the record instead.
+
+        Args:
+            data (dict, optional): Either the request parameters or the JSON
+             data, depending on the request type.
+
+        Returns:
+            str: The ``Location`` header, or ``None`` if not present.
+        """
+        key = 'params' if self.request_type == self.GET else 'json'
+        response = self._get_response(
+            self.request_type, url=self.endpoint, **{key: data}
+        )
+        return response.headers.get('Location')
+
+    def upload(self, body):
+        """Send the request with a streamed JSON body, and return the result.
+
+        Args:
+            body (io.RawIOBase): Readable JSON body, which supports ``len``
+             and rewinding with ``seek(0)``.
+
+        Returns:
+            mixed: JSON decoded response data.
+        """
+        return self._call(
+            self.request_type, url=self.endpoint, data=body,
+            headers={'Content-Type': 'application/json'},
+        )
+
+    def download(self, key, dest):
+        """Send the request, decoding a base64 member of the response.
+
+        The member is decoded as the response is received, and written to
+        ``dest`` in chunks.
+
+        Args:
+            key (str): Name of the base64 encoded member.
+            dest (str or file): Path of the file to write, or a writable
+             binary file object. A file at the path is removed if the
+             download fails.
+
+        Raises:
+            ValueError: If the response does not contain valid base64 data.
+
+        Returns:
+            int: Number of decoded bytes that were written.
+        """
+        with self._open_dest(dest) as output:
+            response = self._get_response(
+                self.request_type, url=self.endpoint, params=self.data,
+                stream=True,
+            )
+            decoder = Base64StreamDecoder(key, output)
+            try:
+                for chunk in response.iter_content(self.STREAM_CHUNK_SIZE):
+                    decoder.feed(chunk)
+            finally:
+                response.close()
+            return decoder.close()
+
     def delete(self, json=None):
         """Send a DELETE request and return the JSON decoded result.
 
@@ -133,23 +349,254 @@ class RequestPaginator(object):
         """
         return self._call('put', url=self.endpoint, json=json)
 
+    def _iter_concurrent(self, pages, concurrency, ordered):
+        """Request the pages on a thread pool and yield their rows.
+
+        No more than twice ``concurrency`` pages are held at any time, so
+        that a slow consumer does not cause the whole result set to be
+        buffered in memory.
+
+        Args:
+            pages (iter): Page numbers to request.
+            concurrency (int): Maximum number of simultaneous requests.
+            ordered (bool): Yield the pages in the order of ``pages``, instead
+             of the order in which they are received.
+
+        Yields:
+            Page: The pages that were received.
+        """
+        pages = iter(pages)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending = deque()
+
+        def submit():
+            for page in pages:
+                pending.append(executor.submit(self._fetch_page, page))
+                return True
+            return False
+
+        try:
+            while len(pending) < concurrency * 2 and submit():
+                pass
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = done.pop()
+                    pending.remove(future)
+                submit()
+                yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _iter_stream(self):
+        """Request the pages one at a time, yielding rows as decoded."""
+        page = 1
+        while True:
+            key = 'params' if self.request_type == self.GET else 'json'
+            response = self._get_response(
+                self.request_type, url=self.endpoint, stream=True,
+                **{key: self._get_page_data(page)}
+            )
+            decoder = ItemStreamDecoder(self.PAGE_DATA_MULTI)
+            try:
+                chunks = response.iter_content(self.STREAM_CHUNK_SIZE)
+                for chunk in chunks:
+                    for row in decoder.feed(chunk):
+                        yield self.output_type(**row)
+                for row in decoder.close():
+                    yield self.output_type(**row)
+            finally:
+                response.close()
+            if self.PAGE_DATA_SINGLE in decoder.meta:
+                yield self.output_type(**decoder.meta[self.PAGE_DATA_SINGLE])
+            self.page_current = decoder.meta.get(self.PAGE_CURRENT, 1)
+            self.page_total = decoder.meta.get(self.PAGE_TOTAL, 1)
+            if self.page_current >= self.page_total:
+                return
+            page = self.page_current + 1
+
+    def _fetch_page(self, page):
+        """Request one page without touching the paginator state.
+
+        This is used from worker threads, so it must not modify the
+        ``page_current`` and ``page_total`` attributes.
+
+        Args:
+            page (int): The page number to request.
+
+        Returns:
+            Page: The requested page.
+        """
+        data = self._get_page_data(page)
+        key = 'params' if self.request_type == self.GET else 'json'
+        response_json = self._request(
+            self.request_type, url=self.endpoint, **{key: data}
+        )
+        return self._new_page(
+            response_json.get(self.PAGE_CURRENT, page),
+            response_json.get(self.PAGE_TOTAL, 1),
+            self._get_rows(response_json) or [],
+        )
+
+    def _new_page(self, number, total, rows):
+        """Return a ``Page`` of the rows, instantiated as the output type."""
+        return Page(number, total, [self.output_type(**row) for row in rows])
+
+    @staticmethod
+    def _open_dest(dest):
+        """Return a context manager writing to the path or file object."""
+        if hasattr(dest, 'write'):
+            return _Destination(dest)
+        return _Destination(open(dest, 'wb'), dest)
+
+    def _get_session_setting(self, name, default=None):
+        """Return a client-wide setting from a ``HelpScoutSession``."""
+        if isinstance(self.session, HelpScoutSession):
+            return getattr(self.session, name, default)
+        return default
+
+    def _get_page_data(self, page):
+        """Return a copy of the request data, selecting the given page."""
+        data = self.data and self.data.copy() or None
+        if page > 1:
+            data = data or {}
+            data[self.PAGE_PARAM] = page
+        return data
+
     def _call(self, method, *args, **kwargs):
         """Call the remote service and return the response data."""
+        response_json = self._request(method, *args, **kwargs)
+        self.page_current = response_json.get(self.PAGE_CURRENT, 1)
+        self.page_total = response_json.get(self.PAGE_TOTAL, 1)
+        self.record_count = response_json.get(self.PAGE_COUNT)
+        return self._get_rows(response_json)
+
+    def _request(self, method, *args, **kwargs):
+        """Send the request and return the JSON decoded response body.
+
+        If the session has an ``http_cache``, ``GET`` requests are sent
+        with the validators of the cached response, which is returned if the
+        remote responds that it was not modified. If it has a
+        ``single_flight``, identical ``GET`` requests that are in flight at
+        the same time share one response.
+
+        Raises:
+            HelpScoutRemoteException: If the remote responds with a non-2xx
+             status code.
+
+        Returns:
+            dict: The decoded response. Empty if there was no body.
+        """
+        http_cache = single_flight = None
+        if method == self.GET:
+            http_cache = self._get_session_setting('http_cache')
+            single_flight = self._get_session_setting('single_flight')
+        if http_cache is None and single_flight is None:
+            response = self._get_response(method, *args, **kwargs)
+            return response.text and response.json() or {}
+        key = HttpCache.get_key(kwargs.get('url'), kwargs.get('params'))
+        if single_flight is None:
+            return self._request_get(key, http_cache, method, *args, **kwargs)
+        return single_flight.call(
+            key, self._request_get, key, http_cache, method, *args, **kwargs
+        )
+
+    def _request_get(self, key, http_cache, method, *args, **kwargs):
+        """Send a GET request, revalidating it against the cache if any."""
+        request_headers = kwargs.get('headers')
+        if http_cache is not None:
+            headers = http_cache.get_headers(key)
+            if headers:
+                headers.update(request_headers or {})
+                kwargs['headers'] = headers
+        response = self._get_response(method, *args, **kwargs)
+        if http_cache is None:
+            return response.text and response.json() or {}
+        response_json = None
+        if response.status_code != http_cache.STATUS_NOT_MODIFIED:
+            response_json = response.text and response.json() or {}
+        response_json = http_cache.update(
+            key, response.status_code, response.headers, response_json,
+        )
+        if response_json is None and \
+                response.status_code == http_cache.STATUS_NOT_MODIFIED:
+            # The response was evicted since its validators were sent, so
+            # request its body again.
+            kwargs['headers'] = request_headers
+            response = self._get_response(method, *args, **kwargs)
+            response_json = http_cache.update(
+                key, response.status_code, response.headers,
+                response.text and response.json() or {},
+            )
+        return response_json or {}
+
+    def _get_response(self, method, *args, **kwargs):
+        """Send the request and return the successful response.
+
+        If the session has a ``retry_policy``, transient failures are
+        retried according to it.
+
+        Raises:
+            HelpScoutRemoteException: If the remote responds with a non-2xx
+             status code, other than ``304 Not Modified``.
+
+        Returns:
+            requests.Response: The response. Its body was not yet read.
+        """
 
         assert self.session
 
         if not kwargs.get('verify'):
             kwargs['verify'] = self.SSL_VERIFY
 
-        response = self.session.request(method, *args, **kwargs)
-        response_json = response.text and response.json() or {}
+        retry_policy = self._get_session_setting('retry_policy')
+        if retry_policy:
+            response = retry_policy.call(self._send, method, *args, **kwargs)
+        else:
+            response = self._send(method, *args, **kwargs)
+
+        # A 304 is only received in response to a conditional request.
+        if response.status_code == 304:
+            return response
 
         if response.status_code < 200 or response.status_code >= 300:
+            response_json = response.text and response.json() or {}
             message = response_json.get('error', response_json.get('message'))
             raise HelpScoutRemoteException(response.status_code, message)
 
-        self.page_current = response_json.get(self.PAGE_CURRENT, 1)
-        self.page_total = response_json.get(self.PAGE_TOTAL, 1)
+        return response
+
+    def _send(self, method, *args, **kwargs):
+        """Send the request using the session and return the response.
+
+        If the session has a ``rate_limiter``, the request waits for it and
+        is sent again after a ``429`` response, unless the session also has a
+        ``retry_policy``, which then retries it.
+        """
+        rate_limiter = self._get_session_setting('rate_limiter')
+        retries = rate_limiter and rate_limiter.max_retries or 0
+        if self._get_session_setting('retry_policy'):
+            retries = 0
+        while True:
+            if rate_limiter:
+                rate_limiter.acquire()
+            # Rewind a streamed body, in case this is sent again.
+            if hasattr(kwargs.get('data'), 'seek'):
+                kwargs['data'].seek(0)
+            response = self.session.request(method, *args, **kwargs)
+            if rate_limiter:
+                rate_limiter.update(response.status_code, response.headers)
+            if response.status_code != 429 or retries <= 0:
+                return response
+            response.close()
+            retries -= 1
+
+    def _get_rows(self, response_json):
+        """Return the rows contained in a decoded response."""
 
         try:
             return response_json[self.PAGE_DATA_MULTI]
@@ -162,3 +609,22 @@ class RequestPaginator(object):
             pass
 
         return None
+
+
+class _Destination(object):
+    """This writes to a file object, removing the file at a path on errors.
+    """
+
+    def __init__(self, output, path=None):
+        self.output = output
+        self.path = path
+
+    def __enter__(self):
+        return self.output
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.path is None:
+            return
+        self.output.close()
+        if exc_type is not None:
+            os.remove(self.path)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import base64
+import re
+
+# JSON escapes that can appear in a base64 string. Escaped line breaks are
+# dropped, like any whitespace in base64 data.
+ESCAPES = {
+    b'/': b'/',
+    b'n': b'',
+    b'r': b'',
+    b't': b'',
+}
+
+REGEX_SPECIAL = re.compile(br'[\\"]')
+
+
+class Base64StreamDecoder(object):
+    """This decodes a base64 string member of a JSON object as it streams.
+
+    Bytes of the response body are passed to :func:`feed` as they are
+    received. Once the member is found, its value is decoded in chunks and
+    written to ``dest``, so that neither the encoded nor the decoded content
+    is held in memory as a whole. The rest of the object is ignored.
+
+    Example::
+
+        with open('attachment.pdf', 'wb') as dest:
+            decoder = Base64StreamDecoder('data', dest)
+            for chunk in response.iter_content(65536):
+                decoder.feed(chunk)
+            decoder.close()
+
+    Attributes:
+        key (str): Name of the base64 encoded member.
+        dest (file): Writable object receiving the decoded content.
+        size (int): Number of decoded bytes that were written.
+        done (bool): ``True`` once the whole value was received.
+    """
+
+    # Bytes kept while looking for the member, in case it spans chunks.
+    KEY_WINDOW = 64
+
+    def __init__(self, key, dest):
+        self.key = key
+        self.dest = dest
+        self.size = 0
+        self.done = False
+        self._regex_key = re.compile(
+            br'"' + re.escape(key.encode('utf-8')) + br'"\s*:\s*"',
+        )
+        self._buffer = b''
+        self._found = False
+        self._escape = False
+        self._encoded = b''
+
+    def feed(self, data):
+        """Decode the next chunk of the body.
+
+        Args:
+            data (bytes): The next chunk of the response body.
+
+        Raises:
+            ValueError: If the value is not valid base64 data.
+        """
+        if self.done:
+            return
+        if not self._found:
+            self._buffer += data
+            match = self._regex_key.search(self._buffer)
+            if not match:
+                self._buffer = self._buffer[-self.KEY_WINDOW:]
+                return
+            data = self._buffer[match.end():]
+            self._buffer = b''
+            self._found = True
+        self._decode(data)
+
+    def close(self):
+        """Finish decoding, after the last chunk of the body was fed.
+
+        Raises:
+            ValueError: If the body ended before the whole value was
+                received.
+
+        Returns:
+            int: Number of decoded bytes that were written.
+        """
+        if not self.done:
+            raise ValueError(
+                'The "%s" member is missing or incomplete.' % self.key,
+            )
+        return self.size
+
+    def _decode(self, data):
+        """Decode and write the base64 data up to the end of the string."""
+        chunks = []
+        position = 0
+        while position < len(data):
+            if self._escape:
+                char = data[position:position + 1]
+                try:
+                    chunks.append(ESCAPES[char])
+                except KeyError:
+                    raise ValueError('Unexpected escape in base64 data.')
+                self._escape = False
+                position += 1
+                continue
+            match = REGEX_SPECIAL.search(data, position)
+            if match is None:
+                chunks.append(data[position:])
+                break
+            chunks.append(data[position:match.start()])
+            if match.group() == b'"':
+                self.done = True
+                break
+            self._escape = True
+            position = match.end()
+        self._encoded += b''.join(chunks)
+        if self.done:
+            self._write(self._encoded)
+            self._encoded = b''
+            return
+        end = len(self._encoded) - len(self._encoded) % 4
+        self._write(self._encoded[:end])
+        self._encoded = self._encoded[end:]
+
+    def _write(self, encoded):
+        """Decode base64 data and write it to the destination."""
+        if not encoded:
+            return
+        decoded = base64.b64decode(encoded)
+        self.dest.write(decoded)
+        self.size += len(decoded)
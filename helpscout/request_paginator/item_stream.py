@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import codecs
+import json
+import re
+
+WHITESPACE = ' \t\n\r'
+
+# Characters changing the nesting of a value, outside and inside strings.
+STRUCTURE = re.compile(r'[][{}"]')
+STRING = re.compile(r'["\\]')
+
+
+class ItemStreamDecoder(object):
+    """This incrementally decodes a JSON object, streaming one of its arrays.
+
+    Bytes of the response body are passed to :func:`feed` as they are
+    received, which returns the elements of the ``key`` array that were
+    completed by them. Only the element being received is held in memory,
+    so the memory used is proportional to the largest element instead of to
+    the whole body. Containers and strings are scanned as they are received,
+    and only decoded once complete, so that an element that spans many
+    chunks is decoded once.
+
+    All other members of the object are decoded normally, and are available
+    in ``meta`` once the whole object has been received.
+
+    Example::
+
+        decoder = ItemStreamDecoder('items')
+        for chunk in response.iter_content(65536):
+            for item in decoder.feed(chunk):
+                print(item)
+        decoder.close()
+        print(decoder.meta['pages'])
+
+    Attributes:
+        key (str): Name of the array member to stream.
+        meta (dict): The other members of the object.
+        done (bool): ``True`` once the whole object was received.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.meta = {}
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._member = None
+        self._items = []
+        self._state = self._start
+        # Progress of the scan of the value at the position, as the offset
+        # reached, the nesting depth, and whether it is inside a string and
+        # after an escape.
+        self._scan_state = (0, 0, False, False)
+
+    def feed(self, data):
+        """Decode the next chunk of the body.
+
+        Args:
+            data (bytes): The next chunk of the response body.
+
+        Raises:
+            ValueError: If the data is not a valid JSON object.
+
+        Returns:
+            list: The elements of the ``key`` array that were completed.
+        """
+        self._buffer += self._text_decoder.decode(data)
+        return self._run()
+
+    def close(self):
+        """Finish decoding, after the last chunk of the body was fed.
+
+        Raises:
+            ValueError: If the body ended before the object was complete.
+
+        Returns:
+            list: The remaining elements of the ``key`` array.
+        """
+        self._buffer += self._text_decoder.decode(b'', final=True)
+        self._eof = True
+        items = self._run()
+        if self._state == self._start and self._next_char() is None:
+            # An empty body is treated as an empty object.
+            self.done = True
+        if not self.done:
+            raise ValueError('The JSON object is incomplete.')
+        return items
+
+    def _run(self):
+        """Advance the state machine as far as the buffer allows."""
+        while self._state():
+            pass
+        # Drop the consumed part of the buffer.
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        items, self._items = self._items, []
+        return items
+
+    def _next_char(self):
+        """Skip whitespace and return the next character, if received."""
+        while self._pos < len(self._buffer):
+            char = self._buffer[self._pos]
+            if char not in WHITESPACE:
+                return char
+            self._pos += 1
+        return None
+
+    def _expect(self, chars):
+        """Return the next character, raising if it is not one of chars."""
+        char = self._next_char()
+        if char is not None and char not in chars:
+            raise ValueError(
+                'Expecting one of "%s" at position %d, got "%s".' % (
+                    chars, self._pos, char,
+                ),
+            )
+        return char
+
+    def _decode(self):
+        """Decode the value at the current position.
+
+        Returns:
+            tuple: A boolean indicating whether the value was completely
+                received, and the value itself.
+        """
+        char = self._next_char()
+        if char is None:
+            return False, None
+        if char in '{["' and not self._scan() and not self._eof:
+            return False, None
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except ValueError:
+            if self._eof:
+                raise
+            return False, None
+        # A number at the end of the buffer could continue in the next chunk
+        if end == len(self._buffer) and not self._eof:
+            return False, None
+        self._pos = end
+        self._scan_state = (0, 0, False, False)
+        return True, value
+
+    def _scan(self):
+        """Return whether the container or string at the position is
+        complete, continuing the scan where the last chunk ended.
+        """
+        offset, depth, in_string, escape = self._scan_state
+        buffer = self._buffer
+        index = self._pos + offset
+        while index < len(buffer):
+            if escape:
+                index += 1
+                escape = False
+                continue
+            regex = STRING if in_string else STRUCTURE
+            match = regex.search(buffer, index)
+            if match is None:
+                index = len(buffer)
+                break
+            char = match.group()
+            index = match.end()
+            if char == '\\':
+                escape = True
+                continue
+            if char == '"':
+                in_string = not in_string
+            elif char in '{[':
+                depth += 1
+            else:
+                depth -= 1
+            if not in_string and depth == 0:
+                return True
+        self._scan_state = (index - self._pos, depth, in_string, escape)
+        return False
+
+    def _start(self):
+        if self._expect('{') is None:
+            return False
+        self._pos += 1
+        self._state = self._member_name
+        return True
+
+    def _member_name(self):
+        char = self._expect('"}')
+        if char is None:
+            return False
+        if char == '}':
+            return self._finish()
+        complete, self._member = self._decode()
+        if not complete:
+            return False
+        self._state = self._member_separator
+        return True
+
+    def _member_separator(self):
+        if self._expect(':') is None:
+            return False
+        self._pos += 1
+        self._state = self._member_value
+        return True
+
+    def _member_value(self):
+        char = self._next_char()
+        if char is None:
+            return False
+        if char == '[' and self._member == self.key:
+            self._pos += 1
+            self._state = self._item_first
+            return True
+        complete, value = self._decode()
+        if not complete:
+            return False
+        self.meta[self._member] = value
+        self._state = self._member_end
+        return True
+
+    def _member_end(self):
+        char = self._expect(',}')
+        if char is None:
+            return False
+        if char == '}':
+            return self._finish()
+        self._pos += 1
+        self._state = self._member_name
+        return True
+
+    def _item_first(self):
+        char = self._next_char()
+        if char is None:
+            return False
+        if char == ']':
+            self._pos += 1
+            self._state = self._member_end
+        else:
+            self._state = self._item
+        return True
+
+    def _item(self):
+        complete, value = self._decode()
+        if not complete:
+            return False
+        self._items.append(value)
+        self._state = self._item_end
+        return True
+
+    def _item_end(self):
+        char = self._expect(',]')
+        if char is None:
+            return False
+        self._pos += 1
+        self._state = self._item if char == ',' else self._member_end
+        return True
+
+    def _finish(self):
+        self._pos += 1
+        self.done = True
+        self._state = self._end
+        return True
+
+    def _end(self):
+        if self._next_char() is not None:
+            raise ValueError('Extra data after the JSON object.')
+        return False
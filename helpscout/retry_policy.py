@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import random
+import time
+
+from requests.exceptions import ChunkedEncodingError, ConnectionError, Timeout
+
+from .rate_limiter import RateLimiter, monotonic
+
+
+class RetryPolicy(object):
+    """This decides when and how long to wait before a request is retried.
+
+    Requests are retried after a transient failure, which is either a
+    connection error or one of the ``status_codes``. The wait between
+    attempts grows exponentially, with full jitter, and is never shorter than
+    a ``Retry-After`` header. If a ``deadline`` is set, each attempt times
+    out when the deadline is reached.
+
+    Only idempotent methods are retried by default. ``POST`` requests can be
+    marked as safe to retry by including them in ``methods``. A ``429``
+    response is retried whatever the method, since the request was not
+    processed.
+
+    Examples::
+
+        from helpscout import HelpScout, RetryPolicy
+
+        def report(**attempt):
+            print('%(method)s %(url)s #%(attempt)d: %(duration).3fs' % attempt)
+
+        hs = HelpScout('api_key', retry_policy=RetryPolicy(
+            max_attempts=5, deadline=120, on_attempt=report,
+        ))
+
+    Attributes:
+        max_attempts (int): Maximum number of attempts for one request.
+        backoff (float): Base wait, in seconds, which is doubled on every
+            attempt.
+        max_backoff (float): Maximum wait between two attempts, in seconds.
+        deadline (float): Maximum total time, in seconds, that a request can
+            take including all of its attempts. ``None`` for no deadline.
+        methods (set): HTTP methods that are safe to retry.
+        status_codes (set): Response status codes that are transient.
+        on_attempt (callable): Hook that is called after every attempt,
+            with the keyword arguments ``method``, ``url``, ``attempt``,
+            ``duration``, ``status_code``, ``error`` and ``delay``. ``delay``
+            is ``None`` when the request will not be retried.
+    """
+
+    METHODS = frozenset(['delete', 'get', 'put'])
+    TOO_MANY_REQUESTS = 429
+    STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+    ERRORS = (ChunkedEncodingError, ConnectionError, Timeout)
+
+    # Shortest timeout given to an attempt close to the deadline, in seconds.
+    MIN_TIMEOUT = 0.001
+
+    def __init__(self, max_attempts=5, backoff=0.5, max_backoff=30,
+                 deadline=None, methods=METHODS, status_codes=STATUS_CODES,
+                 on_attempt=None, clock=monotonic, sleep=time.sleep):
+        """Initialize a new retry policy.
+
+        Args:
+            max_attempts (int, optional): Maximum number of attempts for one
+                request.
+            backoff (float, optional): Base wait, in seconds, which is
+                doubled on every attempt.
+            max_backoff (float, optional): Maximum wait between two attempts,
+                in seconds.
+            deadline (float, optional): Maximum total time, in seconds, that
+                a request can take including all of its attempts.
+            methods (iter, optional): HTTP methods that are safe to retry.
+            status_codes (iter, optional): Response status codes that are
+                transient.
+            on_attempt (callable, optional): Hook that is called after every
+                attempt.
+            clock (callable, optional): Monotonic clock returning seconds.
+            sleep (callable, optional): Function used to wait, in seconds.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.methods = set(m.lower() for m in methods)
+        self.status_codes = set(status_codes)
+        self.on_attempt = on_attempt
+        self._clock = clock
+        self._sleep = sleep
+
+    def call(self, send, method, url, **kwargs):
+        """Send a request using ``send``, retrying transient failures.
+
+        Args:
+            send (callable): Function sending the request, with the same
+                signature as ``requests.Session.request``.
+            method (str): HTTP method of the request.
+            url (str): URL of the request.
+            **kwargs (mixed): Keyword arguments for ``send``.
+
+        Raises:
+            requests.exceptions.RequestException: The transient error of the
+                last attempt, if it did not receive a response.
+
+        Returns:
+            requests.Response: The response of the last attempt.
+        """
+        started_at = self._clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_started_at = self._clock()
+            response = error = None
+            timeout = self.get_timeout(
+                kwargs.get('timeout'), attempt_started_at - started_at,
+            )
+            if timeout is not None:
+                kwargs['timeout'] = timeout
+            try:
+                response = send(method, url, **kwargs)
+            except self.ERRORS as e:
+                error = e
+            now = self._clock()
+            status_code = retry_after = None
+            if response is not None:
+                status_code = response.status_code
+                retry_after = RateLimiter.parse_retry_after(
+                    response.headers.get(RateLimiter.HEADER_RETRY_AFTER),
+                )
+            delay = self.get_delay(
+                method, attempt, now - started_at, status_code, retry_after,
+            )
+            self.report(method, url, attempt, now - attempt_started_at,
+                        status_code, error, delay)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                # Release the connection of the discarded response.
+                response.close()
+            self._sleep(delay)
+
+    def get_delay(self, method, attempt, elapsed, status_code=None,
+                  retry_after=None):
+        """Return the wait before the next attempt, or ``None`` to give up.
+
+        Args:
+            method (str): HTTP method of the request.
+            attempt (int): Number of the attempt that just finished.
+            elapsed (float): Seconds since the first attempt started.
+            status_code (int, optional): Status code of the response. ``None``
+                if the attempt failed with a transient error.
+            retry_after (float, optional): Seconds requested by the
+                ``Retry-After`` header of the response.
+
+        Returns:
+            float: Seconds to wait before the next attempt.
+            None: If the request should not be retried.
+        """
+        if method.lower() not in self.methods and \
+                status_code != self.TOO_MANY_REQUESTS:
+            return None
+        if status_code is not None and status_code not in self.status_codes:
+            return None
+        if attempt >= self.max_attempts:
+            return None
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)),
+        )
+        delay = max(delay, retry_after or 0)
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+    def get_timeout(self, timeout, elapsed):
+        """Return the timeout of an attempt, ending by the deadline.
+
+        Args:
+            timeout (float or tuple, optional): Timeout of the request, in
+                seconds, or a tuple of its connect and read timeouts.
+            elapsed (float): Seconds since the first attempt started.
+
+        Returns:
+            float or tuple: The timeout, shortened to the time left before
+                the deadline. ``None`` if there is neither.
+        """
+        if self.deadline is None:
+            return timeout
+        remaining = max(self.deadline - elapsed, self.MIN_TIMEOUT)
+        if isinstance(timeout, tuple):
+            return tuple(
+                remaining if t is None else min(t, remaining) for t in timeout
+            )
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def report(self, method, url, attempt, duration, status_code, error,
+               delay):
+        """Call the ``on_attempt`` hook, if defined."""
+        if self.on_attempt is not None:
+            self.on_attempt(
+                method=method,
+                url=url,
+                attempt=attempt,
+                duration=duration,
+                status_code=status_code,
+                error=error,
+                delay=delay,
+            )
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+from requests import Session
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+
+
+class HelpScoutSession(Session):
+    """This is the requests session that is shared by all of the APIs.
+
+    In addition to the standard ``requests.Session`` behaviour, it carries
+    the client-wide settings that the ``RequestPaginator`` should honour for
+    every request made using it.
+
+    Attributes:
+        concurrency (int): Maximum number of pages that a paginator will
+            request at the same time.
+        rate_limiter (helpscout.rate_limiter.RateLimiter): Scheduler that
+            every request made with this session draws from, if any.
+        retry_policy (helpscout.retry_policy.RetryPolicy): Policy used to
+            retry the requests made with this session, if any.
+        http_cache (helpscout.http_cache.HttpCache): Cache used to revalidate
+            the ``GET`` requests made with this session, if any.
+        record_cache (helpscout.record_cache.RecordCache): Cache of the
+            records returned by ``get``, if any.
+        single_flight (helpscout.single_flight.SingleFlight): Coalescer of
+            the identical ``GET`` requests made with this session, if any.
+        attachment_cache (helpscout.attachment_cache.AttachmentCache):
+            Cache of the hashes of the uploaded attachments, if any.
+        lazy (bool): Whether the APIs create models that parse their values
+            on access, using
+            :func:`helpscout.base_model.BaseModel.from_api_lazy`.
+    """
+
+    concurrency = 1
+    rate_limiter = None
+    retry_policy = None
+    http_cache = None
+    record_cache = None
+    single_flight = None
+    attachment_cache = None
+    lazy = False
+
+    def __init__(self, concurrency=1, rate_limiter=None, retry_policy=None,
+                 http_cache=None, record_cache=None, single_flight=None,
+                 attachment_cache=None, lazy=False):
+        """Initialize a new session.
+
+        Args:
+            concurrency (int, optional): Maximum number of pages that a
+                paginator will request at the same time. The connection pool
+                is sized to fit this.
+            rate_limiter (helpscout.rate_limiter.RateLimiter, optional):
+                Scheduler that every request made with this session should
+                draw from.
+            retry_policy (helpscout.retry_policy.RetryPolicy, optional):
+                Policy used to retry transient failures of the requests made
+                with this session.
+            http_cache (helpscout.http_cache.HttpCache, optional): Cache used
+                to revalidate the ``GET`` requests made with this session.
+            record_cache (helpscout.record_cache.RecordCache, optional):
+                Cache of the records returned by ``get``.
+            single_flight (helpscout.single_flight.SingleFlight, optional):
+                Coalescer of the identical ``GET`` requests made with this
+                session at the same time.
+            attachment_cache (helpscout.attachment_cache.AttachmentCache,
+                optional): Cache of the hashes of the uploaded attachments.
+            lazy (bool, optional): Set this to ``True`` in order for the APIs
+                to create models that parse their values on access.
+        """
+        super(HelpScoutSession, self).__init__()
+        self.concurrency = max(concurrency, 1)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.http_cache = http_cache
+        self.record_cache = record_cache
+        self.single_flight = single_flight
+        self.attachment_cache = attachment_cache
+        self.lazy = lazy
+        pool_size = max(self.concurrency, DEFAULT_POOLSIZE)
+        for prefix in ('https://', 'http://'):
+            self.mount(prefix, HTTPAdapter(pool_maxsize=pool_size))
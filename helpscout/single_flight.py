@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import copy
+import threading
+
+
+class SingleFlight(object):
+    """This coalesces identical requests that are in flight at once.
+
+    The first thread to request a key makes the call, while any other thread
+    requesting the same key in the meantime waits for it and receives a copy
+    of the same result, or the same exception.
+
+    A ``SingleFlight`` attached to a ``HelpScoutSession`` applies to the
+    ``GET`` requests made with that session, keyed by URL and parameters.
+    Each coalesced caller receives its own copy of the decoded response.
+
+    Examples::
+
+        from helpscout import HelpScout, SingleFlight
+        hs = HelpScout('api_key', single_flight=SingleFlight())
+
+    Attributes:
+        calls (int): Number of calls that were made.
+        shared (int): Number of calls that were avoided by waiting for an
+            identical call.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def call(self, key, func, *args, **kwargs):
+        """Call the function, unless a call for the key is in flight.
+
+        Args:
+            key (hashable): Key identifying identical calls.
+            func (callable): Function to call.
+            *args (mixed): Positional arguments for ``func``.
+            **kwargs (mixed): Keyword arguments for ``func``.
+
+        Raises:
+            Exception: The exception raised by the call, if any.
+
+        Returns:
+            mixed: The result of the call.
+        """
+        with self._lock:
+            flight = self._in_flight.get(key)
+            if flight is None:
+                flight = self._in_flight[key] = _Flight()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                flight.waiters += 1
+                leader = False
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+        result = None
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            if flight.waiters and flight.error is None:
+                # Keep a pristine result for the waiters to copy, since the
+                # leader's result may be modified once it is returned.
+                flight.result = copy.deepcopy(result)
+            flight.done.set()
+        return result
+
+
+class _Flight(object):
+    """The state of a call that is in flight."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
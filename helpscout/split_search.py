@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+
+class SplitSearch(object):
+    """This is the result of a search whose domain was split.
+
+    It is iterated like the API object returned by other searches, using
+    ``for``, or ``async for`` with the asyncio client. Each record is
+    yielded once, as soon as its page is received, so the records are in
+    no particular order.
+
+    Since its records come from several searches, there is no single
+    paginator, so the methods handling pages raise a
+    ``NotImplementedError``.
+
+    Attributes:
+        domains (list of helpscout.domain.Domain): The domains that are
+            searched.
+    """
+
+    def __init__(self, domains, search):
+        """Initialize a new split search.
+
+        Args:
+            domains (list of helpscout.domain.Domain): The domains that are
+                searched.
+            search (callable): Function returning a new iterator of the
+                records found, which is called on each iteration.
+        """
+        self.domains = domains
+        self._search = search
+
+    def __iter__(self):
+        return iter(self._search())
+
+    def __aiter__(self):
+        return self._search()
+
+    @property
+    def paginator(self):
+        """The searches of the domains have no single paginator."""
+        self._raise_not_paginated('paginator')
+
+    def iterate(self, *args, **kwargs):
+        """Not implemented. Iterate the search instead."""
+        self._raise_not_paginated('iterate')
+
+    def iter_pages(self, *args, **kwargs):
+        """Not implemented. Iterate the search instead."""
+        self._raise_not_paginated('iter_pages')
+
+    def resume(self, *args, **kwargs):
+        """Not implemented. Iterate the search instead."""
+        self._raise_not_paginated('resume')
+
+    def _raise_not_paginated(self, name):
+        raise NotImplementedError(
+            'The search was split into %d domains, whose results are not '
+            'paginated, so `%s` is not available. Iterate the search '
+            'instead.' % (len(self.domains), name),
+        )
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import json
+import os
+import sqlite3
+import threading
+
+from datetime import datetime, timedelta
+
+from .domain import Domain, DomainConditionDateTime, DomainConditionInteger
+
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+# Start of the first sync, if no other start is given.
+EPOCH = datetime(1970, 1, 1)
+
+
+class WatermarkStore(object):
+    """This keeps the watermark of each sync in memory.
+
+    A watermark is the time up to which the records of a sync were
+    received, along with the keys of the records that were received within
+    the overlap before it, so that they are not yielded again.
+
+    Subclasses persist the watermarks by implementing :func:`_load` and
+    :func:`_save`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._watermarks = self._load()
+
+    def get(self, name):
+        """Return the watermark of a sync.
+
+        Args:
+            name (str): Name of the sync.
+
+        Returns:
+            tuple: The ``datetime`` of the watermark, or ``None`` if the sync
+                never completed, and a ``set`` of the keys of the records
+                received within the overlap before it.
+        """
+        with self._lock:
+            value, seen = self._watermarks.get(name, (None, []))
+        if value is not None:
+            value = datetime.strptime(value, DATETIME_FORMAT)
+        return value, set(tuple(key) for key in seen)
+
+    def set(self, name, value, seen=()):
+        """Store the watermark of a sync.
+
+        Args:
+            name (str): Name of the sync.
+            value (datetime): Time up to which the records were received.
+            seen (iter, optional): Keys of the records that were received
+                within the overlap before the watermark.
+        """
+        with self._lock:
+            self._watermarks[name] = (
+                value.strftime(DATETIME_FORMAT), sorted(seen),
+            )
+            self._save(name)
+
+    def _load(self):
+        """Return the stored watermarks, keyed by name."""
+        return {}
+
+    def _save(self, name):
+        """Persist the watermark of the sync."""
+
+
+class FileWatermarkStore(WatermarkStore):
+    """This keeps the watermarks in a JSON file.
+
+    The file is replaced atomically whenever a watermark changes.
+
+    Attributes:
+        path (str): Path of the file.
+    """
+
+    def __init__(self, path):
+        """Initialize a new store, loading the file if it exists.
+
+        Args:
+            path (str): Path of the file.
+        """
+        self.path = path
+        super(FileWatermarkStore, self).__init__()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as store:
+            return {
+                name: tuple(watermark)
+                for name, watermark in json.load(store).items()
+            }
+
+    def _save(self, name):
+        temp_path = '%s.tmp' % self.path
+        with open(temp_path, 'w') as store:
+            json.dump(self._watermarks, store, sort_keys=True)
+            store.flush()
+            os.fsync(store.fileno())
+        getattr(os, 'replace', os.rename)(temp_path, self.path)
+
+
+class SqliteWatermarkStore(WatermarkStore):
+    """This keeps the watermarks in a table of an SQLite database.
+
+    Attributes:
+        path (str): Path of the database.
+        table (str): Name of the table.
+    """
+
+    def __init__(self, path, table='helpscout_watermarks'):
+        """Initialize a new store, creating the table if needed.
+
+        Args:
+            path (str): Path of the database.
+            table (str, optional): Name of the table.
+        """
+        self.path = path
+        self.table = table
+        super(SqliteWatermarkStore, self).__init__()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS "%s" ('
+            'name TEXT PRIMARY KEY, value TEXT NOT NULL, seen TEXT NOT NULL'
+            ')' % self.table,
+        )
+        return connection
+
+    def _load(self):
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                'SELECT name, value, seen FROM "%s"' % self.table,
+            )
+            return {
+                name: (value, json.loads(seen)) for name, value, seen in rows
+            }
+        finally:
+            connection.close()
+
+    def _save(self, name):
+        value, seen = self._watermarks[name]
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO "%s" (name, value, seen) '
+                    'VALUES (?, ?, ?)' % self.table,
+                    (name, value, json.dumps(seen)),
+                )
+        finally:
+            connection.close()
+
+
+class SyncRun(object):
+    """This iterates the records of one sync, then advances its watermark.
+
+    The watermark is committed once every record was consumed, unless the
+    run was started with ``commit=False``. Then, it is only committed by
+    :func:`commit`, so that a caller that processes the records later, such
+    as concurrently, only advances it once all of them were processed.
+
+    Attributes:
+        name (str): Name of the sync.
+        watermark (datetime): Time up to which the records are searched,
+            once the iteration started.
+        done (bool): Whether every record was consumed.
+    """
+
+    def __init__(self, engine, name, api, queries, since, commit=True):
+        """Initialize a new run. Nothing is searched until it is iterated.
+
+        Args:
+            engine (SyncEngine): The engine running the sync.
+            name (str): Name of the sync.
+            api (helpscout.BaseApi): API to search.
+            queries (list): Domain conditions that the records must match.
+            since (datetime): Time from which to start the first sync.
+            commit (bool, optional): Commit the watermark once every record
+                was consumed.
+        """
+        self.name = name
+        self.watermark = None
+        self.done = False
+        self._engine = engine
+        self._keys = set()
+        self._auto_commit = commit
+        self._records = self._iter(api, queries, since)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._records)
+
+    next = __next__
+
+    def commit(self):
+        """Store the watermark of the sync.
+
+        Raises:
+            ValueError: If some records were not consumed yet.
+        """
+        if not self.done:
+            raise ValueError('The records of the sync were not all consumed.')
+        overlap_start = self.watermark - self._engine.overlap
+        self._engine.store.set(self.name, self.watermark, [
+            key for key in self._keys
+            if key[1] >= overlap_start.strftime(DATETIME_FORMAT)
+        ])
+
+    def _iter(self, api, queries, since):
+        """Search the records modified since the watermark."""
+        watermark, seen = self._engine.store.get(self.name)
+        if watermark is None:
+            start = since or EPOCH
+        else:
+            start = watermark - self._engine.overlap
+        self.watermark = self._engine._clock()
+        domain = Domain([
+            DomainConditionDateTime('modified_at', start, self.watermark),
+        ] + queries)
+        self._keys = seen
+        received = set()
+        for record in api.search(domain):
+            key = self._engine._get_key(record)
+            if key in received or key in seen:
+                continue
+            received.add(key)
+            yield record
+        self._keys = received | seen
+        self.done = True
+        if self._auto_commit:
+            self.commit()
+
+
+class SyncEngine(object):
+    """This yields the records that changed since the last sync.
+
+    Each sync searches for the records modified between its watermark and
+    the current time, then moves the watermark forward once all of them
+    were consumed, or once the caller commits it. A sync that is interrupted
+    yields the same records again on the next run.
+
+    The search starts ``overlap`` before the watermark, in order to receive
+    the records whose modification time was behind because of clock skew,
+    or that were indexed late. The records that were already yielded within
+    the overlap are skipped, as are duplicates within one sync, so that a
+    record is only yielded again if it was modified again.
+
+    Examples::
+
+        from helpscout import HelpScout, SqliteWatermarkStore, SyncEngine
+        hs = HelpScout('api_key')
+        sync = SyncEngine(hs, SqliteWatermarkStore('sync.db'))
+        for conversation in sync.conversations(mailbox):
+            print(conversation.id)
+        # Only advance the watermark once the records were saved
+        run = sync.customers(commit=False)
+        save(list(run))
+        run.commit()
+
+    Attributes:
+        helpscout (helpscout.HelpScout): The client used to search.
+        store (WatermarkStore): Store of the watermarks.
+        overlap (timedelta): Time before the watermark that is searched
+            again.
+    """
+
+    def __init__(self, helpscout, store, overlap=300,
+                 clock=datetime.utcnow):
+        """Initialize a new sync engine.
+
+        Args:
+            helpscout (helpscout.HelpScout): The client used to search.
+            store (WatermarkStore): Store of the watermarks.
+            overlap (float or timedelta, optional): Number of seconds before
+                the watermark that are searched again.
+            clock (callable, optional): Function returning the current UTC
+                time, as a naive ``datetime``.
+        """
+        if not isinstance(overlap, timedelta):
+            overlap = timedelta(seconds=overlap)
+        self.helpscout = helpscout
+        self.store = store
+        self.overlap = overlap
+        self._clock = clock
+
+    def conversations(self, mailbox=None, since=None, commit=True):
+        """Yield the conversations that changed since the last sync.
+
+        Each mailbox has its own watermark.
+
+        Args:
+            mailbox (helpscout.models.Mailbox or int, optional): Mailbox, or
+                its ID, to sync. All of the mailboxes are synced in one by
+                default.
+            since (datetime, optional): Time from which to start the first
+                sync. Defaults to the start of the epoch.
+            commit (bool, optional): Advance the watermark once every
+                conversation was consumed. Otherwise, it is only advanced by
+                :func:`SyncRun.commit`.
+
+        Returns:
+            SyncRun: An iterator of the changed conversations, as
+                :class:`helpscout.models.SearchConversation`.
+        """
+        name = 'conversations'
+        queries = []
+        if mailbox is not None:
+            mailbox_id = getattr(mailbox, 'id', mailbox)
+            name = '%s:%d' % (name, mailbox_id)
+            queries.append(DomainConditionInteger('mailboxid', mailbox_id))
+        return SyncRun(
+            self, name, self.helpscout.Conversations, queries, since, commit,
+        )
+
+    def customers(self, since=None, commit=True):
+        """Yield the customers that changed since the last sync.
+
+        Args:
+            since (datetime, optional): Time from which to start the first
+                sync. Defaults to the start of the epoch.
+            commit (bool, optional): Advance the watermark once every
+                customer was consumed. Otherwise, it is only advanced by
+                :func:`SyncRun.commit`.
+
+        Returns:
+            SyncRun: An iterator of the changed customers, as
+                :class:`helpscout.models.SearchCustomer`.
+        """
+        return SyncRun(
+            self, 'customers', self.helpscout.Customers, [], since, commit,
+        )
+
+    @staticmethod
+    def _get_key(record):
+        """Return the key identifying a version of the record."""
+        modified_at = record.modified_at or EPOCH
+        return record.id, modified_at.strftime(DATETIME_FORMAT)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import json
+import threading
+
+from collections import namedtuple
+
+from six import binary_type, text_type
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import parse_qsl, urlparse
+
+
+StubRequest = namedtuple(
+    'StubRequest', ['method', 'path', 'params', 'headers', 'body'],
+)
+
+
+class StubHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class StubServer(object):
+    """Local HTTP server that emulates the HelpScout API in tests.
+
+    The ``handler`` is called with a ``StubRequest`` for every request that
+    is received, and should return a tuple of ``(status, body)`` or
+    ``(status, body, headers)``. A ``dict`` or ``list`` body is JSON encoded.
+
+    Example::
+
+        def handler(request):
+            return 200, {'item': {'id': 1}}
+
+        with StubServer(handler) as server:
+            RequestPaginator(server.url('/customers/1.json')).call()
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = StubHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.01},
+        )
+        self._thread.daemon = True
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def url(self, path=''):
+        """Return the absolute URL for the path on this server."""
+        return 'http://127.0.0.1:%d%s' % (self._server.server_port, path)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else None
+                if body:
+                    body = json.loads(body.decode('utf-8'))
+                request = StubRequest(
+                    self.command,
+                    url.path,
+                    dict(parse_qsl(url.query)),
+                    dict(self.headers.items()),
+                    body,
+                )
+                with stub._lock:
+                    stub.requests.append(request)
+                response = stub.handler(request)
+                status, body = response[:2]
+                headers = response[2] if len(response) > 2 else {}
+                if isinstance(body, (dict, list)):
+                    body = json.dumps(body)
+                if isinstance(body, text_type):
+                    body = body.encode('utf-8')
+                if body is None:
+                    body = binary_type()
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+        return Handler
+
+
+def paginated(items, page_size=2):
+    """Return a stub handler that serves ``items`` in HelpScout pages."""
+    pages = max((len(items) + page_size - 1) // page_size, 1)
+
+    def handler(request):
+        page = int(request.params.get('page', 1))
+        start = (page - 1) * page_size
+        return 200, {
+            'page': page,
+            'pages': pages,
+            'count': len(items),
+            'items': items[start:start + page_size],
+        }
+
+    return handler
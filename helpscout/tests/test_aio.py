@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import asyncio
+import io
+import mock
+import unittest
+
+from datetime import datetime
+
+try:
+    import aiohttp
+    from ..aio import AsyncBaseApi, AsyncHelpScout
+    from ..aio.request_paginator import AsyncRequestPaginator
+    from ..aio.session import AsyncHelpScoutSession
+except ImportError:
+    AsyncHelpScout = None
+
+from .. import BaseApi
+from ..base64_body import Base64JsonBody
+from ..exceptions import HelpScoutRemoteException
+from ..http_cache import HttpCache
+from ..models.attachment import Attachment
+from ..models.customer import Customer
+from ..request_paginator import Page
+from ..retry_policy import RetryPolicy
+from ..split_search import SplitSearch
+
+from .stub_server import StubServer, paginated
+from .test_http_cache import conditional, evict_after_get_headers
+
+
+@unittest.skipIf(AsyncHelpScout is None, 'aiohttp is not installed')
+class TestAsyncHelpScout(unittest.TestCase):
+
+    API_KEY = 'test key'
+
+    def run_client(self, handler, coroutine, **kwargs):
+        """Run the coroutine with a client pointed at a stub server."""
+        async def run(server):
+            async with AsyncHelpScout(self.API_KEY, **kwargs) as hs:
+                return await coroutine(hs)
+
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                res = asyncio.run(run(server))
+        return server, res
+
+    def test_load_apis(self):
+        """It should mirror the APIs of the synchronous client."""
+        hs = AsyncHelpScout(self.API_KEY)
+        api = hs.Customers.proxy_class
+        self.assertTrue(issubclass(api, AsyncBaseApi))
+        self.assertEqual(api.__endpoint__, 'customers')
+        self.assertIs(hs.Customers.session, hs.session)
+
+    def test_list(self):
+        """It should iterate all of the pages using async for."""
+        items = [{'id': i, 'firstName': 'Test'} for i in range(5)]
+
+        async def coroutine(hs):
+            return [c async for c in hs.Customers.list()]
+
+        server, res = self.run_client(paginated(items), coroutine)
+        self.assertEqual([c.id for c in res], list(range(5)))
+        self.assertIsInstance(res[0], Customer)
+        self.assertEqual(server.requests[0].path, '/customers.json')
+        self.assertTrue(
+            server.requests[0].headers['Authorization'].startswith('Basic'),
+        )
+
+    def test_list_concurrent(self):
+        """It should request the remaining pages concurrently."""
+        items = [{'id': i} for i in range(11)]
+
+        async def coroutine(hs):
+            pages = hs.Customers.list().iter_pages(concurrency=3)
+            return [p async for p in pages]
+
+        _, res = self.run_client(paginated(items), coroutine)
+        self.assertIsInstance(res[0], Page)
+        self.assertEqual([p.number for p in res], [1, 2, 3, 4, 5, 6])
+        self.assertEqual([c.id for p in res for c in p], list(range(11)))
+
+    def test_get(self):
+        """It should return an awaitable record."""
+        async def coroutine(hs):
+            return await hs.Customers.get(1234)
+
+        server, res = self.run_client(
+            lambda r: (200, {'item': {'id': 1234}}), coroutine,
+        )
+        self.assertIsInstance(res, Customer)
+        self.assertEqual(res.id, 1234)
+        self.assertEqual(server.requests[0].path, '/customers/1234.json')
+
+    def test_get_not_found(self):
+        """It should return None if the record does not exist."""
+        async def coroutine(hs):
+            return await hs.Customers.get(1234)
+
+        _, res = self.run_client(
+            lambda r: (404, {'error': 'Not Found'}), coroutine,
+        )
+        self.assertIsNone(res)
+
+    def test_error(self):
+        """It should raise remote errors when awaited."""
+        async def coroutine(hs):
+            return await hs.Users.get_me()
+
+        with self.assertRaises(HelpScoutRemoteException):
+            self.run_client(lambda r: (500, {'error': 'Oops'}), coroutine)
+
+    def test_retry(self):
+        """It should retry transient failures per the retry policy."""
+        responses = [(503, {'error': 'Busy'}), (200, {'item': {'id': 1}})]
+
+        async def coroutine(hs):
+            return await hs.Users.get_me()
+
+        server, res = self.run_client(
+            lambda r: responses.pop(0), coroutine,
+            retry_policy=RetryPolicy(backoff=0.01),
+        )
+        self.assertEqual(res.id, 1)
+        self.assertEqual(len(server.requests), 2)
+
+    def test_update(self):
+        """It should send the update and return the reloaded record."""
+        async def coroutine(hs):
+            return await hs.Customers.update(Customer(id=1, first_name='A'))
+
+        server, res = self.run_client(
+            lambda r: (200, {'item': {'id': 1, 'firstName': 'A'}}),
+            coroutine,
+        )
+        self.assertEqual(res.first_name, 'A')
+        self.assertEqual(server.requests[0].method, 'PUT')
+        self.assertEqual(server.requests[0].body['firstName'], 'A')
+        self.assertTrue(server.requests[0].body['reload'])
+
+    def test_create_no_reload(self):
+        """It should return the ID from the location without reloading."""
+        async def coroutine(hs):
+            return await hs.Customers.create(
+                Customer(first_name='A'), reload=False,
+            )
+
+        server, res = self.run_client(
+            lambda r: (201, '', {'Location': '/v1/customers/7.json'}),
+            coroutine,
+        )
+        self.assertEqual(res, 7)
+        self.assertIs(server.requests[0].body['reload'], False)
+
+    def test_create_attachment(self):
+        """It should stream the attachment content."""
+        async def coroutine(hs):
+            return await hs.Conversations.create_attachment(
+                Attachment(file_name='a.bin'), source=b'\x00\xff',
+            )
+
+        server, res = self.run_client(
+            lambda r: (201, {'item': {'hash': 'abc'}}), coroutine,
+        )
+        self.assertEqual(res.hash, 'abc')
+        self.assertEqual(server.requests[0].body['data'], 'AP8=')
+        self.assertEqual(server.requests[0].body['fileName'], 'a.bin')
+
+    def test_create_attachment_error(self):
+        """It should close the body if the upload fails."""
+        async def coroutine(hs):
+            return await hs.Conversations.create_attachment(
+                Attachment(file_name='a.bin'), source=b'\x00\xff',
+            )
+
+        error = HelpScoutRemoteException(500, 'Error')
+        with mock.patch.object(Base64JsonBody, 'close', autospec=True,
+                               side_effect=Base64JsonBody.close) as close:
+            with mock.patch.object(AsyncRequestPaginator, 'upload',
+                                   side_effect=error):
+                with self.assertRaises(HelpScoutRemoteException):
+                    self.run_client(lambda r: (200, {}), coroutine)
+        self.assertTrue(close.call_args[0][0].closed)
+
+    def test_download_attachment(self):
+        """It should decode the attachment data as it is received."""
+        dest = io.BytesIO()
+
+        async def coroutine(hs):
+            return await hs.Conversations.download_attachment(1, dest)
+
+        _, res = self.run_client(
+            lambda r: (200, {'item': {'data': 'AP8='}}), coroutine,
+        )
+        self.assertEqual(dest.getvalue(), b'\x00\xff')
+        self.assertEqual(res, 2)
+
+    def test_download_retry(self):
+        """It should not retry a download once data was consumed."""
+        calls = []
+
+        async def request(session, method, url, consumer=None, **kwargs):
+            calls.append(url)
+            if len(calls) > 1:
+                consumer(b'{"item": {"data": "AP8="}}')
+                raise aiohttp.ClientConnectionError()
+            raise aiohttp.ClientConnectionError()
+
+        async def coroutine(hs):
+            return await hs.Conversations.download_attachment(1, dest)
+
+        dest = io.BytesIO()
+        with mock.patch.object(AsyncHelpScoutSession, 'request', request):
+            with self.assertRaises(aiohttp.ClientConnectionError):
+                self.run_client(
+                    lambda r: (200, {}), coroutine,
+                    retry_policy=RetryPolicy(backoff=0.01),
+                )
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(dest.getvalue(), b'\x00\xff')
+
+    def test_http_cache(self):
+        """It should serve an unmodified response from the cache."""
+        http_cache = HttpCache()
+
+        async def coroutine(hs):
+            first = await hs.Customers.get(1234)
+            second = await hs.Customers.get(1234)
+            return first, second
+
+        server, res = self.run_client(
+            conditional({'item': {'id': 1234}}), coroutine,
+            http_cache=http_cache,
+        )
+        self.assertEqual([r.id for r in res], [1234, 1234])
+        self.assertEqual(server.requests[1].headers['If-None-Match'], '"v1"')
+        self.assertEqual(http_cache.hits, 1)
+
+    def test_http_cache_evicted(self):
+        """It should request the body again if the entry was evicted."""
+        http_cache = HttpCache()
+
+        async def coroutine(hs):
+            await hs.Customers.get(1234)
+            evict_after_get_headers(http_cache)
+            return await hs.Customers.get(1234)
+
+        server, res = self.run_client(
+            conditional({'item': {'id': 1234}}), coroutine,
+            http_cache=http_cache,
+        )
+        self.assertEqual(res.id, 1234)
+        self.assertEqual(len(server.requests), 3)
+        self.assertNotIn('If-None-Match', server.requests[2].headers)
+
+    def test_get_many(self):
+        """It should yield the records as they are received."""
+        def handler(request):
+            if request.path == '/customers/2.json':
+                return 404, {'error': 'Not Found'}
+            if request.path == '/customers/3.json':
+                return 400, {'error': 'Bad Request'}
+            return 200, {'item': {'id': 1}}
+
+        async def coroutine(hs):
+            records = hs.Customers.get_many([1, 2, 3], concurrency=2)
+            return {i: r async for i, r in records}
+
+        _, res = self.run_client(handler, coroutine)
+        self.assertIsInstance(res[1], Customer)
+        self.assertIs(res[2], None)
+        self.assertIsInstance(res[3], HelpScoutRemoteException)
+
+    def test_search_sharded(self):
+        """It should search the windows as tasks, deduplicating records."""
+        items = [{'id': i} for i in range(5)]
+
+        async def coroutine(hs):
+            records = hs.Customers.search_sharded(
+                [('modified_at', datetime(2017, 1, 1), datetime(2017, 1, 2))],
+            )
+            return [r.id async for r in records]
+
+        server, res = self.run_client(
+            paginated(items), coroutine, concurrency=2,
+        )
+        self.assertEqual(sorted(res), [0, 1, 2, 3, 4])
+        self.assertEqual(len(server.requests), 6)
+
+    def test_search_chunked(self):
+        """It should search the pages of a long domain as tasks."""
+        async def coroutine(hs):
+            records = hs.Customers.search(
+                ['OR'] + [('number', n) for n in range(10)],
+            )
+            self.assertIsInstance(records, SplitSearch)
+            return [r.id async for r in records]
+
+        with mock.patch.object(BaseApi, 'MAX_QUERY_LENGTH', 40):
+            server, res = self.run_client(
+                paginated([{'id': 1}, {'id': 2}], page_size=1), coroutine,
+                concurrency=2,
+            )
+        self.assertEqual(sorted(res), [1, 2])
+        self.assertEqual(len(server.requests), 8)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+from .. import AttachmentCache
+from .. import BaseApi
+from .. import HelpScout
+from ..models.attachment import Attachment
+
+from .stub_server import StubServer
+
+
+class TestAttachmentCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestAttachmentCache, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'test.cache')
+
+    def tearDown(self):
+        super(TestAttachmentCache, self).tearDown()
+        shutil.rmtree(self.tempdir)
+
+    def test_get_key(self):
+        """It should only match attachments with the same name and type."""
+        key = AttachmentCache.get_key('digest', 'a.pdf', 'application/pdf')
+        self.assertEqual(
+            key, AttachmentCache.get_key('digest', 'a.pdf', 'application/pdf'),
+        )
+        self.assertNotEqual(key, AttachmentCache.get_key('digest', 'b.pdf'))
+
+    def test_get_set(self):
+        """It should return the stored hash, counting hits and misses."""
+        cache = AttachmentCache()
+        self.assertIs(cache.get('key'), None)
+        cache.set('key', 'hash')
+        self.assertEqual(cache.get('key'), 'hash')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_load(self):
+        """It should load the hashes stored by a previous run."""
+        AttachmentCache(self.path).set('key', 'hash')
+        AttachmentCache(self.path).set('other', 'hash')
+        AttachmentCache(self.path).invalidate('other')
+        cache = AttachmentCache(self.path)
+        self.assertEqual(cache.get('key'), 'hash')
+        self.assertEqual(len(cache), 1)
+
+    def test_load_incomplete_line(self):
+        """It should ignore a line that was not completely written."""
+        AttachmentCache(self.path).set('key', 'hash')
+        with open(self.path, 'a') as cache:
+            cache.write('{"key": "oth')
+        self.assertEqual(len(AttachmentCache(self.path)), 1)
+
+    def test_create_attachment(self):
+        """It should only upload identical attachments once."""
+        def handler(request):
+            return 201, {'item': {'hash': 'hash%d' % len(server.requests)}}
+
+        hs = HelpScout('key', attachment_cache=AttachmentCache(self.path))
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                res = [
+                    hs.Conversations.create_attachment(
+                        Attachment(file_name='a.txt'), source=source,
+                    ).hash
+                    for source in (b'data', b'data', b'other')
+                ]
+                attachment = Attachment(file_name='a.txt')
+                attachment.raw_data = b'data'
+                res.append(
+                    hs.Conversations.create_attachment(attachment).hash,
+                )
+        self.assertEqual(res, ['hash1', 'hash1', 'hash2', 'hash1'])
+        self.assertEqual(len(server.requests), 2)
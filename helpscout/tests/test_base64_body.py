@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import base64
+import io
+import json
+import mmap
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+from array import array
+from six import PY2
+
+from .. import BaseApi
+from .. import HelpScout
+from ..base64_body import Base64JsonBody
+from ..exceptions import HelpScoutRemoteException
+from ..models.attachment import Attachment
+from ..rate_limiter import RateLimiter
+from ..request_paginator import RequestPaginator
+
+from .stub_server import StubServer
+
+
+class Py2MemoryView(object):
+    """This is a memory view with only the methods of Python 2."""
+
+    def __init__(self, source):
+        self._view = memoryview(source)
+        self.format = self._view.format
+        self.itemsize = self._view.itemsize
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, key):
+        return Py2MemoryView(self._view[key])
+
+    def tobytes(self):
+        return self._view.tobytes()
+
+
+class TestBase64JsonBody(unittest.TestCase):
+
+    # Binary content that is not a multiple of the chunk size, nor of 3.
+    CONTENT = bytes(bytearray(range(256))) * 40 + b'\xff'
+
+    def setUp(self):
+        super(TestBase64JsonBody, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.path = os.path.join(self.tempdir, 'attachment.bin')
+        with open(self.path, 'wb') as attachment:
+            attachment.write(self.CONTENT)
+
+    def new_body(self, source):
+        body = Base64JsonBody(source, 'data', {'fileName': 'test.bin'})
+        body.CHUNK_SIZE = 300
+        self.addCleanup(body.close)
+        return body
+
+    def assertBody(self, body, data):
+        """Assert that the body is the JSON object with the content."""
+        self.assertEqual(len(data), len(body))
+        data = json.loads(data.decode('utf-8'))
+        self.assertEqual(data['fileName'], 'test.bin')
+        self.assertEqual(base64.b64decode(data['data']), self.CONTENT)
+
+    def test_bytes(self):
+        """It should encode the content of a bytes object."""
+        # A ``str`` is a path on Python 2.
+        content = bytearray(self.CONTENT) if PY2 else self.CONTENT
+        body = self.new_body(content)
+        self.assertBody(body, body.read())
+
+    def test_path(self):
+        """It should encode the content of the file at the path."""
+        body = self.new_body(self.path)
+        self.assertBody(body, body.read())
+        body.close()
+        self.assertTrue(body._source.closed)
+
+    def test_file(self):
+        """It should encode the rest of a file object."""
+        with open(self.path, 'rb') as attachment:
+            attachment.read(3)
+            body = self.new_body(attachment)
+            data = json.loads(body.read().decode('utf-8'))
+        self.assertEqual(base64.b64decode(data['data']), self.CONTENT[3:])
+
+    def test_mmap(self):
+        """It should encode the content of a memory map."""
+        with open(self.path, 'rb') as attachment:
+            content = mmap.mmap(attachment.fileno(), 0,
+                                access=mmap.ACCESS_READ)
+            body = self.new_body(content)
+            self.assertBody(body, body.read())
+            body.close()
+            content.close()
+
+    def test_mmap_position(self):
+        """It should encode a memory map from its current position."""
+        with open(self.path, 'rb') as attachment:
+            content = mmap.mmap(attachment.fileno(), 0,
+                                access=mmap.ACCESS_READ)
+            self.addCleanup(content.close)
+            content.seek(3)
+            body = self.new_body(content)
+            data = json.loads(body.read().decode('utf-8'))
+        self.assertEqual(base64.b64decode(data['data']), self.CONTENT[3:])
+        self.assertEqual(content.tell(), len(self.CONTENT))
+
+    @unittest.skipIf(PY2, 'Python 2 arrays do not support memory views.')
+    def test_buffer_items(self):
+        """It should encode the bytes of a buffer of larger items."""
+        content = array('H', self.CONTENT[:-1])
+        body = self.new_body(content)
+        data = json.loads(body.read().decode('utf-8'))
+        self.assertEqual(
+            base64.b64decode(data['data']), content.tobytes(),
+        )
+
+    @mock.patch('helpscout.base64_body.memoryview', Py2MemoryView,
+                create=True)
+    def test_buffer_py2(self):
+        """It should read buffers without the methods of Python 3 views."""
+        body = self.new_body(bytearray(self.CONTENT))
+        self.assertBody(body, body.read())
+        body.close()
+        self.assertFalse(hasattr(body._source, 'release'))
+
+    @unittest.skipIf(PY2, 'Python 2 arrays do not support memory views.')
+    @mock.patch('helpscout.base64_body.memoryview', Py2MemoryView,
+                create=True)
+    def test_buffer_items_py2(self):
+        """It should copy the bytes of larger items without casting."""
+        content = array('H', self.CONTENT[:-1])
+        body = self.new_body(content)
+        data = json.loads(body.read().decode('utf-8'))
+        self.assertEqual(
+            base64.b64decode(data['data']), content.tobytes(),
+        )
+
+    def test_read_chunks(self):
+        """It should return the same body when read in small chunks."""
+        body = self.new_body(io.BytesIO(self.CONTENT))
+        chunks = iter(lambda: body.read(7), b'')
+        self.assertBody(body, b''.join(chunks))
+
+    def test_seek(self):
+        """It should send the body again after rewinding it."""
+        body = self.new_body(io.BytesIO(self.CONTENT))
+        data = body.read()
+        body.seek(0)
+        self.assertEqual(body.read(), data)
+
+    def test_unknown_size(self):
+        """It should raise if the size of the source is unknown."""
+        read, write = os.pipe()
+        self.addCleanup(os.close, write)
+        with io.open(read, 'rb') as pipe:
+            with self.assertRaises(ValueError):
+                Base64JsonBody(pipe)
+
+    def test_create_attachment(self):
+        """It should stream the attachment, sending it again on a 429."""
+        def handler(request):
+            if not server.requests[:-1]:
+                return 429, {'error': 'Too Many Requests'}
+            self.assertEqual(
+                base64.b64decode(request.body['data']), self.CONTENT,
+            )
+            return 201, {'item': {'hash': 'abc', 'fileName': 'test.bin'}}
+
+        rate_limiter = RateLimiter(sleep=lambda seconds: None)
+        hs = HelpScout('key', rate_limiter=rate_limiter)
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                res = hs.Conversations.create_attachment(
+                    Attachment(file_name='test.bin', mime_type='text/plain'),
+                    source=self.path,
+                )
+        self.assertEqual(res.hash, 'abc')
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(server.requests[1].body['fileName'], 'test.bin')
+        self.assertEqual(server.requests[1].path, '/attachments.json')
+
+    def test_create_attachment_error(self):
+        """It should close the body if the upload fails."""
+        hs = HelpScout('key')
+        error = HelpScoutRemoteException(500, 'Error')
+        with mock.patch.object(Base64JsonBody, 'close', autospec=True,
+                               side_effect=Base64JsonBody.close) as close:
+            with mock.patch.object(RequestPaginator, 'upload',
+                                   side_effect=error):
+                with self.assertRaises(HelpScoutRemoteException):
+                    hs.Conversations.create_attachment(
+                        Attachment(file_name='test.bin'), source=self.path,
+                    )
+        self.assertTrue(close.call_args[0][0].closed)
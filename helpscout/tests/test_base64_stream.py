@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import base64
+import io
+import json
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+from .. import BaseApi
+from .. import HelpScout
+from ..exceptions import HelpScoutRemoteException
+from ..models.attachment import Attachment
+from ..models.conversation import Conversation
+from ..models.thread import Thread
+from ..request_paginator.base64_stream import Base64StreamDecoder
+
+from .stub_server import StubServer
+
+CONTENT = bytes(bytearray(range(256))) * 4 + b'\x01'
+
+
+def attachment_data(content=CONTENT):
+    """Return the body of an attachment data response."""
+    return json.dumps({'item': {
+        'id': 1,
+        'data': base64.b64encode(content).decode('ascii'),
+    }})
+
+
+class TestBase64StreamDecoder(unittest.TestCase):
+
+    def decode(self, body, chunk_size=7):
+        dest = io.BytesIO()
+        decoder = Base64StreamDecoder('data', dest)
+        for start in range(0, len(body), chunk_size):
+            decoder.feed(body[start:start + chunk_size])
+        self.assertEqual(decoder.close(), len(dest.getvalue()))
+        return dest.getvalue()
+
+    def test_decode(self):
+        """It should decode the value when received in chunks."""
+        body = attachment_data().encode('ascii')
+        for chunk_size in (1, 5, 1024):
+            self.assertEqual(self.decode(body, chunk_size), CONTENT)
+
+    def test_decode_escapes(self):
+        """It should decode escaped slashes and ignore line breaks."""
+        encoded = base64.b64encode(CONTENT).decode('ascii')
+        encoded = encoded.replace('/', '\\/')
+        encoded = '\\r\\n'.join([encoded[:10], encoded[10:]])
+        body = '{"item": {"data": "%s", "id": 1}}' % encoded
+        self.assertEqual(self.decode(body.encode('ascii')), CONTENT)
+
+    def test_missing(self):
+        """It should raise if the member was not received."""
+        with self.assertRaises(ValueError):
+            self.decode(b'{"item": {"id": 1}}')
+
+    def test_incomplete(self):
+        """It should raise if the body ends within the value."""
+        with self.assertRaises(ValueError):
+            self.decode(attachment_data().encode('ascii')[:100])
+
+    def test_invalid(self):
+        """It should raise on data that is not base64."""
+        with self.assertRaises(ValueError):
+            self.decode(b'{"data": "abc"}')
+
+
+class TestDownloadAttachment(unittest.TestCase):
+
+    def setUp(self):
+        super(TestDownloadAttachment, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.hs = HelpScout('key', concurrency=2)
+
+    def handler(self, request):
+        if request.path == '/attachments/3/data.json':
+            return 404, {'error': 'Not Found'}
+        return 200, attachment_data(request.path.encode('ascii'))
+
+    def run_stub(self, func, *args, **kwargs):
+        with StubServer(self.handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                return func(*args, **kwargs)
+
+    def test_download_attachment(self):
+        """It should write the decoded data to the file object."""
+        dest = io.BytesIO()
+        size = self.run_stub(
+            self.hs.Conversations.download_attachment, 1, dest,
+        )
+        self.assertEqual(dest.getvalue(), b'/attachments/1/data.json')
+        self.assertEqual(size, len(dest.getvalue()))
+
+    def test_download_attachment_error(self):
+        """It should not leave a file behind if the download fails."""
+        path = os.path.join(self.tempdir, 'attachment')
+        with self.assertRaises(HelpScoutRemoteException):
+            self.run_stub(
+                self.hs.Conversations.download_attachment, 3, path,
+            )
+        self.assertFalse(os.path.exists(path))
+
+    def test_download_attachments(self):
+        """It should download every attachment of the conversation."""
+        conversation = Conversation(threads=[
+            Thread(attachments=[Attachment(id=1, file_name='../a.pdf')]),
+            Thread(attachments=[Attachment(id=3, file_name='b.pdf')]),
+        ])
+        res = dict(self.run_stub(
+            lambda: list(self.hs.Conversations.download_attachments(
+                conversation, self.tempdir,
+            )),
+        ))
+        self.assertEqual(res[1], os.path.join(self.tempdir, '1-a.pdf'))
+        with open(res[1], 'rb') as downloaded:
+            self.assertEqual(downloaded.read(), b'/attachments/1/data.json')
+        self.assertIsInstance(res[3], HelpScoutRemoteException)
+        self.assertEqual(os.listdir(self.tempdir), ['1-a.pdf'])
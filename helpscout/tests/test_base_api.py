@@ -3,12 +3,26 @@
 # License MIT (https://opensource.org/licenses/MIT).
 
 import mock
+import os
+import re
+import shutil
+import tempfile
 import unittest
 
+from datetime import datetime, timedelta
+
 from .. import BaseApi
+from .. import HelpScout
 from .. import BaseModel
 from ..domain import Domain
 from ..request_paginator import RequestPaginator
+from ..exceptions import HelpScoutRemoteException
+from ..models.conversation import Conversation
+from ..models.customer import Customer
+from ..progress_log import ProgressLog
+from ..session import HelpScoutSession
+
+from .stub_server import StubServer
 
 
 PAGINATOR = 'helpscout.base_api.RequestPaginator'
@@ -82,6 +96,33 @@ class TestBaseApi(unittest.TestCase):
         for idx, value in enumerate(self.new_api()):
             self.assertEqual(value, expect[idx])
 
+    @mock.patch(PAGINATOR)
+    def test_iterate(self, paginator):
+        """It should pass concurrency options through to the paginator."""
+        res = self.new_api().iterate(concurrency=4, ordered=False)
+        paginator().iterate.assert_called_once_with(
+            concurrency=4, ordered=False, stream=None,
+        )
+        self.assertEqual(res, paginator().iterate())
+
+    @mock.patch(PAGINATOR)
+    def test_iter_pages(self, paginator):
+        """It should pass page iteration through to the paginator."""
+        res = self.new_api().iter_pages(2, 5, concurrency=3)
+        paginator().iter_pages.assert_called_once_with(
+            2, 5, concurrency=3, ordered=None,
+        )
+        self.assertEqual(res, paginator().iter_pages())
+
+    @mock.patch(PAGINATOR)
+    def test_resume(self, paginator):
+        """It should pass resuming through to the paginator."""
+        res = self.new_api().resume(4)
+        paginator().resume.assert_called_once_with(
+            4, None, concurrency=None, ordered=None,
+        )
+        self.assertEqual(res, paginator().resume())
+
     @mock.patch(PAGINATOR)
     def test_new_paginator_singleton_out_type(self, paginator):
         """It should return an object of the correct type if defined."""
@@ -89,6 +130,48 @@ class TestBaseApi(unittest.TestCase):
         res = self.new_api(singleton=True, out_type=mock.MagicMock())
         self.assertIsInstance(res, mock.MagicMock)
 
+    @mock.patch(PAGINATOR)
+    def test_new_paginator_singleton_raw(self, paginator):
+        """It should return the decoded dictionary if raw."""
+        paginator().call.return_value = [{'id': 9876, 'firstName': 'Test'}]
+        res = TestApi(self.ENDPOINT, singleton=True, raw=True)
+        self.assertEqual(res, {'id': 9876, 'firstName': 'Test'})
+
+    @mock.patch(PAGINATOR)
+    def test_new_paginator_singleton_raw_snake_case(self, paginator):
+        """It should return a dictionary with snake_case keys if asked."""
+        paginator().call.return_value = [{'id': 9876, 'firstName': 'Test'}]
+        res = TestApi(
+            self.ENDPOINT, singleton=True, raw=TestApi.RAW_SNAKE_CASE,
+        )
+        self.assertEqual(res, {'id': 9876, 'first_name': 'Test'})
+
+    def test_new_paginator_raw(self):
+        """It should create the paginator with a dict output if raw."""
+        self.assertIs(
+            TestApi(self.ENDPOINT, raw=True).paginator.output_type, dict,
+        )
+
+    @mock.patch(PAGINATOR)
+    def test_list_raw(self, paginator):
+        """It should pass raw through to the paginator output type."""
+        TestApi.list(None, self.ENDPOINT, raw=True)
+        self.assertIs(paginator.call_args[1]['output_type'], dict)
+
+    def test_new_paginator_lazy(self):
+        """It should create lazy models if asked."""
+        self.assertEqual(
+            TestApi(self.ENDPOINT, lazy=True).paginator.output_type,
+            TestApi.__object__.from_api_lazy,
+        )
+
+    def test_new_paginator_lazy_session(self):
+        """It should default to the lazy setting of the session."""
+        api = TestApi(self.ENDPOINT, session=HelpScoutSession(lazy=True))
+        self.assertEqual(
+            api.paginator.output_type, TestApi.__object__.from_api_lazy,
+        )
+
     def test_get_search_domain_domain(self):
         """It should return the input if it is a `Domain` obj."""
         expect = Domain()
@@ -108,3 +191,356 @@ class TestBaseApi(unittest.TestCase):
         res = BaseApi.new_object({'id': expect})
         self.assertIsInstance(res, BaseModel)
         self.assertEqual(res.id, expect)
+
+    def get_many(self, record_ids, **kwargs):
+        """Get the customers from a stub server that fails some IDs."""
+        def handler(request):
+            record_id = int(request.path.split('/')[-1].split('.')[0])
+            if record_id % 5 == 0:
+                return 404, {'error': 'Not Found'}
+            if record_id % 7 == 0:
+                return 400, {'error': 'Bad Request'}
+            return 200, {'item': {'id': record_id}}
+
+        hs = HelpScout('key', concurrency=4)
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                return dict(hs.Customers.get_many(record_ids, **kwargs))
+
+    def test_get_many(self):
+        """It should return every record by ID."""
+        res = self.get_many([1, 2, 3, 4])
+        self.assertEqual(sorted(res), [1, 2, 3, 4])
+        self.assertEqual([res[i].id for i in sorted(res)], [1, 2, 3, 4])
+
+    def test_get_many_not_found(self):
+        """It should return None for the records that do not exist."""
+        self.assertIs(self.get_many(range(1, 11))[5], None)
+
+    def test_get_many_error(self):
+        """It should return the errors without stopping the batch."""
+        res = self.get_many(range(1, 21), concurrency=2, raw=True)
+        self.assertEqual(len(res), 20)
+        self.assertIsInstance(res[7], HelpScoutRemoteException)
+        self.assertEqual(res[8], {'id': 8})
+
+    def test_get_many_not_implemented(self):
+        """It should raise immediately if get is not implemented."""
+        with mock.patch.object(TestApi, '__implements__', []):
+            with self.assertRaises(NotImplementedError):
+                TestApi.get_many(None, [1])
+
+    def create_many(self, records, **kwargs):
+        """Create the customers on a stub server that rejects some."""
+        def handler(request):
+            if request.body['firstName'] == 'Invalid':
+                return 400, {'error': 'Bad Request'}
+            return 200, {'item': {
+                'id': int(request.body['lastName']),
+                'firstName': request.body['firstName'],
+            }}
+
+        hs = HelpScout('key', concurrency=4)
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                res = list(hs.Customers.create_many(records, **kwargs))
+        return server, res
+
+    def test_create_many(self):
+        """It should create every record, returning failures."""
+        records = [
+            Customer(first_name='Test', last_name=str(i)) for i in range(5)
+        ]
+        records.append(Customer(first_name='Invalid', last_name='9'))
+        server, res = self.create_many(records)
+        res = dict(res)
+        self.assertEqual(len(server.requests), 6)
+        self.assertEqual(
+            sorted(res[r].id for r in records[:5]), list(range(5)),
+        )
+        self.assertIsInstance(res[records[5]], HelpScoutRemoteException)
+
+    def test_create_many_progress_log(self):
+        """It should skip the records that were created by a previous run."""
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        path = os.path.join(tempdir, 'test.progress')
+        records = [
+            Customer(first_name='Test', last_name=str(i)) for i in range(3)
+        ]
+        records.append(Customer(first_name='Invalid', last_name='9'))
+        self.create_many(records[:2], progress_log=path)
+        server, res = self.create_many(records, progress_log=path)
+        self.assertEqual(
+            sorted(r.body['lastName'] for r in server.requests), ['2', '9'],
+        )
+        log = ProgressLog(path)
+        self.assertEqual(sorted(log.done.values()), [0, 1, 2])
+
+    def update_many(self, *args, **kwargs):
+        """Update the customers on a stub server that rejects some."""
+        def handler(request):
+            if request.path == '/customers/3.json':
+                return 400, {'error': 'Bad Request'}
+            if request.body.get('reload'):
+                return 200, {'item': dict(request.body, id=1)}
+            return 200, None
+
+        hs = HelpScout('key', concurrency=2)
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                res = dict(hs.Customers.update_many(*args, **kwargs))
+        return server, res
+
+    def test_update_many_changes(self):
+        """It should send only the changes to every record."""
+        records = [
+            Customer(id=i, first_name='Test', last_name='Old')
+            for i in range(1, 4)
+        ]
+        server, res = self.update_many(records, {'last_name': 'New'})
+        self.assertEqual(res[1], None)
+        self.assertIsInstance(res[3], HelpScoutRemoteException)
+        self.assertEqual(
+            [r.body for r in server.requests],
+            [{'lastName': 'New', 'reload': False}] * 3,
+        )
+        self.assertEqual(records[0].last_name, 'New')
+
+    def test_update_many_sent(self):
+        """It should consider the changes as sent once updated."""
+        record = Customer.from_api(id=1, firstName='Test', lastName='New')
+        server, _ = self.update_many([record], {'last_name': 'New'})
+        self.assertEqual(
+            server.requests[0].body, {'lastName': 'New', 'reload': False},
+        )
+        self.assertEqual(record.get_changes(), set())
+
+    def test_update_many_pairs(self):
+        """It should apply the changes paired with each record."""
+        server, res = self.update_many([
+            (Customer(id=1), {'first_name': 'First'}),
+            (Customer(id=2), {'job_title': 'CEO'}),
+        ], reload=True)
+        self.assertEqual(res[1].first_name, 'First')
+        self.assertEqual(sorted(sorted(r.body) for r in server.requests), [
+            ['firstName', 'reload'], ['jobTitle', 'reload'],
+        ])
+
+    def test_update_many_invalid_field(self):
+        """It should return an error for a field that does not exist."""
+        _, res = self.update_many([Customer(id=1)], {'not_a_field': 1})
+        self.assertIsInstance(res[1], KeyError)
+
+    def no_reload(self, func, *args, **kwargs):
+        """Call the API on a stub server responding with a location only."""
+        def handler(request):
+            return 201, '', {'Location': server.url('/customers/7.json')}
+
+        hs = HelpScout('key')
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                res = getattr(hs.Customers, func)(*args, reload=False,
+                                                  **kwargs)
+        return server, res
+
+    def test_create_no_reload(self):
+        """It should return the ID from the location without reloading."""
+        server, res = self.no_reload('create', Customer(first_name='Test'))
+        self.assertEqual(res, 7)
+        self.assertEqual(server.requests[0].method, 'POST')
+        self.assertIs(server.requests[0].body['reload'], False)
+
+    def test_update_no_reload(self):
+        """It should return the ID of the record without reloading."""
+        server, res = self.no_reload('update', Customer(id=7))
+        self.assertEqual(res, 7)
+        self.assertEqual(server.requests[0].path, '/customers/7.json')
+        self.assertIs(server.requests[0].body['reload'], False)
+
+    def update(self, record):
+        """Update the customer on a stub server echoing the changes."""
+        def handler(request):
+            return 200, {'item': dict(request.body, id=1)}
+
+        hs = HelpScout('key')
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                res = hs.Customers.update(record)
+        return server, res
+
+    def test_update_changes(self):
+        """It should only send the changes of a record from the API."""
+        record = Customer.from_api(id=1, firstName='Test', lastName='Old')
+        record.last_name = 'New'
+        server, res = self.update(record)
+        self.assertEqual(
+            server.requests[0].body, {'lastName': 'New', 'reload': True},
+        )
+        self.assertEqual(res.last_name, 'New')
+        self.assertEqual(record.get_changes(), set())
+
+    def test_update_list_in_place(self):
+        """It should send a list that was changed in place."""
+        def handler(request):
+            return 200, {'item': dict(request.body, id=1)}
+
+        record = Conversation.from_api(id=1, subject='Test', tags=['a'])
+        record.tags.append('b')
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                HelpScout('key').Conversations.update(record)
+        self.assertEqual(
+            server.requests[0].body, {'tags': ['a', 'b'], 'reload': True},
+        )
+        self.assertEqual(record.get_changes(), set())
+
+    def test_update_no_changes(self):
+        """It should not send a request if the record did not change."""
+        record = Customer.from_api(id=1, firstName='Test')
+        server, res = self.update(record)
+        self.assertEqual(server.requests, [])
+        self.assertIs(res, record)
+
+    def test_update_not_loaded(self):
+        """It should send the whole record if it was not from the API."""
+        server, _ = self.update(Customer(id=1, first_name='Test'))
+        self.assertEqual(server.requests[0].body['firstName'], 'Test')
+        self.assertIn('lastName', server.requests[0].body)
+
+    def search_sharded(self, shard_size, **kwargs):
+        """Search a day of customers, one per hour, in pages of 5."""
+        start = datetime(2017, 1, 1)
+        records = [
+            {'id': i, 'modifiedAt': (start + timedelta(hours=i)).isoformat()}
+            for i in range(24)
+        ]
+
+        def handler(request):
+            low, high = re.search(
+                r'modifiedAt:\[(\S+)Z TO (\S+)Z\]', request.params['query'],
+            ).groups()
+            found = [r for r in records if low <= r['modifiedAt'] <= high]
+            page = int(request.params.get('page', 1))
+            return 200, {
+                'page': page,
+                'pages': -(-len(found) // 5),
+                'count': len(found),
+                'items': found[(page - 1) * 5:page * 5],
+            }
+
+        hs = HelpScout('key', concurrency=2)
+        domain = Domain([('modified_at', start, start + timedelta(days=1))])
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                res = list(hs.Customers.search_sharded(
+                    domain, shard_size=shard_size, raw=True, **kwargs
+                ))
+        return server, sorted(r['id'] for r in res)
+
+    def test_search_sharded(self):
+        """It should yield every record once from the shards."""
+        server, res = self.search_sharded(500)
+        self.assertEqual(res, list(range(24)))
+        self.assertEqual(
+            sorted(r.params['query'] for r in server.requests if
+                   'page' not in r.params),
+            ['(modifiedAt:[2017-01-01T00:00:00Z TO 2017-01-01T12:00:00Z])',
+             '(modifiedAt:[2017-01-01T12:00:00Z TO 2017-01-02T00:00:00Z])'],
+        )
+
+    def test_search_sharded_split(self):
+        """It should split the windows holding too many records."""
+        server, res = self.search_sharded(4)
+        self.assertEqual(res, list(range(24)))
+        self.assertFalse(
+            [r for r in server.requests if 'page' in r.params],
+        )
+
+    def test_search_sharded_no_datetime(self):
+        """It should raise if the domain has no date time condition."""
+        with self.assertRaises(ValueError):
+            list(HelpScout('key').Customers.search_sharded(
+                [('first_name', 'Jane')],
+            ))
+
+    def test_search_chunked(self):
+        """It should split long domains, and merge their records."""
+        def handler(request):
+            numbers = re.findall(r'number:(\d+)', request.params['query'])
+            return 200, {
+                'page': 1, 'pages': 1,
+                'items': [{'id': int(n) // 2} for n in numbers],
+            }
+
+        hs = HelpScout('key', concurrency=2)
+        domain = Domain.from_tuple(
+            ['OR'] + [('number', n) for n in range(10)],
+        )
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'MAX_QUERY_LENGTH', 40):
+                with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                    res = list(hs.Customers.search(domain))
+        self.assertEqual(sorted(r.id for r in res), [0, 1, 2, 3, 4])
+        self.assertEqual(len(server.requests), 4)
+        self.assertTrue(
+            all(len(r.params['query']) <= 40 for r in server.requests),
+        )
+
+    def test_search_chunked_pages(self):
+        """It should search the pages of the split domains separately."""
+        def handler(request):
+            query = request.params['query']
+            number = int(re.findall(r'number:(\d+)', query)[0])
+            page = int(request.params.get('page', 1))
+            return 200, {
+                'page': page, 'pages': 2,
+                'items': [{'id': number * 10 + page}],
+            }
+
+        hs = HelpScout('key', concurrency=2)
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'MAX_QUERY_LENGTH', 15):
+                with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                    res = list(hs.Customers.search(
+                        ['OR'] + [('number', n) for n in range(3)],
+                    ))
+        self.assertEqual(
+            sorted(r.id for r in res), [1, 2, 11, 12, 21, 22],
+        )
+        self.assertEqual(len(server.requests), 6)
+
+    def test_search_chunked_not_paginated(self):
+        """It should raise clearly when paginating a split search."""
+        hs = HelpScout('key')
+        with mock.patch.object(BaseApi, 'MAX_QUERY_LENGTH', 15):
+            results = hs.Customers.search(
+                ['OR'] + [('number', n) for n in range(3)],
+            )
+        self.assertEqual(len(results.domains), 3)
+        for method in ('iterate', 'iter_pages', 'resume'):
+            with self.assertRaises(NotImplementedError):
+                getattr(results, method)()
+        with self.assertRaises(NotImplementedError):
+            results.paginator
+
+    def test_split_window(self):
+        """It should split in whole seconds, not under the minimum."""
+        start = datetime(2017, 1, 1)
+        self.assertEqual(
+            BaseApi._split_window(start, start + timedelta(seconds=10), 3),
+            [(start, start + timedelta(seconds=3)),
+             (start + timedelta(seconds=3), start + timedelta(seconds=6)),
+             (start + timedelta(seconds=6), start + timedelta(seconds=9)),
+             (start + timedelta(seconds=9), start + timedelta(seconds=10))],
+        )
+        end = start + timedelta(milliseconds=500)
+        self.assertEqual(BaseApi._split_window(start, end, 4), [(start, end)])
+
+    def test_get_location_id(self):
+        """It should parse the ID at the end of the location."""
+        self.assertEqual(
+            BaseApi._get_location_id('https://a.b/v1/customers/12.json'), 12,
+        )
+        self.assertEqual(BaseApi._get_location_id(None, 3), 3)
+        self.assertEqual(BaseApi._get_location_id('/customers/x', 3), 3)
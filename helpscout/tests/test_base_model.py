@@ -2,6 +2,7 @@
 # Copyright 2017-TODAY LasLabs Inc.
 # License MIT (https://opensource.org/licenses/MIT).
 
+import mock
 import properties
 import unittest
 
@@ -174,3 +175,137 @@ class TestBaseModel(unittest.TestCase):
         ]
         self.assertEqual(self.new_record().list_string,
                          self.test_values['list_string'])
+
+    def test_to_snake_case_keys(self):
+        """It should convert the keys of nested dicts and lists."""
+        res = BaseModel.to_snake_case_keys({
+            'firstName': 'Test',
+            'subInstance': {'aKey': 1},
+            'listValues': [{'lastName': 'Again'}, 'notAKey'],
+        })
+        self.assertEqual(res, {
+            'first_name': 'Test',
+            'sub_instance': {'a_key': 1},
+            'list_values': [{'last_name': 'Again'}, 'notAKey'],
+        })
+
+    def new_lazy_record(self):
+        return TestModel.from_api_lazy(**self.test_values)
+
+    def test_from_api_lazy_unparsed(self):
+        """It should not parse the values until they are accessed."""
+        record = self.new_lazy_record()
+        self.assertEqual(record._backend.get('a_key'), None)
+        self.assertEqual(record._raw['sub_instance'], {'id': 1234})
+
+    def test_from_api_lazy_access(self):
+        """It should parse and cache a value when accessed."""
+        record = self.new_lazy_record()
+        sub_instance = record.sub_instance
+        self.assertIsInstance(sub_instance, BaseModel)
+        self.assertEqual(sub_instance.id, 1234)
+        self.assertIs(record.sub_instance, sub_instance)
+        self.assertNotIn('sub_instance', record._raw)
+
+    def test_from_api_lazy_nested(self):
+        """It should create the nested models lazily."""
+        record = self.new_lazy_record()
+        self.assertEqual(record.list[0]._raw, {'id': 4321})
+        self.assertEqual(record.list[0].id, 4321)
+
+    def test_from_api_lazy_invalid_attribute(self):
+        """It should ignore unknown attributes."""
+        self.test_values['invalidAttribute'] = 'value'
+        self.assertNotIn('invalid_attribute', self.new_lazy_record()._raw)
+
+    def test_from_api_lazy_logs_invalid_attribute(self):
+        """It should log unknown attributes like eager parsing."""
+        self.test_values['invalidAttribute'] = 'value'
+        with mock.patch('helpscout.base_model.logger') as logger:
+            self.new_lazy_record()
+        self.assertEqual(logger.debug.call_count, 1)
+        self.assertIn('invalid_attribute', logger.debug.call_args[0][0])
+
+    def test_from_api_lazy_set(self):
+        """It should not overwrite a value set before it is accessed."""
+        record = self.new_lazy_record()
+        record.a_key = 'new'
+        self.assertEqual(record.a_key, 'new')
+
+    def test_from_api_lazy_dict_lookup(self):
+        """It should parse values accessed using the dict interface."""
+        record = self.new_lazy_record()
+        self.assertEqual(record['a_key'], 'value')
+        self.assertEqual(record.get('color'), (0, 0, 255))
+
+    def test_from_api_lazy_to_api(self):
+        """It should match the API values of an eagerly created model."""
+        self.assertEqual(self.new_lazy_record().to_api(),
+                         self.new_record().to_api())
+
+    def test_from_api_lazy_serialize(self):
+        """It should serialize the values that were not accessed yet."""
+        self.assertEqual(self.new_lazy_record().serialize(),
+                         self.new_record().serialize())
+
+    def test_get_changes_not_loaded(self):
+        """It should not track changes of a model not from the API."""
+        self.assertIs(TestModel(a_key='value').get_changes(), None)
+
+    def test_get_changes_loaded(self):
+        """It should have no changes when loaded from the API."""
+        self.assertEqual(self.new_record().get_changes(), set())
+
+    def test_get_changes_set(self):
+        """It should record the properties set to different values."""
+        record = self.new_record()
+        record.a_key = 'value'
+        self.assertEqual(record.get_changes(), set())
+        record.a_key = 'new'
+        self.assertEqual(record.get_changes(), {'a_key'})
+
+    def test_get_changes_lazy(self):
+        """It should not consider parsing a lazy value as a change."""
+        record = self.new_lazy_record()
+        record.serialize()
+        self.assertEqual(record.get_changes(), set())
+
+    def test_get_changes_nested(self):
+        """It should record the properties holding changed models."""
+        record = self.new_record()
+        record.sub_instance.id = 1
+        record.list.append(BaseModel(id=1))
+        self.assertEqual(record.get_changes(), {'sub_instance', 'list'})
+
+    def test_get_changes_in_place(self):
+        """It should record the lists changed in place."""
+        record = TestModel.from_api(listString=['a', 'b'])
+        record.list_string.append('c')
+        self.assertEqual(record.get_changes(), {'list_string'})
+        record.clear_changes()
+        self.assertEqual(record.get_changes(), set())
+        strings = record.list_string
+        strings.remove('a')
+        record.list_string = strings
+        self.assertEqual(record.get_changes(), {'list_string'})
+
+    def test_get_changes_in_place_lazy(self):
+        """It should record the lazy lists changed in place."""
+        record = TestModel.from_api_lazy(listString=['a'])
+        self.assertEqual(record.get_changes(), set())
+        record.list_string.append('b')
+        self.assertEqual(record.get_changes(), {'list_string'})
+
+    def test_clear_changes(self):
+        """It should clear the changes of the model and nested models."""
+        record = self.new_record()
+        record.a_key = 'new'
+        record.sub_instance.id = 1
+        record.clear_changes()
+        self.assertEqual(record.get_changes(), set())
+
+    def test_to_api_fields(self):
+        """It should only include the given fields."""
+        self.assertEqual(
+            self.new_record().to_api(['a_key']), {'aKey': 'value'},
+        )
@@ -5,9 +5,30 @@
 import mock
 import unittest
 
-from datetime import datetime
+from datetime import datetime, timedelta, tzinfo
 
 from ..domain import Domain
+from ..models import (Conversation,
+                      Customer,
+                      Email,
+                      MailboxRef,
+                      Person,
+                      SearchConversation,
+                      SearchCustomer,
+                      )
+
+
+class Offset(tzinfo):
+    """A fixed offset from UTC, in hours."""
+
+    def __init__(self, hours):
+        self.offset = timedelta(hours=hours)
+
+    def utcoffset(self, dt):
+        return self.offset
+
+    def dst(self, dt):
+        return timedelta(0)
 
 
 class TestDomain(unittest.TestCase):
@@ -37,3 +58,149 @@ class TestDomain(unittest.TestCase):
             'OR subject:"Test2"'
             ')',
         )
+
+    def test_matches_model(self):
+        """It should evaluate the conditions against the model."""
+        record = SearchConversation(
+            id=1, status='active', subject='Refund Request', number=1234,
+            mailbox_id=5, has_attachments=True,
+            modified_at=datetime(2017, 1, 1, 12),
+        )
+        self.assertTrue(Domain.from_tuple([
+            ('status', 'active'),
+            ('subject', 'refund'),
+            ('number', 1234),
+            ('mailboxid', 5),
+            ('has_attachments', True),
+            ('modified_at', datetime(2017, 1, 1), datetime(2017, 1, 2)),
+        ]).matches(record))
+        for query in [('subject', 'Other'),
+                      ('number', 4321),
+                      ('has_attachments', False),
+                      ('modified_at', datetime(2017, 1, 2)),
+                      ('customer_email', 'jane@example.com'),
+                      ]:
+            self.assertFalse(Domain([query]).matches(record), query)
+
+    def test_matches_dict(self):
+        """It should evaluate the conditions against API dictionaries."""
+        record = {
+            'id': 1, 'tags': ['vip', 'refund'],
+            'modifiedAt': '2017-01-01T12:00:00Z',
+        }
+        self.assertTrue(Domain.from_tuple([
+            ('tags', 'vip'),
+            ('modified_at',
+             datetime(2017, 1, 1, 11), datetime(2017, 1, 1, 12)),
+        ]).matches(record))
+        domain = Domain([('modified_at', datetime(2017, 1, 1, 13))])
+        self.assertEqual(
+            str(domain), '(modifiedAt:[2017-01-01T13:00:00Z TO *])',
+        )
+        self.assertFalse(domain.matches(record))
+
+    def test_matches_aware(self):
+        """It should compare aware bounds in UTC."""
+        record = {'modifiedAt': '2017-01-01T12:00:00Z'}
+        domain = Domain([(
+            'modified_at',
+            datetime(2017, 1, 1, 13, tzinfo=Offset(2)),
+            datetime(2017, 1, 1, 14, tzinfo=Offset(2)),
+        )])
+        self.assertEqual(
+            str(domain),
+            '(modifiedAt:[2017-01-01T11:00:00Z TO 2017-01-01T12:00:00Z])',
+        )
+        self.assertTrue(domain.matches(record))
+        self.assertFalse(domain.matches({
+            'modifiedAt': '2017-01-01T12:00:01Z',
+        }))
+
+    def test_matches_whole_words(self):
+        """It should only match whole words of strings, ignoring case."""
+        record = {'status': 'inactive', 'subject': 'Refund  request #42'}
+        self.assertFalse(Domain([('status', 'active')]).matches(record))
+        self.assertTrue(Domain([('status', 'INACTIVE')]).matches(record))
+        self.assertTrue(
+            Domain([('subject', 'refund request')]).matches(record),
+        )
+        self.assertTrue(Domain([('subject', '#42')]).matches(record))
+        self.assertFalse(Domain([('subject', 'refun')]).matches(record))
+
+    def test_matches_aliases_conversation(self):
+        """It should resolve search fields to the conversation fields."""
+        record = Conversation(
+            id=1, tags=['vip', 'refund'], mailbox=MailboxRef(id=5),
+            customer=Person(
+                id=3, first_name='Jane', last_name='Doe',
+                email='jane@example.com',
+            ),
+        )
+        self.assertTrue(Domain.from_tuple([
+            ('tag', 'vip'),
+            ('mailboxid', 5),
+            ('customer_ids', 3),
+            ('email', 'jane@example.com'),
+            ('fname', 'Jane'),
+            ('lname', 'Doe'),
+        ]).matches(record))
+        for query in [('tag', 'other'),
+                      ('mailboxid', 6),
+                      ('email', 'ane@example.com'),
+                      ]:
+            self.assertFalse(Domain([query]).matches(record), query)
+
+    def test_matches_aliases_customer(self):
+        """It should resolve the email to the addresses of customers."""
+        customer = Customer(id=3, emails=[
+            Email(value='jane@example.com'), Email(value='jd@example.org'),
+        ])
+        domain = Domain([('email', 'jd@example.org')])
+        self.assertTrue(domain.matches(customer))
+        self.assertTrue(domain.matches(SearchCustomer(
+            id=3, emails=['jd@example.org'],
+        )))
+        self.assertTrue(domain.matches(
+            {'id': 3, 'emails': [{'value': 'jd@example.org'}]},
+        ))
+        self.assertFalse(Domain([('email', 'jane@example.org')]).matches(
+            customer,
+        ))
+
+    def test_matches_joins(self):
+        """It should give precedence to AND joins over OR joins."""
+        domain = Domain.from_tuple([
+            ('status', 'active'),
+            ('number', 1),
+            'OR',
+            ('number', 2),
+        ])
+        self.assertTrue(domain.matches({'status': 'active', 'number': 1}))
+        self.assertTrue(domain.matches({'status': 'closed', 'number': 2}))
+        self.assertFalse(domain.matches({'status': 'closed', 'number': 1}))
+        self.assertTrue(Domain().matches({}))
+
+    def test_split(self):
+        """It should split between the OR joins."""
+        domain = Domain.from_tuple([
+            ('number', 1),
+            'OR',
+            ('number', 2),
+            ('number', 3),
+        ])
+        self.assertEqual(domain.split(1000), [domain])
+        self.assertEqual([str(d) for d in domain.split(25)], [
+            '(number:1 OR number:2)',
+            '(number:3)',
+        ])
+        self.assertEqual(len(domain.split(1)), 3)
+
+    def test_split_and(self):
+        """It should not split a domain with an AND join."""
+        domain = Domain.from_tuple([
+            ('status', 'active'),
+            ('number', 1),
+            'OR',
+            ('number', 2),
+        ])
+        self.assertEqual(domain.split(1), [domain])
@@ -6,6 +6,7 @@ import unittest
 
 from .. import AuthProxy
 from .. import HelpScout
+from .. import RateLimiter
 from ..apis import __all__ as all_apis
 
 
@@ -21,6 +22,22 @@ class TestHelpScout(unittest.TestCase):
         """It should build a session with the proper authentication."""
         self.assertEqual(self.hs.session.auth.username, self.API_KEY)
 
+    def test_init_session_concurrency(self):
+        """It should set the concurrency on the session."""
+        hs = HelpScout(self.API_KEY, concurrency=4)
+        self.assertEqual(hs.session.concurrency, 4)
+
+    def test_init_session_rate_limiter(self):
+        """It should attach the rate limiter to the session."""
+        limiter = RateLimiter()
+        hs = HelpScout(self.API_KEY, rate_limiter=limiter)
+        self.assertIs(hs.session.rate_limiter, limiter)
+
+    def test_init_session_lazy(self):
+        """It should set the lazy setting on the session."""
+        hs = HelpScout(self.API_KEY, lazy=True)
+        self.assertTrue(hs.session.lazy)
+
     def test_load_apis(self):
         """It should load all available APIs."""
         self.assertEqual(len(self.hs.__apis__), len(all_apis))
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import unittest
+
+from requests.structures import CaseInsensitiveDict
+
+from ..http_cache import HttpCache
+from ..request_paginator import RequestPaginator
+from ..session import HelpScoutSession
+
+from .stub_server import StubServer
+
+
+def conditional(body, etag='"v1"'):
+    """Return a stub handler that honours ``If-None-Match``."""
+    def handler(request):
+        if request.headers.get('If-None-Match') == etag:
+            return 304, None, {'ETag': etag}
+        return 200, body, {'ETag': etag}
+    return handler
+
+
+def evict_after_get_headers(http_cache):
+    """Clear the cache right after its validators are read."""
+    get_headers = http_cache.get_headers
+
+    def evicting_get_headers(key):
+        headers = get_headers(key)
+        http_cache.clear()
+        return headers
+    http_cache.get_headers = evicting_get_headers
+
+
+class TestHttpCache(unittest.TestCase):
+
+    KEY = HttpCache.get_key('url', {'page': 2})
+
+    def setUp(self):
+        super(TestHttpCache, self).setUp()
+        self.cache = HttpCache(max_entries=2)
+
+    def headers(self, **kwargs):
+        return CaseInsensitiveDict(kwargs)
+
+    def test_get_key_params_order(self):
+        """It should not depend on the order of the parameters."""
+        self.assertEqual(
+            HttpCache.get_key('url', {'a': 1, 'b': 2}),
+            HttpCache.get_key('url', {'b': '2', 'a': '1'}),
+        )
+
+    def test_get_headers_empty(self):
+        """It should return no headers for an unknown request."""
+        self.assertEqual(self.cache.get_headers(self.KEY), {})
+
+    def test_get_headers(self):
+        """It should return the validators of the stored response."""
+        self.cache.update(self.KEY, 200, self.headers(**{
+            'etag': '"abc"', 'last-modified': 'date',
+        }), {'items': []})
+        self.assertEqual(self.cache.get_headers(self.KEY), {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'date',
+        })
+
+    def test_update_without_validators(self):
+        """It should not store a response without validators."""
+        self.cache.update(self.KEY, 200, self.headers(), {'items': []})
+        self.assertEqual(len(self.cache), 0)
+
+    def test_update_not_modified(self):
+        """It should return the stored body on a 304."""
+        body = {'items': [1]}
+        self.cache.update(self.KEY, 200, self.headers(ETag='"a"'), body)
+        res = self.cache.update(self.KEY, 304, self.headers(), None)
+        self.assertEqual(res, body)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_update_copies(self):
+        """It should not share the stored body with its consumers."""
+        body = {'items': [1]}
+        self.cache.update(self.KEY, 200, self.headers(ETag='"a"'), body)
+        body['items'].append(2)
+        first = self.cache.update(self.KEY, 304, self.headers(), None)
+        first['items'].append(3)
+        second = self.cache.update(self.KEY, 304, self.headers(), None)
+        self.assertEqual(second, {'items': [1]})
+
+    def test_update_not_modified_unknown(self):
+        """It should return the body on a 304 for an unknown request."""
+        self.assertIs(self.cache.update(self.KEY, 304, {}, None), None)
+
+    def test_update_evicts(self):
+        """It should evict the least recently used responses."""
+        for key in ('a', 'b', 'c'):
+            self.cache.update(key, 200, self.headers(ETag=key), key)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get_headers('a'), {})
+
+    def test_paginator_revalidates(self):
+        """It should serve an unmodified page from the cache."""
+        body = {'page': 1, 'pages': 1, 'items': [{'id': 1}]}
+        session = HelpScoutSession(http_cache=self.cache)
+        with StubServer(conditional(body)) as server:
+            paginator = RequestPaginator(server.url('/items.json'),
+                                         session=session)
+            first = list(paginator)
+            second = list(paginator)
+        self.assertEqual(first, second)
+        self.assertEqual(second, [{'id': 1}])
+        self.assertNotIn('If-None-Match', server.requests[0].headers)
+        self.assertEqual(server.requests[1].headers['If-None-Match'], '"v1"')
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_paginator_revalidates_evicted(self):
+        """It should request the body again if the entry was evicted."""
+        body = {'page': 1, 'pages': 1, 'items': [{'id': 1}]}
+        session = HelpScoutSession(http_cache=self.cache)
+        with StubServer(conditional(body)) as server:
+            paginator = RequestPaginator(server.url('/items.json'),
+                                         session=session)
+            list(paginator)
+            evict_after_get_headers(self.cache)
+            second = list(paginator)
+        self.assertEqual(second, [{'id': 1}])
+        self.assertEqual(len(server.requests), 3)
+        self.assertNotIn('If-None-Match', server.requests[2].headers)
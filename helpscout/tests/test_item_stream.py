@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import json
+import mock
+import unittest
+
+from ..request_paginator.item_stream import ItemStreamDecoder
+
+
+class TestItemStreamDecoder(unittest.TestCase):
+
+    def setUp(self):
+        super(TestItemStreamDecoder, self).setUp()
+        self.body = {
+            'page': 1,
+            'pages': 2,
+            'items': [
+                {'id': 1, 'tags': ['a', 'b'], 'score': 12.5},
+                {'id': 22, 'name': u'Ünïcode ✓', 'nested': {'items': []}},
+                {'id': 333, 'empty': None, 'flag': True},
+            ],
+            'count': 3,
+        }
+
+    def _decode(self, body, chunk_size):
+        decoder = ItemStreamDecoder('items')
+        items = []
+        for i in range(0, len(body), chunk_size):
+            items.extend(decoder.feed(body[i:i + chunk_size]))
+        items.extend(decoder.close())
+        return decoder, items
+
+    def test_decode_whole(self):
+        """It should decode the items and meta of a single chunk."""
+        decoder, items = self._decode(json.dumps(self.body).encode(), 65536)
+        self.assertEqual(items, self.body['items'])
+        self.assertEqual(decoder.meta, {'page': 1, 'pages': 2, 'count': 3})
+        self.assertTrue(decoder.done)
+
+    def test_decode_bytewise(self):
+        """It should decode the body when fed one byte at a time."""
+        body = json.dumps(self.body, indent=2, ensure_ascii=False)
+        decoder, items = self._decode(body.encode('utf-8'), 1)
+        self.assertEqual(items, self.body['items'])
+        self.assertEqual(decoder.meta['count'], 3)
+
+    def test_feed_returns_completed(self):
+        """It should return each item as soon as it is complete."""
+        decoder = ItemStreamDecoder('items')
+        self.assertEqual(decoder.feed(b'{"items": [{"id": 1}, {"id"'),
+                         [{'id': 1}])
+        self.assertEqual(decoder.feed(b': 2}'), [])
+        self.assertEqual(decoder.feed(b']}'), [{'id': 2}])
+        self.assertEqual(decoder.close(), [])
+
+    def test_number_split(self):
+        """It should not return a number before it is complete."""
+        decoder = ItemStreamDecoder('items')
+        self.assertEqual(decoder.feed(b'{"items": [12'), [])
+        self.assertEqual(decoder.feed(b'34, 5'), [1234])
+        self.assertEqual(decoder.feed(b']}'), [5])
+
+    def test_empty_items(self):
+        """It should handle an empty array."""
+        decoder, items = self._decode(b'{"items": [], "pages": 1}', 2)
+        self.assertEqual(items, [])
+        self.assertEqual(decoder.meta, {'pages': 1})
+
+    def test_single_item(self):
+        """It should keep a single item in meta."""
+        decoder, items = self._decode(b'{"item": {"id": 1}}', 4)
+        self.assertEqual(items, [])
+        self.assertEqual(decoder.meta, {'item': {'id': 1}})
+
+    def test_empty_body(self):
+        """It should treat an empty body as an empty object."""
+        decoder, items = self._decode(b'', 1)
+        self.assertEqual(items, [])
+        self.assertEqual(decoder.meta, {})
+
+    def test_incomplete(self):
+        """It should raise ValueError if the body is incomplete."""
+        decoder = ItemStreamDecoder('items')
+        decoder.feed(b'{"items": [{"id": 1}')
+        with self.assertRaises(ValueError):
+            decoder.close()
+
+    def test_invalid(self):
+        """It should raise ValueError on a non-object body."""
+        with self.assertRaises(ValueError):
+            ItemStreamDecoder('items').feed(b'[1, 2]')
+
+    def test_extra_data(self):
+        """It should raise ValueError on data after the object."""
+        with self.assertRaises(ValueError):
+            ItemStreamDecoder('items').feed(b'{} {}')
+
+    def test_strings_with_structure(self):
+        """It should not count brackets or escaped quotes within strings."""
+        item = {'body': u'a "}] \\ [{" b', 'list': [[], {}]}
+        body = json.dumps({'items': [item, item]}).encode('utf-8')
+        decoder, items = self._decode(body, 3)
+        self.assertEqual(items, [item, item])
+
+    def test_decode_once(self):
+        """It should only decode a large item once it is complete."""
+        item = {'threads': [{'body': 'x' * 100} for _ in range(50)]}
+        body = json.dumps({'items': [item]}).encode('utf-8')
+        decoder = ItemStreamDecoder('items')
+        items = []
+        with mock.patch.object(decoder, '_decoder') as json_decoder:
+            json_decoder.raw_decode.side_effect = \
+                json.JSONDecoder().raw_decode
+            for i in range(0, len(body), 10):
+                items.extend(decoder.feed(body[i:i + 10]))
+            items.extend(decoder.close())
+        self.assertEqual(items, [item])
+        # The member name, and the item.
+        self.assertEqual(json_decoder.raw_decode.call_count, 2)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..json_log import JsonLog
+
+
+class TestJsonLog(unittest.TestCase):
+
+    def setUp(self):
+        super(TestJsonLog, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.log = JsonLog(os.path.join(self.tempdir, 'test.log'))
+
+    def test_load_missing(self):
+        """It should load nothing if the file does not exist."""
+        self.assertEqual(list(self.log.load()), [])
+
+    def test_append(self):
+        """It should load the entries in the order they were appended."""
+        self.log.append({'key': 'a'})
+        self.log.append({'key': 'b'})
+        self.assertEqual(
+            list(JsonLog(self.log.path).load()), [{'key': 'a'}, {'key': 'b'}],
+        )
+
+    def test_append_fsync(self):
+        """It should flush each entry to disk."""
+        with mock.patch('helpscout.json_log.os.fsync') as fsync:
+            self.log.append({'key': 'a'})
+        fsync.assert_called_once()
+
+    def test_load_incomplete_line(self):
+        """It should skip a line that was not completely written."""
+        self.log.append({'key': 'a'})
+        with open(self.log.path, 'a') as log:
+            log.write('{"key": "b", ')
+        self.assertEqual(list(self.log.load()), [{'key': 'a'}])
+
+    def test_append_after_incomplete_line(self):
+        """It should not merge an entry into an incomplete last line."""
+        self.log.append({'key': 'a'})
+        with open(self.log.path, 'a') as log:
+            log.write('{"key": "b", "i')
+        self.log.append({'key': 'c'})
+        self.assertEqual(
+            list(self.log.load()), [{'key': 'a'}, {'key': 'c'}],
+        )
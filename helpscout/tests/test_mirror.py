@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import unittest
+
+from datetime import datetime
+
+from .. import BaseApi
+from .. import HelpScout
+from .. import SyncEngine
+from ..mirror import Mirror
+from ..sync import WatermarkStore
+from ..models import Conversation, Customer, Folder, Mailbox, User
+
+from .stub_server import StubServer
+
+
+def page(*items):
+    return 200, {'page': 1, 'pages': 1, 'items': list(items)}
+
+
+class TestMirror(unittest.TestCase):
+
+    RESPONSES = {
+        '/users.json': page({'id': 7, 'firstName': 'Agent'}),
+        '/customers.json': page(
+            {'id': 3, 'firstName': 'Jane', 'lastName': 'Doe',
+             'emails': [{'id': 1, 'value': 'jane@example.com'}]},
+            {'id': 4, 'firstName': 'John', 'lastName': 'Doe'},
+        ),
+        '/mailboxes.json': page({'id': 1, 'name': 'Support'}),
+        '/mailboxes/1/folders.json': page(
+            {'id': 10, 'name': 'Unassigned'}, {'id': 11, 'name': 'Mine'},
+        ),
+        '/mailboxes/1/conversations.json': page(
+            {'id': 100, 'subject': 'Hello'}, {'id': 101, 'subject': 'Gone'},
+        ),
+        '/conversations/100.json': (200, {'item': {
+            'id': 100, 'subject': 'Hello', 'folderId': 10,
+            'mailbox': {'id': 1}, 'customer': {'id': 3},
+            'owner': {'id': 7},
+            'threads': [{'id': 1000, 'body': 'Hi'}],
+        }}),
+        '/conversations/101.json': (404, {'error': 'Not found'}),
+    }
+
+    SYNC_RESPONSES = {
+        '/search/conversations.json': page(
+            {'id': 100, 'modifiedAt': '2017-01-01T11:00:00Z'},
+        ),
+        '/search/customers.json': page(
+            {'id': 3, 'modifiedAt': '2017-01-01T11:00:00Z'},
+            {'id': 4, 'modifiedAt': '2017-01-01T11:00:00Z'},
+        ),
+        '/customers/3.json': (200, {'item': {
+            'id': 3, 'firstName': 'Janet',
+        }}),
+        '/customers/4.json': (404, {'error': 'Not found'}),
+    }
+
+    def setUp(self):
+        super(TestMirror, self).setUp()
+        self.mirror = Mirror(':memory:')
+        self.addCleanup(self.mirror.close)
+        self.responses = dict(self.RESPONSES, **self.SYNC_RESPONSES)
+
+    def handler(self, request):
+        return self.responses[request.path]
+
+    def load(self, **kwargs):
+        with StubServer(self.handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                self.mirror.load(HelpScout('key', concurrency=2), **kwargs)
+
+    def test_load(self):
+        """It should copy the records of each API."""
+        self.load()
+        store = self.mirror.store
+        self.assertEqual(
+            [store.count(api) for api in (
+                'Users', 'Customers', 'Mailboxes', 'Folders',
+                'Conversations', 'Threads',
+            )],
+            [1, 2, 1, 2, 1, 1],
+        )
+
+    def test_load_no_threads(self):
+        """It should copy the listed conversations without getting them."""
+        self.load(threads=False)
+        self.assertEqual(self.mirror.store.count('Conversations'), 2)
+        self.assertEqual(self.mirror.store.count('Threads'), 0)
+
+    def test_get(self):
+        """It should return the conversation with its threads."""
+        self.load()
+        conversation = self.mirror.Conversations.get(100)
+        self.assertIsInstance(conversation, Conversation)
+        self.assertEqual(conversation.subject, 'Hello')
+        self.assertEqual([t.body for t in conversation.threads], ['Hi'])
+        self.assertIsNone(self.mirror.Conversations.get(101))
+
+    def test_get_raw(self):
+        """It should return the dictionary of the record if raw."""
+        self.load()
+        self.assertEqual(
+            self.mirror.Customers.get(4, raw=True),
+            {'id': 4, 'firstName': 'John', 'lastName': 'Doe'},
+        )
+
+    def test_list_folder(self):
+        """It should list the conversations of the folder of the mailbox."""
+        self.load()
+        mailbox = Mailbox(id=1)
+        self.assertEqual(
+            [c.id for c in self.mirror.Conversations.list_folder(
+                mailbox, Folder(id=10),
+            )],
+            [100],
+        )
+        self.assertEqual(
+            list(self.mirror.Conversations.list_folder(
+                mailbox, Folder(id=11),
+            )),
+            [],
+        )
+
+    def test_find_customer(self):
+        """It should find the conversations of the customer."""
+        self.load()
+        self.assertEqual(
+            [c.id for c in self.mirror.Conversations.find_customer(
+                Mailbox(id=1), Customer(id=3),
+            )],
+            [100],
+        )
+
+    def test_find_user(self):
+        """It should find the conversations owned by the user."""
+        self.load()
+        conversations = self.mirror.Conversations
+        self.assertEqual(
+            [c.id for c in conversations.find_user(Mailbox(id=1), User(id=7))],
+            [100],
+        )
+        self.assertEqual(
+            list(conversations.find_user(Mailbox(id=1), User(id=8))), [],
+        )
+
+    def test_customers_list(self):
+        """It should filter the customers like the API."""
+        self.load()
+        customers = self.mirror.Customers
+        self.assertEqual(
+            [c.id for c in customers.list(last_name='Doe')], [3, 4],
+        )
+        self.assertEqual(
+            [c.id for c in customers.list(email='jane@example.com')], [3],
+        )
+
+    def test_customers_list_email_changed(self):
+        """It should not find a customer by an email it no longer has."""
+        self.load()
+        self.mirror.save('Customers', [{
+            'id': 3, 'emails': [{'id': 2, 'value': 'jane@example.org'}],
+        }])
+        customers = self.mirror.Customers
+        self.assertEqual(list(customers.list(email='jane@example.com')), [])
+        self.assertEqual(
+            [c.id for c in customers.list(email='jane@example.org')], [3],
+        )
+        self.mirror.delete('Customers', 3)
+        self.assertEqual(self.mirror.store.count('Customers'), 1)
+        self.assertEqual(list(customers.list(email='jane@example.org')), [])
+
+    def test_select_batches(self):
+        """It should read the records in batches, in the order saved."""
+        store = self.mirror.store
+        store.BATCH_SIZE = 2
+        store.save('Users', [{'id': i} for i in range(5)])
+        records = store.select('Users')
+        self.assertEqual([next(records)['id'] for _ in range(2)], [0, 1])
+        store.delete('Users', 2)
+        store.save('Users', [{'id': 5}])
+        self.assertEqual([r['id'] for r in records], [3, 4, 5])
+
+    def test_select_updated(self):
+        """It should not yield a record again once it is updated."""
+        store = self.mirror.store
+        store.BATCH_SIZE = 2
+        store.save('Users', [{'id': i} for i in range(4)])
+        records = store.select('Users')
+        self.assertEqual([next(records)['id'] for _ in range(2)], [0, 1])
+        store.save('Users', [{'id': 1, 'firstName': 'Updated'}])
+        store.save('Users', [{'id': 0}, {'id': 3}], parent_id=1,
+                   replace_children=True)
+        self.assertEqual([r['id'] for r in records], [2, 3])
+        self.assertEqual(store.get('Users', 1)['firstName'], 'Updated')
+
+    def test_save_replace_children(self):
+        """It should delete the other records of the parent."""
+        store = self.mirror.store
+        store.save('Threads', [{'id': 1}, {'id': 2}], parent_id=10)
+        store.save('Threads', [{'id': 3}], parent_id=20)
+        store.save('Threads', [{'id': 2}], parent_id=10,
+                   replace_children=True)
+        self.assertEqual(
+            [r['id'] for r in store.select('Threads')], [2, 3],
+        )
+
+    def test_select_column(self):
+        """It should only accept the columns of the records as filters."""
+        with self.assertRaises(TypeError):
+            list(self.mirror.store.select('Conversations', subject='Hello'))
+
+    def test_select_indexed(self):
+        """It should filter the records with the indexes."""
+        connection = self.mirror.store._connection
+        for column in ('folder_id', 'customer_id', 'owner_id'):
+            plan = connection.execute(
+                'EXPLAIN QUERY PLAN SELECT data FROM records '
+                'WHERE api = ? AND parent_id = ? AND %s = ? AND rowid > ? '
+                'ORDER BY rowid' % column,
+                ('Conversations', 1, 2, 0),
+            ).fetchall()
+            self.assertIn('USING INDEX', str(plan))
+            self.assertNotIn('TEMP B-TREE', str(plan))
+
+    def test_get_folders(self):
+        """It should list the folders of the mailbox."""
+        self.load()
+        folders = list(self.mirror.Mailboxes.get_folders(1))
+        self.assertIsInstance(folders[0], Folder)
+        self.assertEqual([f.name for f in folders], ['Unassigned', 'Mine'])
+
+    def test_refresh_deleted(self):
+        """It should remove conversations that no longer exist."""
+        self.load(threads=False)
+        with StubServer(self.handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                errors = self.mirror.refresh(HelpScout('key'), [101])
+        self.assertEqual(errors, {})
+        self.assertIsNone(self.mirror.Conversations.get(101))
+
+    def sync(self):
+        engine = SyncEngine(
+            HelpScout('key'), WatermarkStore(),
+            clock=lambda: datetime(2017, 1, 1, 12),
+        )
+        with StubServer(self.handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                errors = self.mirror.sync(engine)
+        return engine, errors
+
+    def test_sync(self):
+        """It should copy the changed records, and remove deleted ones."""
+        self.load(threads=False)
+        engine, errors = self.sync()
+        self.assertEqual(errors, {'Conversations': {}, 'Customers': {}})
+        self.assertEqual(
+            [t.body for t in self.mirror.Conversations.get(100).threads],
+            ['Hi'],
+        )
+        self.assertEqual(self.mirror.Customers.get(3).first_name, 'Janet')
+        self.assertIsNone(self.mirror.Customers.get(4))
+        self.assertIsNotNone(engine.store.get('conversations')[0])
+        self.assertIsNotNone(engine.store.get('customers')[0])
+
+    def test_sync_errors(self):
+        """It should not advance the watermark of records not copied."""
+        self.responses['/customers/3.json'] = (500, {'error': 'Error'})
+        engine, errors = self.sync()
+        self.assertEqual(errors['Conversations'], {})
+        self.assertEqual(list(errors['Customers']), [3])
+        self.assertIsNotNone(engine.store.get('conversations')[0])
+        self.assertEqual(engine.store.get('customers'), (None, set()))
+
+    def test_save_models(self):
+        """It should save models in their API form."""
+        self.mirror.save('Conversations', [Conversation(
+            id=5, subject='Model', mailbox=Mailbox(id=1), threads=[],
+        )])
+        self.assertEqual(
+            [c.subject for c in self.mirror.Conversations.list(Mailbox(id=1))],
+            ['Model'],
+        )
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..models.customer import Customer
+from ..progress_log import ProgressLog
+
+
+class TestProgressLog(unittest.TestCase):
+
+    def setUp(self):
+        super(TestProgressLog, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'test.progress')
+
+    def tearDown(self):
+        super(TestProgressLog, self).tearDown()
+        shutil.rmtree(self.tempdir)
+
+    def test_add(self):
+        """It should record the key and ID as done."""
+        log = ProgressLog(self.path)
+        log.add('key', 123)
+        self.assertIn('key', log)
+        self.assertEqual(log.done, {'key': 123})
+
+    def test_load(self):
+        """It should load the records that were done in a previous run."""
+        ProgressLog(self.path).add('key', 123)
+        self.assertEqual(ProgressLog(self.path).done, {'key': 123})
+
+    def test_load_incomplete_line(self):
+        """It should ignore a line that was not completely written."""
+        ProgressLog(self.path).add('key', 123)
+        with open(self.path, 'a') as log:
+            log.write('{"key": "ot')
+        self.assertEqual(len(ProgressLog(self.path)), 1)
+
+    def test_add_after_incomplete_line(self):
+        """It should keep a record added after an incomplete line."""
+        ProgressLog(self.path).add('key', 123)
+        with open(self.path, 'a') as log:
+            log.write('{"key": "ot')
+        ProgressLog(self.path).add('other', 456)
+        progress_log = ProgressLog(self.path)
+        self.assertEqual(len(progress_log), 2)
+        self.assertIn('other', progress_log)
+
+    def test_get_key(self):
+        """It should return the same key for records with equal values."""
+        self.assertEqual(
+            ProgressLog.get_key(Customer(first_name='Test')),
+            ProgressLog.get_key(Customer(first_name='Test')),
+        )
+        self.assertNotEqual(
+            ProgressLog.get_key(Customer(first_name='Test')),
+            ProgressLog.get_key(Customer(first_name='Other')),
+        )
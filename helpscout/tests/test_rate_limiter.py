@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import threading
+import unittest
+
+from ..rate_limiter import RateLimiter
+from ..request_paginator import RequestPaginator
+from ..session import HelpScoutSession
+
+from .stub_server import StubServer
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        super(TestRateLimiter, self).setUp()
+        self.clock = FakeClock()
+
+    def new_limiter(self, rate=60, period=60, burst=None):
+        return RateLimiter(rate, period, burst,
+                           clock=self.clock, sleep=self.clock.sleep)
+
+    def test_acquire_burst(self):
+        """It should not wait while there are tokens in the bucket."""
+        limiter = self.new_limiter(burst=3)
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_acquire_waits_for_refill(self):
+        """It should wait for a token to be refilled when empty."""
+        limiter = self.new_limiter(burst=1)
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [1.0])
+
+    def test_reserve_returns_wait(self):
+        """It should return the wait time without consuming a token."""
+        limiter = self.new_limiter(rate=30, burst=1)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertEqual(limiter.reserve(), 2.0)
+
+    def test_update_limit_header(self):
+        """It should adopt the per minute limit of the account."""
+        limiter = self.new_limiter(rate=10, period=1)
+        limiter.update(200, {'X-RateLimit-Limit-Minute': '400'})
+        self.assertEqual(limiter.rate, 400)
+        self.assertEqual(limiter.period, 60)
+
+    def test_update_remaining_header(self):
+        """It should not spend more tokens than the remote has remaining."""
+        limiter = self.new_limiter(burst=10)
+        limiter.update(200, {'X-RateLimit-Remaining-Minute': '0'})
+        self.assertEqual(limiter.reserve(), 1.0)
+
+    def test_update_retry_after(self):
+        """It should pause all requests for the Retry-After duration."""
+        limiter = self.new_limiter(burst=10)
+        limiter.update(429, {'Retry-After': '5'})
+        limiter.acquire()
+        self.assertEqual(sum(self.clock.sleeps), 5.0)
+
+    def test_update_too_many_without_retry_after(self):
+        """It should wait for one token after a 429 without Retry-After."""
+        limiter = self.new_limiter(burst=10)
+        limiter.update(429, {})
+        self.assertEqual(limiter.reserve(), 1.0)
+
+    def testparse_retry_after_date(self):
+        """It should parse HTTP date values of Retry-After."""
+        self.assertEqual(
+            RateLimiter.parse_retry_after('Wed, 13 Dec 2017 23:17:15 GMT'),
+            0,
+        )
+
+    def test_threads_share_budget(self):
+        """It should hand out exactly one token per request across threads.
+        """
+        limiter = RateLimiter(rate=1, period=3600, burst=20)
+        threads = [threading.Thread(target=limiter.acquire)
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreater(limiter.reserve(), 0)
+
+    def test_paginator_retries_too_many(self):
+        """It should send the request again after a 429 response."""
+        responses = [
+            (429, {'error': 'Too Many Requests'}, {'Retry-After': '0'}),
+            (200, {'items': [{'id': 1}]}),
+        ]
+        limiter = RateLimiter()
+        with StubServer(lambda r: responses.pop(0)) as server:
+            paginator = RequestPaginator(
+                server.url('/items.json'),
+                session=HelpScoutSession(rate_limiter=limiter),
+            )
+            self.assertEqual(list(paginator), [{'id': 1}])
+        self.assertEqual(len(server.requests), 2)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import unittest
+
+from .. import BaseApi, HelpScout
+from ..exceptions import HelpScoutRemoteException
+from ..models.customer import Customer
+from ..record_cache import RecordCache
+
+from .stub_server import StubServer
+from .test_rate_limiter import FakeClock
+
+
+class TestRecordCache(unittest.TestCase):
+
+    def setUp(self):
+        super(TestRecordCache, self).setUp()
+        self.clock = FakeClock()
+        self.cache = RecordCache(
+            ttl=10, max_entries=2, apis={'Teams': {'ttl': 0}},
+            clock=self.clock,
+        )
+
+    def test_get_missing(self):
+        """It should return None and count a miss."""
+        self.assertIs(self.cache.get('Users', 1), None)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+    def test_get_hit(self):
+        """It should return the stored record and count a hit."""
+        self.cache.set('Users', 1, {'id': 1})
+        self.assertEqual(self.cache.get('Users', 1), {'id': 1})
+        self.assertEqual(self.cache.stats(), {
+            'Users': {'hits': 1, 'misses': 0, 'size': 1},
+        })
+
+    def test_get_expired(self):
+        """It should not return a record after its TTL."""
+        self.cache.set('Users', 1, {'id': 1})
+        self.clock.now += 10
+        self.assertIs(self.cache.get('Users', 1), None)
+
+    def test_get_disabled(self):
+        """It should not store the records of an API with no TTL."""
+        self.cache.set('Teams', 1, {'id': 1})
+        self.assertIs(self.cache.get('Teams', 1), None)
+
+    def test_set_evicts(self):
+        """It should evict the least recently used record of the API."""
+        for record_id in (1, 2):
+            self.cache.set('Users', record_id, {'id': record_id})
+        self.cache.set('Mailboxes', 1, {'id': 1})
+        self.cache.get('Users', 1)
+        self.cache.set('Users', 3, {'id': 3})
+        self.assertIs(self.cache.get('Users', 2), None)
+        self.assertEqual(self.cache.get('Users', 1), {'id': 1})
+        self.assertEqual(self.cache.get('Mailboxes', 1), {'id': 1})
+
+    def test_invalidate(self):
+        """It should remove a record."""
+        self.cache.set('Users', 1, {'id': 1})
+        self.cache.set('Users', 2, {'id': 2})
+        self.cache.invalidate('Users', 1)
+        self.assertIs(self.cache.get('Users', 1), None)
+        self.assertEqual(self.cache.get('Users', 2), {'id': 2})
+
+    def test_invalidate_api(self):
+        """It should remove all of the records of an API."""
+        self.cache.set('Users', 1, {'id': 1})
+        self.cache.invalidate('Users')
+        self.assertIs(self.cache.get('Users', 1), None)
+
+    def test_set_invalidated(self):
+        """It should not store a record invalidated after its request."""
+        generation = self.cache.generation()
+        self.cache.invalidate('Users', 1)
+        self.cache.set('Users', 1, {'id': 1}, generation)
+        self.cache.set('Users', 2, {'id': 2}, generation)
+        self.assertIs(self.cache.get('Users', 1), None)
+        self.assertEqual(self.cache.get('Users', 2), {'id': 2})
+        self.cache.set('Users', 1, {'id': 1}, self.cache.generation())
+        self.assertEqual(self.cache.get('Users', 1), {'id': 1})
+
+    def test_set_invalidated_api(self):
+        """It should not store a record of an API invalidated meanwhile."""
+        generation = self.cache.generation()
+        self.cache.invalidate('Users')
+        self.cache.set('Users', 1, {'id': 1}, generation)
+        self.assertIs(self.cache.get('Users', 1), None)
+
+    def test_set_invalidated_forgotten(self):
+        """It should not store a record if invalidations were forgotten."""
+        cache = RecordCache(max_entries=1)
+        generation = cache.generation()
+        cache.invalidate('Users', 1)
+        cache.invalidate('Users', 2)
+        cache.set('Users', 1, {'id': 1}, generation)
+        self.assertIs(cache.get('Users', 1), None)
+
+    def test_client_get(self):
+        """It should only request a record once, then invalidate it."""
+        def handler(request):
+            return 200, {'item': {'id': 1234, 'firstName': request.method}}
+
+        hs = HelpScout('key', record_cache=self.cache)
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                first = hs.Customers.get(1234)
+                second = hs.Customers.get(1234)
+                raw = hs.Customers.get(1234, raw=True)
+                first.first_name = 'Changed'
+                hs.Customers.update(first)
+                third = hs.Customers.get(1234)
+        self.assertIsInstance(second, Customer)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.first_name, 'GET')
+        self.assertEqual(raw, {'id': 1234, 'firstName': 'GET'})
+        self.assertEqual(third.id, 1234)
+        self.assertEqual(
+            [r.method for r in server.requests], ['GET', 'PUT', 'GET'],
+        )
+
+    def test_conversations_disabled(self):
+        """It should not cache conversations unless enabled explicitly."""
+        self.cache.set('Conversations', 1, {'id': 1})
+        self.assertIs(self.cache.get('Conversations', 1), None)
+        cache = RecordCache(apis={'Conversations': {'max_entries': 5}})
+        self.assertEqual(cache.apis['Conversations']['ttl'], 0)
+        cache = RecordCache(apis={'Conversations': {'ttl': 5}})
+        cache.set('Conversations', 1, {'id': 1})
+        self.assertEqual(cache.get('Conversations', 1), {'id': 1})
+
+    def test_client_get_endpoint_override(self):
+        """It should cache the records of each endpoint separately."""
+        def handler(request):
+            return 200, {'item': {'id': 1234, 'firstName': request.path}}
+
+        hs = HelpScout('key', record_cache=self.cache)
+        with StubServer(handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                default = hs.Customers.get(1234)
+                other = hs.Customers.get(
+                    1234, endpoint_override='/other/1234.json',
+                )
+        self.assertEqual(default.first_name, '/customers/1234.json')
+        self.assertEqual(other.first_name, '/other/1234.json')
+
+    def test_client_get_me_not_found(self):
+        """It should raise if the current user is not found."""
+        hs = HelpScout('key', record_cache=self.cache)
+        with StubServer(lambda r: (404, {'error': 'Not Found'})) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                with self.assertRaises(HelpScoutRemoteException):
+                    hs.Users.get_me()
+                self.assertIs(hs.Customers.get(1234), None)
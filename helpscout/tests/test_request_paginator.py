@@ -7,7 +7,11 @@ import unittest
 
 from contextlib import contextmanager
 
+from ..exceptions import HelpScoutRemoteException
 from ..request_paginator import RequestPaginator
+from ..session import HelpScoutSession
+
+from .stub_server import StubServer, paginated
 
 
 class TestRequestPaginator(unittest.TestCase):
@@ -143,3 +147,103 @@ class TestRequestPaginator(unittest.TestCase):
             res = list(self.paginator)
             expect = [{'page': 1}, {'page': 2}, {'page': 3}]
             self.assertEqual(res, expect)
+
+    def test_iter_requests_next_page(self):
+        """It should send the page parameter for subsequent pages."""
+        with StubServer(paginated([{'id': i} for i in range(5)])) as server:
+            paginator = RequestPaginator(server.url('/items.json'))
+            res = list(paginator)
+        self.assertEqual(res, [{'id': i} for i in range(5)])
+        self.assertEqual(
+            [r.params.get('page') for r in server.requests],
+            [None, '2', '3'],
+        )
+
+    def test_iterate_concurrent_ordered(self):
+        """It should yield rows in page order when fetching in parallel."""
+        items = [{'id': i} for i in range(21)]
+        with StubServer(paginated(items)) as server:
+            paginator = RequestPaginator(server.url('/items.json'))
+            res = list(paginator.iterate(concurrency=4))
+        self.assertEqual(res, items)
+        self.assertEqual(len(server.requests), 11)
+
+    def test_iterate_concurrent_unordered(self):
+        """It should yield every row once when order is not required."""
+        items = [{'id': i} for i in range(21)]
+        with StubServer(paginated(items)) as server:
+            paginator = RequestPaginator(server.url('/items.json'),
+                                         ordered=False)
+            res = list(paginator.iterate(concurrency=4))
+        self.assertEqual(sorted(r['id'] for r in res), list(range(21)))
+
+    def test_iter_pages_range(self):
+        """It should only request the pages within the range."""
+        items = [{'id': i} for i in range(10)]
+        with StubServer(paginated(items)) as server:
+            paginator = RequestPaginator(server.url('/items.json'))
+            pages = list(paginator.iter_pages(2, 4))
+        self.assertEqual([p.number for p in pages], [2, 3])
+        self.assertEqual(pages[0].records, items[2:4])
+        self.assertEqual(
+            [r.params.get('page') for r in server.requests], ['2', '3'],
+        )
+
+    def test_iter_pages_concurrent(self):
+        """It should yield numbered pages when fetching in parallel."""
+        items = [{'id': i} for i in range(10)]
+        with StubServer(paginated(items)) as server:
+            paginator = RequestPaginator(server.url('/items.json'))
+            pages = list(paginator.iter_pages(concurrency=3, ordered=False))
+        self.assertEqual(sorted(p.number for p in pages), [1, 2, 3, 4, 5])
+        self.assertTrue(all(p.total == 5 for p in pages))
+
+    def test_resume(self):
+        """It should continue after the checkpoint page."""
+        items = [{'id': i} for i in range(10)]
+        with StubServer(paginated(items)) as server:
+            paginator = RequestPaginator(server.url('/items.json'))
+            checkpoint = list(paginator.iter_pages(stop=3))[-1]
+            pages = list(paginator.resume(checkpoint))
+        self.assertEqual([p.number for p in pages], [3, 4, 5])
+        self.assertEqual(
+            [r for p in pages for r in p], items[4:],
+        )
+
+    def test_resume_past_end(self):
+        """It should yield nothing when resuming after the last page."""
+        items = [{'id': i} for i in range(4)]
+        with StubServer(paginated(items)) as server:
+            paginator = RequestPaginator(server.url('/items.json'))
+            self.assertEqual(list(paginator.resume(2)), [])
+
+    def test_iterate_concurrency_from_session(self):
+        """It should default to the concurrency defined on the session."""
+        paginator = RequestPaginator(
+            'endpoint', session=HelpScoutSession(concurrency=3),
+        )
+        with mock.patch.object(paginator, 'call') as call:
+            call.return_value = []
+            paginator.page_current = paginator.page_total = 2
+            with mock.patch.object(paginator, '_iter_concurrent') as conc:
+                conc.return_value = []
+                list(paginator)
+            conc.assert_called_once_with(mock.ANY, 3, True)
+
+    def test_iterate_stream(self):
+        """It should stream the rows of every page."""
+        items = [{'id': i, 'name': u'é' * i} for i in range(5)]
+        with StubServer(paginated(items)) as server:
+            paginator = RequestPaginator(server.url('/items.json'))
+            paginator.STREAM_CHUNK_SIZE = 3
+            self.assertEqual(list(paginator.iterate(stream=True)), items)
+            self.assertEqual(len(server.requests), 3)
+        self.assertEqual(paginator.page_current, 3)
+
+    def test_iterate_stream_error(self):
+        """It should raise the remote error when streaming."""
+        with StubServer(lambda r: (404, {'error': 'Not Found'})) as server:
+            paginator = RequestPaginator(server.url('/items.json'),
+                                         stream=True)
+            with self.assertRaises(HelpScoutRemoteException):
+                list(paginator)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import unittest
+
+from requests.exceptions import ConnectionError
+
+from ..exceptions import HelpScoutRemoteException
+from ..rate_limiter import RateLimiter
+from ..request_paginator import RequestPaginator
+from ..retry_policy import RetryPolicy
+from ..session import HelpScoutSession
+
+from .stub_server import StubServer
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        super(TestRetryPolicy, self).setUp()
+        self.sleeps = []
+        self.attempts = []
+
+    def new_policy(self, **kwargs):
+        kwargs.setdefault('sleep', self.sleeps.append)
+        kwargs.setdefault(
+            'on_attempt', lambda **attempt: self.attempts.append(attempt),
+        )
+        return RetryPolicy(**kwargs)
+
+    def new_response(self, status_code, headers=None):
+        response = mock.MagicMock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        return response
+
+    def test_get_delay_transient(self):
+        """It should back off exponentially within the jitter range."""
+        policy = self.new_policy(backoff=1, max_backoff=5)
+        for attempt, ceiling in [(1, 1), (2, 2), (3, 4), (4, 5)]:
+            delay = policy.get_delay('get', attempt, 0, 503)
+            self.assertTrue(0 <= delay <= ceiling)
+
+    def test_get_delay_retry_after(self):
+        """It should wait at least as long as Retry-After."""
+        policy = self.new_policy(backoff=0.1)
+        self.assertEqual(policy.get_delay('get', 1, 0, 429, 7), 7)
+
+    def test_get_delay_not_transient(self):
+        """It should not retry non-transient status codes."""
+        policy = self.new_policy()
+        self.assertIsNone(policy.get_delay('get', 1, 0, 404))
+
+    def test_get_delay_post(self):
+        """It should only retry POST requests when marked safe."""
+        self.assertIsNone(self.new_policy().get_delay('post', 1, 0, 503))
+        policy = self.new_policy(methods=RetryPolicy.METHODS | {'post'})
+        self.assertIsNotNone(policy.get_delay('post', 1, 0, 503))
+
+    def test_get_delay_post_429(self):
+        """It should retry a POST request that was not processed."""
+        self.assertIsNotNone(self.new_policy().get_delay('post', 1, 0, 429))
+        self.assertIsNone(self.new_policy().get_delay('post', 1, 0))
+
+    def test_get_delay_max_attempts(self):
+        """It should give up after the maximum number of attempts."""
+        policy = self.new_policy(max_attempts=3)
+        self.assertIsNotNone(policy.get_delay('get', 2, 0, 503))
+        self.assertIsNone(policy.get_delay('get', 3, 0, 503))
+
+    def test_get_delay_deadline(self):
+        """It should give up if the wait would exceed the deadline."""
+        policy = self.new_policy(deadline=10)
+        self.assertIsNone(policy.get_delay('get', 1, 9.9, 503, 1))
+
+    def test_get_timeout(self):
+        """It should shorten the timeout to the time left."""
+        self.assertEqual(self.new_policy().get_timeout(5, 100), 5)
+        policy = self.new_policy(deadline=10)
+        self.assertEqual(policy.get_timeout(None, 4), 6)
+        self.assertEqual(policy.get_timeout(3, 4), 3)
+        self.assertEqual(policy.get_timeout((1, None), 8), (1, 2))
+        self.assertEqual(policy.get_timeout(3, 12), RetryPolicy.MIN_TIMEOUT)
+
+    def test_call_timeout(self):
+        """It should send each attempt with the time left as timeout."""
+        send = mock.MagicMock(return_value=self.new_response(200))
+        clock = mock.MagicMock(side_effect=[0, 4, 5])
+        self.new_policy(deadline=10, clock=clock).call(
+            send, 'get', 'url', timeout=30,
+        )
+        send.assert_called_once_with('get', 'url', timeout=6)
+
+    def test_call_retries_errors(self):
+        """It should retry connection errors and return the response."""
+        expect = self.new_response(200)
+        send = mock.MagicMock(side_effect=[ConnectionError(), expect])
+        res = self.new_policy().call(send, 'get', 'url', params=None)
+        self.assertEqual(res, expect)
+        self.assertEqual(send.call_count, 2)
+        send.assert_called_with('get', 'url', params=None)
+        self.assertEqual(len(self.sleeps), 1)
+
+    def test_call_raises_last_error(self):
+        """It should raise the error if all attempts failed."""
+        send = mock.MagicMock(side_effect=ConnectionError())
+        with self.assertRaises(ConnectionError):
+            self.new_policy(max_attempts=2).call(send, 'get', 'url')
+        self.assertEqual(send.call_count, 2)
+
+    def test_call_reports_attempts(self):
+        """It should report the timing of every attempt to the hook."""
+        send = mock.MagicMock(side_effect=[
+            self.new_response(503), self.new_response(200),
+        ])
+        self.new_policy().call(send, 'get', 'url')
+        self.assertEqual([a['attempt'] for a in self.attempts], [1, 2])
+        self.assertEqual(
+            [a['status_code'] for a in self.attempts], [503, 200],
+        )
+        self.assertIsNotNone(self.attempts[0]['delay'])
+        self.assertIsNone(self.attempts[1]['delay'])
+        self.assertTrue(all(a['duration'] >= 0 for a in self.attempts))
+
+    def test_call_closes_discarded(self):
+        """It should close the responses that are retried."""
+        responses = [self.new_response(503), self.new_response(200)]
+        self.new_policy().call(
+            mock.MagicMock(side_effect=list(responses)), 'get', 'url',
+        )
+        responses[0].close.assert_called_once_with()
+        responses[1].close.assert_not_called()
+
+    def test_paginator_retries(self):
+        """It should recover from a transient failure while iterating."""
+        responses = [
+            (200, {'page': 1, 'pages': 2, 'items': [{'id': 1}]}),
+            (502, {'error': 'Bad Gateway'}),
+            (200, {'page': 2, 'pages': 2, 'items': [{'id': 2}]}),
+        ]
+        session = HelpScoutSession(retry_policy=self.new_policy())
+        with StubServer(lambda r: responses.pop(0)) as server:
+            paginator = RequestPaginator(server.url('/items.json'),
+                                         session=session)
+            self.assertEqual(list(paginator), [{'id': 1}, {'id': 2}])
+
+    def test_paginator_rate_limiter(self):
+        """It should only retry a 429 response per the retry policy."""
+        session = HelpScoutSession(
+            retry_policy=self.new_policy(max_attempts=2),
+            rate_limiter=RateLimiter(max_retries=3, sleep=lambda s: None),
+        )
+        with StubServer(lambda r: (429, {'error': 'Slow down'})) as server:
+            paginator = RequestPaginator(server.url('/items.json'),
+                                         session=session)
+            with self.assertRaises(HelpScoutRemoteException):
+                paginator.call()
+        self.assertEqual(len(server.requests), 2)
+
+    def test_paginator_post_429(self):
+        """It should retry a throttled POST with a rate limiter too."""
+        responses = [(429, {'error': 'Slow down'}), (201, {'item': {}})]
+        session = HelpScoutSession(
+            retry_policy=self.new_policy(),
+            rate_limiter=RateLimiter(sleep=lambda s: None),
+        )
+        with StubServer(lambda r: responses.pop(0)) as server:
+            paginator = RequestPaginator(server.url('/items.json'),
+                                         request_type=RequestPaginator.POST,
+                                         session=session)
+            paginator.call({})
+        self.assertEqual(len(server.requests), 2)
+
+    def test_paginator_post_not_retried(self):
+        """It should raise transient failures of POST requests."""
+        session = HelpScoutSession(retry_policy=self.new_policy())
+        with StubServer(lambda r: (503, {'error': 'Busy'})) as server:
+            paginator = RequestPaginator(server.url('/items.json'),
+                                         request_type=RequestPaginator.POST,
+                                         session=session)
+            with self.assertRaises(HelpScoutRemoteException):
+                paginator.call({})
+        self.assertEqual(len(server.requests), 1)
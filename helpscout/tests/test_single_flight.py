@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ..request_paginator import RequestPaginator
+from ..session import HelpScoutSession
+from ..single_flight import SingleFlight
+
+from .stub_server import StubServer
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSingleFlight, self).setUp()
+        self.single_flight = SingleFlight()
+        self.release = threading.Event()
+
+    def call_concurrently(self, func, count=4):
+        """Call the function for the same key from several threads."""
+        with ThreadPoolExecutor(count) as executor:
+            futures = [
+                executor.submit(self.single_flight.call, 'key', func)
+                for _ in range(count)
+            ]
+            while self.single_flight.shared < count - 1:
+                time.sleep(0.001)
+            self.release.set()
+        return futures
+
+    def test_call(self):
+        """It should return the result of the function."""
+        self.assertEqual(self.single_flight.call('key', lambda: 1), 1)
+
+    def test_call_coalesces(self):
+        """It should share one call between concurrent callers."""
+        results = []
+
+        def func():
+            self.release.wait()
+            results.append({'items': [1]})
+            return results[-1]
+
+        futures = self.call_concurrently(func)
+        self.assertEqual(len(results), 1)
+        self.assertTrue(all(f.result() == results[0] for f in futures))
+        self.assertEqual(self.single_flight.calls, 1)
+
+    def test_call_copies(self):
+        """It should give each coalesced caller its own result."""
+        def func():
+            self.release.wait()
+            return {'items': [1]}
+
+        futures = self.call_concurrently(func)
+        results = [f.result() for f in futures]
+        results[0]['items'].append(2)
+        self.assertEqual(len(set(id(r) for r in results)), len(results))
+        self.assertEqual(results[1], {'items': [1]})
+
+    def test_call_error(self):
+        """It should raise the error of the call in all of the callers."""
+        def func():
+            self.release.wait()
+            raise ValueError()
+
+        for future in self.call_concurrently(func):
+            self.assertIsInstance(future.exception(), ValueError)
+
+    def test_call_sequential(self):
+        """It should not share calls that are not in flight together."""
+        self.single_flight.call('key', lambda: 1)
+        self.single_flight.call('key', lambda: 1)
+        self.assertEqual(self.single_flight.calls, 2)
+
+    def test_paginator(self):
+        """It should coalesce identical GET requests of the paginators."""
+        def handler(request):
+            self.release.wait()
+            return 200, {'page': 1, 'pages': 1, 'items': [{'id': 1}]}
+
+        session = HelpScoutSession(single_flight=self.single_flight)
+        with StubServer(handler) as server:
+            def iterate():
+                return list(RequestPaginator(server.url('/items.json'),
+                                             session=session))
+            with ThreadPoolExecutor(3) as executor:
+                futures = [executor.submit(iterate) for _ in range(3)]
+                while self.single_flight.shared < 2:
+                    time.sleep(0.001)
+                self.release.set()
+            results = [f.result() for f in futures]
+        self.assertEqual(results, [[{'id': 1}]] * 3)
+        self.assertEqual(len(server.requests), 1)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+from datetime import datetime
+
+from .. import BaseApi
+from .. import HelpScout
+from ..sync import (FileWatermarkStore,
+                    SqliteWatermarkStore,
+                    SyncEngine,
+                    WatermarkStore,
+                    )
+
+from .stub_server import StubServer
+
+
+class TestWatermarkStore(unittest.TestCase):
+
+    def setUp(self):
+        super(TestWatermarkStore, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+
+    def assertStores(self, new_store):
+        """Assert that the store returns the watermarks that were set."""
+        value = datetime(2017, 1, 2, 3, 4, 5)
+        new_store().set('name', value, [(1, '2017-01-02T03:04:05.000000')])
+        self.assertEqual(new_store().get('name'), (
+            value, {(1, '2017-01-02T03:04:05.000000')},
+        ))
+        self.assertEqual(new_store().get('other'), (None, set()))
+
+    def test_memory(self):
+        """It should keep the watermarks in memory."""
+        store = WatermarkStore()
+        self.assertStores(lambda: store)
+
+    def test_file(self):
+        """It should keep the watermarks in a file."""
+        path = os.path.join(self.tempdir, 'watermarks.json')
+        self.assertStores(lambda: FileWatermarkStore(path))
+
+    def test_sqlite(self):
+        """It should keep the watermarks in an SQLite database."""
+        path = os.path.join(self.tempdir, 'watermarks.db')
+        self.assertStores(lambda: SqliteWatermarkStore(path))
+
+
+class TestSyncEngine(unittest.TestCase):
+
+    def setUp(self):
+        super(TestSyncEngine, self).setUp()
+        self.now = datetime(2017, 1, 1, 12)
+        self.records = []
+        self.engine = SyncEngine(
+            HelpScout('key'), WatermarkStore(), overlap=60,
+            clock=lambda: self.now,
+        )
+
+    def handler(self, request):
+        return 200, {'page': 1, 'pages': 1, 'items': self.records}
+
+    def sync(self, *args, **kwargs):
+        with StubServer(self.handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                res = list(self.engine.conversations(*args, **kwargs))
+        return server.requests[0].params['query'], [r.id for r in res]
+
+    def test_first_sync(self):
+        """It should search from the start, deduplicating the records."""
+        self.records = [
+            {'id': 1, 'modifiedAt': '2017-01-01T11:00:00Z'},
+            {'id': 1, 'modifiedAt': '2017-01-01T11:00:00Z'},
+            {'id': 2, 'modifiedAt': '2017-01-01T11:59:30Z'},
+        ]
+        query, res = self.sync(mailbox=5)
+        self.assertEqual(query, (
+            '(modifiedAt:[1970-01-01T00:00:00Z TO 2017-01-01T12:00:00Z] '
+            'AND mailboxid:5)'
+        ))
+        self.assertEqual(res, [1, 2])
+
+    def test_next_sync(self):
+        """It should search from the watermark, minus the overlap."""
+        self.records = [{'id': 2, 'modifiedAt': '2017-01-01T11:59:30Z'}]
+        self.sync()
+        self.now = datetime(2017, 1, 1, 13)
+        self.records.append({'id': 3, 'modifiedAt': '2017-01-01T12:30:00Z'})
+        query, res = self.sync()
+        self.assertEqual(query, (
+            '(modifiedAt:[2017-01-01T11:59:00Z TO 2017-01-01T13:00:00Z])'
+        ))
+        self.assertEqual(res, [3])
+
+    def test_modified_again(self):
+        """It should yield a record again once it was modified again."""
+        self.records = [{'id': 2, 'modifiedAt': '2017-01-01T11:59:30Z'}]
+        self.sync()
+        self.records = [{'id': 2, 'modifiedAt': '2017-01-01T12:00:10Z'}]
+        self.assertEqual(self.sync()[1], [2])
+
+    def test_commit(self):
+        """It should only move the watermark once committed if asked."""
+        self.records = [{'id': 1, 'modifiedAt': '2017-01-01T11:59:30Z'}]
+        with StubServer(self.handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                run = self.engine.customers(commit=False)
+                self.assertEqual([r.id for r in run], [1])
+        self.assertTrue(run.done)
+        self.assertEqual(
+            self.engine.store.get('customers'), (None, set()),
+        )
+        run.commit()
+        self.assertEqual(self.engine.store.get('customers'), (
+            self.now, {(1, '2017-01-01T11:59:30.000000')},
+        ))
+
+    def test_commit_not_done(self):
+        """It should not commit a watermark before every record is read."""
+        self.records = [{'id': 1, 'modifiedAt': '2017-01-01T11:00:00Z'}]
+        with StubServer(self.handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                run = self.engine.customers(commit=False)
+                next(run)
+        with self.assertRaises(ValueError):
+            run.commit()
+
+    def test_interrupted(self):
+        """It should not move the watermark if the sync is interrupted."""
+        self.records = [{'id': 1, 'modifiedAt': '2017-01-01T11:00:00Z'}]
+        with StubServer(self.handler) as server:
+            with mock.patch.object(BaseApi, 'BASE_URI', server.url()):
+                next(self.engine.customers())
+        self.assertEqual(
+            self.engine.store.get('customers'), (None, set()),
+        )
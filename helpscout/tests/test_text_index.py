@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..mirror import Mirror
+from ..models import Conversation, Thread
+from ..text_index import TextIndex
+
+
+@unittest.skipUnless(TextIndex.is_supported(), 'SQLite lacks FTS5')
+class TestTextIndex(unittest.TestCase):
+
+    def setUp(self):
+        super(TestTextIndex, self).setUp()
+        self.index = self.new_index(':memory:')
+        self.index.add(Conversation(
+            id=1, subject='Refund request', preview='Where is my money?',
+            threads=[
+                Thread(id=10, body='<p>Your refund code is <b>X42</b>.</p>'),
+                Thread(id=11, body='Thanks &amp; bye'),
+            ],
+        ))
+        self.index.add({
+            'id': 2, 'subject': 'Code review', 'preview': 'A refund of X42',
+        })
+
+    def new_index(self, path, **kwargs):
+        index = TextIndex(path, **kwargs)
+        self.addCleanup(index.close)
+        return index
+
+    def test_get_words(self):
+        """It should split lower case words, without HTML if asked."""
+        self.assertEqual(
+            TextIndex.get_words('<b>Fish</b> &amp; Chips', True),
+            ['fish', 'chips'],
+        )
+        self.assertEqual(TextIndex.get_words(None), [])
+
+    def test_search_keywords(self):
+        """It should return the conversations containing every keyword."""
+        self.assertEqual(self.index.search('refund'), [1, 2])
+        self.assertEqual(self.index.search('refund x42'), [1, 2])
+        self.assertEqual(self.index.search('refund money'), [1])
+        self.assertEqual(self.index.search('refund missing'), [])
+        self.assertEqual(self.index.search(''), [])
+
+    def test_search_phrase(self):
+        """It should only match the words of a phrase in sequence."""
+        self.assertEqual(self.index.search('"refund code"'), [1])
+        self.assertEqual(self.index.search('"code refund"'), [])
+        self.assertEqual(self.index.search('"refund code" review'), [])
+
+    def test_search_fields(self):
+        """It should only search the given fields."""
+        self.assertEqual(self.index.search('code', ['subject']), [2])
+        self.assertEqual(self.index.search('code', ['body']), [1])
+
+    def test_add_replace(self):
+        """It should replace a conversation that was already indexed."""
+        self.index.add({'id': 1, 'subject': 'Other'})
+        self.assertEqual(self.index.search('refund'), [2])
+        self.assertEqual(self.index.search('other'), [1])
+        self.assertEqual(len(self.index), 2)
+
+    def test_remove(self):
+        """It should remove the words of the conversation."""
+        self.index.remove(2)
+        self.index.remove(3)
+        self.assertNotIn(2, self.index)
+        self.assertEqual(self.index.search('review'), [])
+
+    def test_feed(self):
+        """It should index the records while yielding them unchanged."""
+        index = self.new_index(':memory:')
+        error = ValueError()
+        records = [(3, {'id': 3, 'subject': 'Hello'}), (4, None), (5, error)]
+        self.assertEqual(list(index.feed(records)), records)
+        self.assertEqual(index.search('hello'), [3])
+        self.assertEqual(len(index), 1)
+
+    def test_search_words(self):
+        """It should match words with underscores and accents whole."""
+        self.index.add({'id': 3, 'subject': u'Caf\xe9 snake_case'})
+        self.assertEqual(self.index.search(u'CAF\xc9'), [3])
+        self.assertEqual(self.index.search('snake_case'), [3])
+        self.assertEqual(self.index.search('snake'), [])
+        self.assertEqual(self.index.search('cafe'), [])
+
+    def test_persist(self):
+        """It should keep the index in the database for later runs."""
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        path = os.path.join(tempdir, 'index.db')
+        index = TextIndex(path)
+        index.add({'id': 3, 'subject': 'Hello'})
+        index.close()
+        index = self.new_index(path)
+        self.assertIn(3, index)
+        self.assertEqual(index.search('hello'), [3])
+
+    def test_mirror_database(self):
+        """It should share the database of a mirror."""
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        path = os.path.join(tempdir, 'helpscout.db')
+        mirror = Mirror(path)
+        self.addCleanup(mirror.close)
+        index = self.new_index(path, table='conversations_text')
+        index.add({'id': 3, 'subject': 'Hello'})
+        mirror.save('Users', [{'id': 1}])
+        self.assertEqual(index.search('hello'), [3])
+        self.assertEqual(mirror.store.count('Users'), 1)
+
+
+class TestTextIndexUnsupported(unittest.TestCase):
+
+    def test_init_unsupported(self):
+        """It should raise a clear error if SQLite lacks FTS5."""
+        with mock.patch.object(TextIndex, 'is_supported', return_value=False):
+            with self.assertRaises(NotImplementedError):
+                TextIndex(':memory:')
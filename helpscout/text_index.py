@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-TODAY LasLabs Inc.
+# License MIT (https://opensource.org/licenses/MIT).
+
+import re
+import sqlite3
+import threading
+
+try:
+    from html import unescape
+except ImportError:  # pragma: no cover
+    from HTMLParser import HTMLParser
+    unescape = HTMLParser().unescape
+
+
+class TextIndex(object):
+    """This is a full-text index of conversations in an SQLite database.
+
+    The subject and preview of conversations, and the body of each of their
+    threads, are split into lower case words and stored in an FTS5 table,
+    so that keywords and phrases are found without searching HelpScout.
+    HTML tags are removed from thread bodies. The index is kept on disk, so
+    that it is reused by later runs, and can share the database of a
+    :class:`helpscout.mirror.Mirror`.
+
+    Conversations are added as they are iterated through :func:`feed`,
+    which is meant to wrap the paginators returned by the APIs. Adding a
+    conversation that is already indexed replaces it.
+
+    The connection is shared by the threads using the index. The SQLite
+    library used by Python must be built with FTS5, which can be checked
+    with :func:`is_supported`.
+
+    Examples::
+
+        from helpscout import HelpScout, TextIndex
+        hs = HelpScout('api_key', concurrency=8)
+        index = TextIndex('helpscout.db')
+        ids = (c.id for c in hs.Conversations.list(mailbox))
+        for _, conversation in index.feed(hs.Conversations.get_many(ids)):
+            pass
+        index.search('"refund code" X42')
+
+    Attributes:
+        FIELDS (tuple): Names of the fields that are indexed.
+        path (str): Path of the database.
+        table (str): Name of the full-text table. The conversations and
+            documents are kept in tables with this prefix.
+    """
+
+    FIELDS = ('subject', 'preview', 'body')
+
+    WORD = re.compile(r'\w+', re.UNICODE)
+    TAG = re.compile(r'<[^>]*>')
+    QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+    # The words are split before they are stored, so the tokenizer only
+    # has to split them on spaces, keeping underscores like ``\w``.
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS "{table}_conversations" ('
+        'id INTEGER PRIMARY KEY)',
+        'CREATE TABLE IF NOT EXISTS "{table}_documents" ('
+        'id INTEGER PRIMARY KEY, '
+        'conversation_id INTEGER NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS "{table}_documents_conversation" '
+        'ON "{table}_documents" (conversation_id)',
+        'CREATE VIRTUAL TABLE IF NOT EXISTS "{table}" USING fts5('
+        'subject, preview, body, '
+        'tokenize="unicode61 remove_diacritics 0 tokenchars \'_\'")',
+    ]
+
+    def __init__(self, path, table='text_index'):
+        """Initialize a new index, creating its tables if needed.
+
+        Args:
+            path (str): Path of the database. ``':memory:'`` keeps it in
+                memory.
+            table (str, optional): Name of the full-text table.
+
+        Raises:
+            NotImplementedError: If SQLite does not support FTS5.
+        """
+        if not self.is_supported():
+            raise NotImplementedError(
+                'The SQLite library %s is not built with FTS5, which is '
+                'required for a text index.' % sqlite3.sqlite_version,
+            )
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement.format(table=table))
+
+    def __len__(self):
+        return self._execute(
+            'SELECT COUNT(*) FROM "{table}_conversations"',
+        )[0][0]
+
+    def __contains__(self, conversation_id):
+        return bool(self._execute(
+            'SELECT 1 FROM "{table}_conversations" WHERE id = ?',
+            (conversation_id,),
+        ))
+
+    def close(self):
+        """Close the database."""
+        self._connection.close()
+
+    @staticmethod
+    def is_supported():
+        """Return whether SQLite supports the FTS5 tables of the index.
+
+        Returns:
+            bool: Whether an index can be created.
+        """
+        connection = sqlite3.connect(':memory:')
+        try:
+            connection.execute('CREATE VIRTUAL TABLE test USING fts5(text)')
+        except sqlite3.OperationalError:
+            return False
+        finally:
+            connection.close()
+        return True
+
+    @classmethod
+    def get_words(cls, text, html=False):
+        """Return the lower case words of a text.
+
+        Args:
+            text (str): The text to split.
+            html (bool, optional): Remove the HTML tags and entities of the
+                text first.
+
+        Returns:
+            list: The words, in order.
+        """
+        if not text:
+            return []
+        if html:
+            text = unescape(cls.TAG.sub(' ', text))
+        return cls.WORD.findall(text.lower())
+
+    def add(self, conversation):
+        """Index a conversation, replacing it if it was already indexed.
+
+        Args:
+            conversation (helpscout.models.BaseConversation or dict): The
+                conversation, as a model or as its decoded dictionary. Its
+                threads are indexed if it has any.
+        """
+        conversation_id = self._get(conversation, 'id')
+        documents = [(
+            self._join(self._get(conversation, 'subject')),
+            self._join(self._get(conversation, 'preview')),
+            None,
+        )]
+        for thread in self._get(conversation, 'threads') or []:
+            body = self._join(self._get(thread, 'body'), True)
+            if body:
+                documents.append((None, None, body))
+        with self._lock, self._connection:
+            self._remove(conversation_id)
+            self._connection.execute(
+                self._format('INSERT INTO "{table}_conversations" (id) '
+                             'VALUES (?)'),
+                (conversation_id,),
+            )
+            for document in documents:
+                if not any(document):
+                    continue
+                document_id = self._connection.execute(
+                    self._format('INSERT INTO "{table}_documents" '
+                                 '(conversation_id) VALUES (?)'),
+                    (conversation_id,),
+                ).lastrowid
+                self._connection.execute(
+                    self._format('INSERT INTO "{table}" '
+                                 '(rowid, subject, preview, body) '
+                                 'VALUES (?, ?, ?, ?)'),
+                    (document_id,) + document,
+                )
+
+    def feed(self, records):
+        """Index the conversations while they are iterated.
+
+        Args:
+            records (iter): The conversations, or the results of
+                :func:`helpscout.base_api.BaseApi.get_many`. Results that are
+                not conversations, such as exceptions, are not indexed.
+
+        Yields:
+            The records, unchanged.
+        """
+        for record in records:
+            conversation = record
+            if isinstance(record, tuple):
+                conversation = record[1]
+            if conversation is not None and \
+                    not isinstance(conversation, Exception):
+                self.add(conversation)
+            yield record
+
+    def remove(self, conversation_id):
+        """Remove a conversation from the index.
+
+        Args:
+            conversation_id (int): ID of the conversation.
+        """
+        with self._lock, self._connection:
+            self._remove(conversation_id)
+
+    def search(self, query, fields=None):
+        """Return the conversations matching every keyword and phrase.
+
+        Args:
+            query (str): Keywords, and phrases in double quotes, such as
+                ``'"refund code" X42'``. Each keyword and phrase must be found
+                in the conversation, and the words of a phrase must follow
+                each other in the same field.
+            fields (iter, optional): Names of the fields to search, from
+                :attr:`FIELDS`. Defaults to all of them.
+
+        Returns:
+            list: The sorted IDs of the matching conversations.
+        """
+        fields = ' '.join(
+            f for f in self.FIELDS if f in (fields or self.FIELDS)
+        )
+        terms = []
+        for phrase, word in self.QUERY.findall(query):
+            words = self.get_words(phrase or word)
+            if words:
+                terms.append('{%s} : "%s"' % (fields, ' '.join(words)))
+        if not terms or not fields:
+            return []
+        # Each term can be found in a different document of a conversation.
+        select = (
+            'SELECT DISTINCT d.conversation_id FROM "{table}" '
+            'JOIN "{table}_documents" d ON d.id = "{table}".rowid '
+            'WHERE "{table}" MATCH ?'
+        )
+        rows = self._execute(
+            ' INTERSECT '.join([select] * len(terms)) + ' ORDER BY 1', terms,
+        )
+        return [row[0] for row in rows]
+
+    def _execute(self, query, params=()):
+        """Execute a query on the tables of the index, and fetch its rows."""
+        with self._lock:
+            return self._connection.execute(
+                self._format(query), params,
+            ).fetchall()
+
+    def _format(self, query):
+        """Insert the name of the table in a query."""
+        return query.format(table=self.table)
+
+    def _remove(self, conversation_id):
+        """Remove the documents of a conversation."""
+        for query in (
+            'DELETE FROM "{table}" WHERE rowid IN ('
+            'SELECT id FROM "{table}_documents" WHERE conversation_id = ?)',
+            'DELETE FROM "{table}_documents" WHERE conversation_id = ?',
+            'DELETE FROM "{table}_conversations" WHERE id = ?',
+        ):
+            self._connection.execute(self._format(query), (conversation_id,))
+
+    @classmethod
+    def _join(cls, text, html=False):
+        """Return the words of a text, separated by spaces."""
+        return ' '.join(cls.get_words(text, html)) or None
+
+    @staticmethod
+    def _get(record, name):
+        """Return a value of a model or of a decoded dictionary."""
+        if isinstance(record, dict):
+            return record.get(name)
+        return getattr(record, name, None)
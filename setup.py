@@ -79,14 +79,21 @@ if __name__ == "__main__":
         use_scm_version=True,
         cmdclass={'test': Tests},
         install_requires=[
+            'futures; python_version < "3"',
             'properties',
             'requests',
             'six',
         ],
+        extras_require={
+            'async': [
+                'aiohttp; python_version >= "3.7"',
+            ],
+        },
         setup_requires=[
             'setuptools_scm',
         ],
         tests_require=[
+            'aiohttp; python_version >= "3.7"',
             'mock',
             'vcrpy',
         ],